@@ -42,7 +42,8 @@ resource "aws_iam_role_policy" "lambda_custom_policy" {
       {
         Action = [
           "dynamodb:*",
-          "bedrock:*" # for future use
+          "bedrock:*", # for future use
+          "lambda:InvokeFunction" # async tasks dispatched to itself
         ],
         Effect   = "Allow",
         Resource = "*"
@@ -71,6 +72,22 @@ resource "aws_dynamodb_table" "vocabulary" {
     name = "word"
     type = "S"
   }
+
+  attribute {
+    name = "due_at"
+    type = "N"
+  }
+
+  # Sparse index - only words with a due_at (i.e. testable ones) are projected
+  global_secondary_index {
+    name               = "due_at_index"
+    hash_key           = "user_id"
+    range_key          = "due_at"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["lang", "status", "last_test", "test_results", "created_at"]
+    read_capacity      = 1
+    write_capacity     = 1
+  }
 }
 
 #############################
@@ -127,6 +144,93 @@ resource "aws_dynamodb_table" "challenge_table" {
   }
 }
 
+#############################
+# DynamoDB User Statistics
+#############################
+resource "aws_dynamodb_table" "user_statistics" {
+  name           = "oghmai_user_statistics"
+  billing_mode   = "PROVISIONED"
+  read_capacity  = 1
+  write_capacity = 1
+  hash_key       = "user_id"
+  range_key      = "lang"
+
+  attribute {
+    name = "user_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "lang"
+    type = "S"
+  }
+}
+
+#############################
+# DynamoDB Verb Conjugations (shared by all users)
+#############################
+resource "aws_dynamodb_table" "verb_conjugations" {
+  name           = "oghmai_verb_conjugations"
+  billing_mode   = "PROVISIONED"
+  read_capacity  = 1
+  write_capacity = 1
+  hash_key       = "lang"
+  range_key      = "verb"
+
+  attribute {
+    name = "lang"
+    type = "S"
+  }
+
+  attribute {
+    name = "verb"
+    type = "S"
+  }
+}
+
+#############################
+# DynamoDB Dictionary (shared word entries)
+#############################
+resource "aws_dynamodb_table" "dictionary" {
+  name           = "oghmai_dictionary"
+  billing_mode   = "PROVISIONED"
+  read_capacity  = 1
+  write_capacity = 1
+  hash_key       = "lang"
+  range_key      = "word"
+
+  attribute {
+    name = "lang"
+    type = "S"
+  }
+
+  attribute {
+    name = "word"
+    type = "S"
+  }
+}
+
+#############################
+# DynamoDB Bedrock Response Cache
+#############################
+resource "aws_dynamodb_table" "bedrock_cache" {
+  name           = "oghmai_bedrock_cache"
+  billing_mode   = "PROVISIONED"
+  read_capacity  = 1
+  write_capacity = 1
+  hash_key       = "cache_key"
+
+  attribute {
+    name = "cache_key"
+    type = "S"
+  }
+
+  ttl {
+    attribute_name = "ttl"
+    enabled        = true
+  }
+}
+
 #############################
 # Lambda Function
 #############################
@@ -160,6 +264,52 @@ resource "aws_lambda_function" "api_handler" {
   ]
 }
 
+#############################
+# Scheduled challenge pool refill
+#############################
+resource "aws_cloudwatch_event_rule" "challenge_pool_refill" {
+  name                = "oghmai-challenge-pool-refill"
+  description         = "Pre-generates challenges for users with due words"
+  schedule_expression = "rate(30 minutes)"
+}
+
+resource "aws_cloudwatch_event_target" "challenge_pool_refill" {
+  rule  = aws_cloudwatch_event_rule.challenge_pool_refill.name
+  arn   = aws_lambda_function.api_handler.arn
+  input = jsonencode({ oghmai_task = "refill_challenge_pools" })
+}
+
+resource "aws_lambda_permission" "allow_eventbridge" {
+  statement_id  = "AllowExecutionFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.api_handler.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.challenge_pool_refill.arn
+}
+
+#############################
+# Scheduled warm-up (keeps a container primed: connections, templates, caches)
+#############################
+resource "aws_cloudwatch_event_rule" "warmup" {
+  name                = "oghmai-warmup"
+  description         = "Primes a Lambda container ahead of user requests"
+  schedule_expression = "rate(5 minutes)"
+}
+
+resource "aws_cloudwatch_event_target" "warmup" {
+  rule  = aws_cloudwatch_event_rule.warmup.name
+  arn   = aws_lambda_function.api_handler.arn
+  input = jsonencode({ oghmai_task = "warmup" })
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_warmup" {
+  statement_id  = "AllowWarmupFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.api_handler.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.warmup.arn
+}
+
 #############################
 # REST API Gateway
 #############################
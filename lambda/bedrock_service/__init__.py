@@ -1,3 +1,4 @@
-from .bedrock import describe_word, create_challenge, is_challenge_close, get_challenge_hint, get_verb_explanation
+from .bedrock import describe_word, describe_word_stream, create_challenge, create_challenge_stream, is_challenge_close, get_challenge_hint, check_challenge, get_verb_explanation, enrich_meanings, measure_usage, new_usage, warm_up
+from .governor import governor, ModelUnavailableError
 
-__all__ = ['describe_word', 'create_challenge', 'is_challenge_close', 'get_challenge_hint', 'get_verb_explanation']
\ No newline at end of file
+__all__ = ['describe_word', 'describe_word_stream', 'create_challenge', 'create_challenge_stream', 'is_challenge_close', 'get_challenge_hint', 'check_challenge', 'get_verb_explanation', 'enrich_meanings', 'measure_usage', 'new_usage', 'warm_up', 'governor', 'ModelUnavailableError']
\ No newline at end of file
@@ -1,121 +1,394 @@
-import boto3
 import os
 import json
-from models import WordResult, ExplanationResponse, WordTypeEnum
-from utils import logging
-import random
+from models import WordResult, WordDefinition, ExplanationResponse, WordTypeEnum
+from utils import logging, aws
+from utils.cache import LRUCache
+from . import response_cache, json_repair
+from .prompts import registry as prompts, PLACEHOLDERS
+from .governor import governor
+from .routing import Route, get_route
+from pydantic import BaseModel, TypeAdapter
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
 
-# Optional: store model ID in env vars or config
-BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "amazon.nova-lite-v1:0")
 MAX_RETRIES = 3
-
-bedrock = boto3.client("bedrock-runtime", region_name="us-east-1")
-
-def load_prompt_template_random(name: str) -> str:
-    # Load files in the directory and randomly select one
-    template_dir = f"resources/prompts/{name}"
+# Number of ranked candidate words asked for in one describe call
+DESCRIBE_CANDIDATES = int(os.getenv("DESCRIBE_CANDIDATES", "3"))
+# Append every prompt (with its route name) to this JSONL file, to replay it with bedrock_service.benchmark
+BEDROCK_RECORD_PROMPTS = os.getenv("BEDROCK_RECORD_PROMPTS")
+
+# How model JSON replies got parsed: strict, repaired (locally), llm_cleanup, failed
+json_metrics = Counter()
+
+class DescribeCandidates(BaseModel):
+    candidates: list[WordResult]
+
+class EnrichedMeanings(BaseModel):
+    meanings: list[WordDefinition]
+
+# Unpicked candidates by (user, normalized description), to answer that user's follow-up exclusion
+# requests locally - first requests always go to the model, so answers keep varying between users
+describe_candidates = LRUCache(maxsize=256, ttl=3600)
+
+# BEDROCK_FAKE=true swaps in a local fake model (offline development, latency experiments)
+if os.getenv("BEDROCK_FAKE", "false").lower() == "true":
+    from .fake import FakeBedrockClient
+    bedrock = FakeBedrockClient()
+else:
+    # Retries are handled by the governor (with breaker accounting), not by botocore
+    bedrock = aws.LazyClient("bedrock-runtime", config={"retries": {"total_max_attempts": 1, "mode": "standard"}})
+
+# Usage accumulators of all open measure_usage() blocks in this context, outermost first
+_usage: ContextVar[tuple] = ContextVar("bedrock_usage", default=())
+# Record of the logical call in progress (call_bedrock_json folds its clean_json call into it)
+_current_call: ContextVar[dict | None] = ContextVar("bedrock_call", default=None)
+
+USAGE_SUMS = ("calls", "cacheHits", "inputTokens", "outputTokens", "totalTokens", "latencyMs", "retries", "errors")
+
+def new_usage() -> dict:
+    """
+    Empty usage accumulator: calls (model invocations), cacheHits, inputTokens, outputTokens,
+    totalTokens, latencyMs, retries, errors and the same sums per prompt name in prompts.
+    """
+    usage = {key: 0 for key in USAGE_SUMS}
+    usage["prompts"] = {}
+    return usage
+
+@contextmanager
+def measure_usage(usage: dict = None):
+    """
+    Sum the token usage and latency of all Bedrock calls made inside the block (in this context).
+    Blocks nest, a call counts towards every open block.
+
+    Generators must not yield inside the block (the consumer may resume them in another context) -
+    they pass a new_usage() dict to the streaming calls and wrap only the parts between yields.
+
+    Args:
+        usage: Accumulator to add to (see new_usage), a new one by default
+
+    Yields:
+        The usage accumulator
+    """
+    usage = usage if usage is not None else new_usage()
+    token = _usage.set(_usage.get() + (usage,))
     try:
-        files = [f for f in os.listdir(template_dir) if f.endswith(".txt")]
-        if not files:
-            raise FileNotFoundError(f"No prompt templates found in {template_dir}")
-        selected_file = random.choice(files)
-        template_path = os.path.join(template_dir, selected_file)
-        with open(template_path, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError as e:
-        logging.error(f"Error loading prompt template from {template_dir}: {str(e)}")
-        raise
-
-
-def load_prompt_template(name: str) -> str:
-    template_path = f"resources/prompts/{name}.txt"
+        yield usage
+    finally:
+        _usage.reset(token)
+
+def _new_call(prompt_name: str, model_id: str) -> dict:
+    call = {key: 0 for key in USAGE_SUMS}
+    call.update({"promptName": prompt_name, "modelId": model_id, "parse": None, "streamed": False})
+    return call
+
+@contextmanager
+def _track_call(prompt_name: str, model_id: str):
+    call = _current_call.get()
+    if call is not None:
+        # Nested invocation (clean_json) - counts towards the outer call
+        yield call
+        return
+    call = _new_call(prompt_name, model_id)
+    token = _current_call.set(call)
     try:
-        with open(template_path, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError as e:
-        logging.error(f"Error loading prompt template from {template_path}: {str(e)}")
-        raise
+        yield call
+    finally:
+        _current_call.reset(token)
+        _finish_call(call)
+
+def _set_parse_outcome(outcome: str):
+    call = _current_call.get()
+    if call is not None:
+        call["parse"] = outcome
+
+def _add_tokens(call: dict, usage: dict):
+    for key in ("inputTokens", "outputTokens", "totalTokens"):
+        call[key] += int(usage.get(key, 0))
+
+def _finish_call(call: dict, usage: dict = None):
+    accumulators = _usage.get()
+    if usage is not None and not any(u is usage for u in accumulators):
+        accumulators += (usage,)
+    for usage in accumulators:
+        prompt_usage = usage["prompts"].setdefault(call["promptName"], {key: 0 for key in USAGE_SUMS})
+        for key in USAGE_SUMS:
+            usage[key] += call[key]
+            prompt_usage[key] += call[key]
+
+    logging.metrics(
+        "bedrock_call",
+        dimensions={"PromptName": call["promptName"], "ModelId": call["modelId"]},
+        values={
+            "Invocations": call["calls"],
+            "CacheHits": call["cacheHits"],
+            "InputTokens": call["inputTokens"],
+            "OutputTokens": call["outputTokens"],
+            "Latency": round(call["latencyMs"], 1),
+            "Retries": call["retries"],
+            "Errors": call["errors"],
+        },
+        units={"Latency": "Milliseconds"},
+        properties={key: call[key] for key in ("parse", "streamed", "firstTokenMs") if key in call}
+    )
+
+def warm_up():
+    """
+    Load the prompt templates and the response cache table, and open a connection to the
+    Bedrock runtime endpoint with a cheap control call (no model invocation).
+    """
+    for name in PLACEHOLDERS:
+        prompts.get(name)
+    response_cache.warm_up()
+    if isinstance(bedrock, aws.LazyClient):
+        bedrock.list_async_invokes(maxResults=1)
 
 def create_challenge(word: str) -> str | None:
     logging.info(f"Creating challenge for word {word}")
-    prompt = load_prompt_template_random("create_challenge").format(word=word)
-    raw_output = call_bedrock(prompt)
+    prompt = prompts.render_random("create_challenge", word=word)
+    raw_output = call_bedrock(prompt, "create_challenge")
     return raw_output["output"]["message"]["content"][0]["text"]
 
+def create_challenge_stream(word: str, usage: dict = None):
+    """
+    Streaming variant of create_challenge.
+
+    Args:
+        usage: Accumulator (see new_usage) the call is added to once the stream ends
+
+    Yields:
+        Text chunks of the challenge description as they are generated
+    """
+    logging.info(f"Streaming challenge for word {word}")
+    prompt = prompts.render_random("create_challenge", word=word)
+    yield from stream_bedrock(prompt, "create_challenge", usage)
+
 def is_challenge_close(challenge: str, guess: str) -> bool:
     logging.info(f"Checking if challenge '{challenge}' is close to guess '{guess}'")
-    prompt = load_prompt_template("challenge_check").format(challenge=challenge, guess=guess)
-    raw_output = call_bedrock(prompt)
+    prompt = prompts.render("challenge_check", challenge=challenge, guess=guess)
+    raw_output = call_bedrock(prompt, "challenge_check", cache=True)
     return raw_output["output"]["message"]["content"][0]["text"].strip().lower() == "si"
 
 def get_challenge_hint(challenge: str, guess: str, word: str) -> str:
     logging.info(f"Getting hint for challenge '{challenge}' with guess '{guess}' and word '{word}'")
-    prompt = load_prompt_template("challenge_hint").format(challenge=challenge, guess=guess, word=word)
-    raw_output = call_bedrock(prompt)
+    prompt = prompts.render("challenge_hint", challenge=challenge, guess=guess, word=word)
+    raw_output = call_bedrock(prompt, "challenge_hint", cache=True)
     return raw_output["output"]["message"]["content"][0]["text"].strip()
 
-def describe_word(definition: str, exclusions: list[str]) -> WordResult | None:
+def check_challenge(challenge: str, guess: str, word: str) -> tuple[bool, str | None]:
+    # Closeness check and hint in a single call, replaces is_challenge_close + get_challenge_hint
+    logging.info(f"Checking guess '{guess}' for challenge '{challenge}' with word '{word}'")
+    prompt = prompts.render("challenge_check_hint", challenge=challenge, guess=guess, word=word)
+    parsed = call_bedrock_json(prompt, "challenge_check_hint", cache=True)
+    if not isinstance(parsed, dict):
+        # No reply, or JSON of another shape (a list, a bare string) - not close
+        return False, None
+    close = parsed.get("close")
+    if isinstance(close, str):
+        close = close.strip().lower() in ("true", "si", "yes")
+    if not close:
+        return False, None
+    hint = parsed.get("hint")
+    hint = hint.strip() if isinstance(hint, str) else ""
+    return True, hint or None
+
+def describe_word(definition: str, exclusions: list[str], user_id: str = None) -> WordResult | None:
+    """
+    Args:
+        user_id: Owner of the request chain, whose follow-ups (with exclusions) may be answered
+            from the candidates of earlier calls - None to always ask the model
+    """
     logging.info(f"Describing word from definition {definition} with exclusions {exclusions}")
 
-    if not exclusions:
-        prompt = load_prompt_template("describe_word").format(definition=definition)
-    else:
-        prompt = load_prompt_template("describe_word_exclusions").format(
-            definition=definition,
-            exclusions=", ".join(exclusions)
-        )
+    excluded = {e.strip().lower() for e in exclusions or []}
+    cache_key = _candidates_key(definition, user_id)
+
+    # Candidates left over from a previous call answer "not this one" without Bedrock
+    result = _cached_candidate(cache_key, excluded)
+    if result is not None:
+        return result
+
+    prompt_name, prompt = _describe_prompt(definition, excluded)
 
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            parsed = call_bedrock_json(prompt)
+            # One call returns a ranked list of candidates, each with all its meanings
+            parsed = call_bedrock_json(prompt, prompt_name, schema=DescribeCandidates | WordResult)
 
             if parsed is None:
                 logging.warning(f"Failed to parse JSON response from Bedrock at attempt {attempt}, retrying")
                 continue
 
-            if exclusions is not None and parsed["word"] in exclusions:
-                logging.warning(f"Exclusion word found in response at attempt {attempt}, retrying")
+            result = _accept_candidates(cache_key, parsed, excluded)
+            if result is None:
+                logging.warning(f"All candidates excluded at attempt {attempt}, retrying")
                 continue
 
-            # Fill in other meanings
-            for inner_attempt in range(1, MAX_RETRIES + 1):
-                enhance_prompt = load_prompt_template("add_other_meanings").format(json=json.dumps(parsed), word=parsed["word"])
-
-                parsed_m = call_bedrock_json(enhance_prompt)
-
-                if parsed_m is None:
-                    logging.warning(f"Failed to parse JSON response from Bedrock at attempt {inner_attempt}, retrying")
-                    continue
-
-                if parsed_m["word"] != parsed["word"]:
-                    logging.warning(f"Exclusion word found in response at attempt {inner_attempt}, retrying")
-
-                return WordResult(**parsed)
+            return result
         except json.JSONDecodeError as e:
             logging.error(f"Invalid JSON response from Bedrock attempt {attempt}: {str(e)}")
 
     logging.warning(f"Failed to describe word after {MAX_RETRIES} attempts")
     return None
 
-def call_bedrock_json(prompt: str, temperature=0.9, max_tokens=500):
-    possible_json = call_bedrock(prompt, temperature, max_tokens)
-    try:
-        logging.info(f"Raw response from Bedrock: {possible_json}")
-        raw_text = possible_json["output"]["message"]["content"][0]["text"]
-        result = extract_json_from_reply(raw_text)
+def describe_word_stream(definition: str, exclusions: list[str], usage: dict = None, user_id: str = None):
+    """
+    Streaming variant of describe_word.
+
+    Args:
+        usage: Accumulator (see new_usage) all calls of the stream are added to
+        user_id: As for describe_word
+
+    Yields:
+        ("delta", text) for every generated chunk, then ("result", WordResult | None) once
+    """
+    logging.info(f"Streaming word description from definition {definition} with exclusions {exclusions}")
+
+    excluded = {e.strip().lower() for e in exclusions or []}
+    cache_key = _candidates_key(definition, user_id)
+
+    result = _cached_candidate(cache_key, excluded)
+    if result is not None:
+        yield "result", result
+        return
+
+    prompt_name, prompt = _describe_prompt(definition, excluded)
+    chunks = []
+    for text in stream_bedrock(prompt, prompt_name, usage):
+        chunks.append(text)
+        yield "delta", text
+
+    parsed = parse_model_json("".join(chunks), DescribeCandidates | WordResult)
+    result = _accept_candidates(cache_key, parsed, excluded) if parsed is not None else None
+    if result is None:
+        # Unusable or fully excluded reply - the regular path has the cleanup and retries
+        logging.warning(f"Streamed description unusable, falling back to describe_word")
+        with measure_usage(usage):
+            result = describe_word(definition, exclusions, user_id)
+    yield "result", result
+
+def _candidates_key(definition: str, user_id: str | None) -> tuple[str, str] | None:
+    # None: not cached, there is no request chain to scope the candidates to
+    return (user_id, " ".join(definition.lower().split())) if user_id else None
+
+def _describe_prompt(definition: str, excluded: set[str]) -> tuple[str, str]:
+    # Returns (prompt name, prompt)
+    if not excluded:
+        return "describe_word", prompts.render("describe_word", definition=definition, count=DESCRIBE_CANDIDATES)
+    return "describe_word_exclusions", prompts.render("describe_word_exclusions",
+        definition=definition,
+        exclusions=", ".join(sorted(excluded)),
+        count=DESCRIBE_CANDIDATES
+    )
+
+def _cached_candidate(cache_key: tuple | None, excluded: set[str]) -> WordResult | None:
+    # Only follow-ups ("not this one") are served from the cache
+    if cache_key is None or not excluded:
+        return None
+    cached = describe_candidates.get(cache_key)
+    if cached is None:
+        return None
+    result = _pick_candidate(cached, excluded)
+    if result is not None:
+        logging.info(f"Served describe word from cached candidates", extra={"describe_candidates": describe_candidates.stats()})
+    return result
+
+def _accept_candidates(cache_key: tuple | None, parsed: dict, excluded: set[str]) -> WordResult | None:
+    candidates = _parse_candidates(parsed)
+    if cache_key is not None:
+        cached = describe_candidates.get(cache_key)
+        if cached is not None:
+            # Keep older candidates the model did not repeat as a fallback
+            candidates += [c for c in cached if c.word not in {n.word for n in candidates}]
+        describe_candidates.put(cache_key, candidates)
+    return _pick_candidate(candidates, excluded)
+
+def _parse_candidates(parsed: dict) -> list[WordResult]:
+    # Older single-word replies ({"word": ..., "meanings": ...}) are accepted as one candidate
+    raw_candidates = parsed.get("candidates", [parsed] if "word" in parsed else [])
+    candidates = []
+    for raw in raw_candidates:
+        try:
+            candidate = WordResult(**raw)
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Skipping invalid candidate {raw}: {str(e)}")
+            continue
+        candidate.word = candidate.word.strip().lower()
+        if candidate.word not in {c.word for c in candidates}:
+            candidates.append(candidate)
+    return candidates
+
+def _pick_candidate(candidates: list[WordResult], excluded: set[str]) -> WordResult | None:
+    for candidate in candidates:
+        if candidate.word not in excluded:
+            # Callers modify the result (status), the cached one must stay untouched
+            return candidate.model_copy(deep=True)
+    return None
+
+def call_bedrock_json(prompt: str, prompt_name: str, cache=False, schema=None):
+    """
+    Call the model and parse its reply as JSON.
+
+    The reply is parsed strictly, then repaired locally; only if both fail (or the result
+    does not validate against the optional pydantic schema) is it sent through the
+    clean_json prompt.
+    """
+    route = get_route(prompt_name)
+    # One metrics record for the call, including a clean_json round trip
+    with _track_call(prompt_name, route.model_id):
+        return _call_bedrock_json(prompt, prompt_name, route, cache, schema)
+
+def _call_bedrock_json(prompt: str, prompt_name: str, route: Route, cache: bool, schema):
+    possible_json = invoke_route(prompt, prompt_name, route, cache=cache)
+    logging.debug(f"Raw response from Bedrock: {possible_json}")
+    raw_text = possible_json["output"]["message"]["content"][0]["text"]
+
+    result = parse_model_json(raw_text, schema)
+    if result is not None:
         return result
-    except ValueError | json.JSONDecodeError as e:
-        logging.info(f"Failed to parse JSON response - trying to run it through cleanup: {str(e)}")
-        cleanup_prompt = load_prompt_template("clean_json").format(output=possible_json["output"]["message"]["content"][0]["text"])
-        cleanup_response = call_bedrock(cleanup_prompt, temperature, max_tokens)
-        logging.info(f"Raw response from Bedrock after cleanup: {cleanup_response}")
+
+    logging.info(f"Failed to parse JSON response locally - trying to run it through cleanup")
+    json_metrics["llm_cleanup"] += 1
+    cleanup_prompt = prompts.render("clean_json", output=raw_text)
+    cleanup_route = get_route("clean_json")
+    # The cleaned up JSON is as long as the original reply
+    cleanup_route = cleanup_route._replace(max_tokens=max(cleanup_route.max_tokens, route.max_tokens))
+    cleanup_response = invoke_route(cleanup_prompt, "clean_json", cleanup_route, cache=True)
+    logging.debug(f"Raw response from Bedrock after cleanup: {cleanup_response}")
+    result = parse_model_json(cleanup_response["output"]["message"]["content"][0]["text"], schema, count=False)
+    _set_parse_outcome("llm_cleanup")
+    if result is None:
+        logging.error(f"Failed to parse JSON response after cleanup")
+        _set_parse_outcome("failed")
+        json_metrics["failed"] += 1
+        if cache:
+            # Do not keep serving the unusable reply to the retries
+            response_cache.invalidate(response_cache.make_key(route.model_id, prompt, route.temperature, route.max_tokens))
+    return result
+
+def parse_model_json(raw_text: str, schema=None, count: bool = True):
+    """
+    Strict parse, then local repair. Returns None if neither gives a value matching the schema.
+    """
+    for parser, outcome in ((extract_json_from_reply, "strict"), (json_repair.repair_json, "repaired")):
         try:
-            cleanup_text = cleanup_response["output"]["message"]["content"][0]["text"]
-            result = extract_json_from_reply(cleanup_text)
-            return result
-        except json.JSONDecodeError as e:
-            logging.error(f"Failed to parse JSON response after cleanup: {str(e)}")
-            return None
+            result = parser(raw_text)
+            if schema is not None:
+                TypeAdapter(schema).validate_python(result)
+        except ValueError as e:
+            logging.debug(f"JSON {outcome} parse failed: {str(e)}")
+            continue
+        if count:
+            _set_parse_outcome(outcome)
+            json_metrics[outcome] += 1
+            parsed_total = sum(json_metrics[k] for k in ("strict", "repaired", "llm_cleanup"))
+            logging.info(f"Parsed model JSON ({outcome})", extra={
+                "json_parse": dict(json_metrics),
+                "json_repaired_locally_share": round(json_metrics["repaired"] / parsed_total, 3) if parsed_total else 0.0
+            })
+        return result
+    return None
 
 
 def extract_json_from_reply(response):
@@ -127,6 +400,23 @@ def extract_json_from_reply(response):
     result = json.loads(response[start:end + 1])
     return result
 
+def enrich_meanings(word: str, meanings: list[dict]) -> list[WordDefinition] | None:
+    # Ask for all distinct meanings of a known word, starting from the ones we have
+    logging.info(f"Enriching meanings of word {word}")
+    prompt = prompts.render("add_other_meanings", json=json.dumps({"word": word, "meanings": meanings}), word=word)
+
+    for attempt in range(1, MAX_RETRIES + 1):
+        parsed = call_bedrock_json(prompt, "add_other_meanings", schema=EnrichedMeanings)
+        if parsed is None or not parsed.get("meanings"):
+            logging.warning(f"Failed to parse enriched meanings at attempt {attempt}, retrying")
+            continue
+        try:
+            return [WordDefinition(**m) for m in parsed["meanings"]]
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Invalid enriched meanings at attempt {attempt}: {str(e)}")
+
+    return None
+
 def get_verb_explanation(word: WordResult) -> ExplanationResponse | None:
     logging.info(f"Getting explanation for word {word}")
 
@@ -136,11 +426,11 @@ def get_verb_explanation(word: WordResult) -> ExplanationResponse | None:
         return None
 
     # Use the verb_forms.txt prompt for VERB type
-    prompt = load_prompt_template("verb_forms").format(verb=word.word)
+    prompt = prompts.render("verb_forms", verb=word.word)
 
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            parsed = call_bedrock_json(prompt)
+            parsed = call_bedrock_json(prompt, "verb_forms", cache=True, schema=dict[str, list[str]])
 
             if parsed is None:
                 logging.warning(f"Failed to parse JSON response from Bedrock at attempt {attempt}, retrying")
@@ -159,42 +449,139 @@ def get_verb_explanation(word: WordResult) -> ExplanationResponse | None:
     return None
 
 
-def call_bedrock(prompt: str, temperature=0.9, max_tokens=500):
+def _request_body(prompt: str, temperature: float, max_tokens: int) -> bytes:
+    return bytes(
+        json.dumps({
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"text": prompt}
+                    ]
+                }
+            ],
+            "inferenceConfig": {
+                "maxTokens": max_tokens,
+                "stopSequences": [],
+                "temperature": temperature,
+                "topP": 0.95,
+                "top_k": 50
+            }
+        }),
+        "utf-8"
+    )
+
+def _record_prompt(prompt_name: str, prompt: str):
+    if not BEDROCK_RECORD_PROMPTS:
+        return
+    try:
+        with open(BEDROCK_RECORD_PROMPTS, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"prompt_name": prompt_name, "prompt": prompt}, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logging.warning(f"Failed to record prompt to {BEDROCK_RECORD_PROMPTS}: {str(e)}")
+
+def stream_bedrock(prompt: str, prompt_name: str, usage: dict = None):
+    """
+    Invoke the model routed for prompt_name through the response stream API.
+
+    Args:
+        usage: Accumulator (see new_usage) the call is added to once the stream ends - the
+            measure_usage() blocks of the caller are not visible if the consumer resumes
+            the generator in another context
+
+    Yields:
+        Text deltas as the model generates them
+    """
+    route = get_route(prompt_name)
+    _record_prompt(prompt_name, prompt)
+    # Not tracked through _current_call - a generator must not leave context changes behind between yields
+    call = _new_call(prompt_name, route.model_id)
+    call["streamed"] = True
+    start = time.perf_counter()
     try:
-        logging.debug(f"Calling Bedrock with prompt: {prompt}")
-
-        response = bedrock.invoke_model(
-            modelId=BEDROCK_MODEL_ID,
-            body=bytes(
-                json.dumps({
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": [
-                                {"text": prompt}
-                            ]
-                        }
-                    ],
-                    "inferenceConfig": {
-                        "maxTokens": max_tokens,
-                        "stopSequences": [],
-                        "temperature": temperature,
-                        "topP": 0.95,
-                        "top_k": 50
-                    }
-                }),
-                "utf-8"
-            ),
-            contentType="application/json",
-            accept="application/json"
-        )
-
-        response_body = response["body"].read().decode("utf-8")
-        result = json.loads(response_body)
-
-        logging.debug(f"Received response from Bedrock: {result}")
+        logging.debug(f"Streaming Bedrock ({prompt_name} -> {route.model_id}) with prompt: {prompt}")
 
-        return result
+        # Only opening the stream is governed, a failure mid-stream is not retried
+        try:
+            response = governor.invoke(
+                bedrock.invoke_model_with_response_stream,
+                modelId=route.model_id,
+                body=_request_body(prompt, route.temperature, route.max_tokens),
+                contentType="application/json",
+                accept="application/json"
+            )
+        finally:
+            call["retries"] += max(governor.last_attempts() - 1, 0)
+        call["calls"] += 1
+
+        for event in response["body"]:
+            chunk = event.get("chunk")
+            if chunk is None:
+                continue
+            payload = json.loads(chunk["bytes"].decode("utf-8"))
+            text = payload.get("contentBlockDelta", {}).get("delta", {}).get("text")
+            if text:
+                call.setdefault("firstTokenMs", round((time.perf_counter() - start) * 1000, 1))
+                yield text
+            if "metadata" in payload:
+                _add_tokens(call, payload["metadata"].get("usage", {}))
     except Exception as e:
-        logging.exception(f"Error calling Bedrock model: {str(e)}")
+        call["errors"] += 1
+        logging.exception(f"Error streaming Bedrock model: {str(e)}")
         raise
+    finally:
+        call["latencyMs"] += (time.perf_counter() - start) * 1000
+        _finish_call(call, usage)
+
+def call_bedrock(prompt: str, prompt_name: str, cache=False):
+    """
+    Invoke the model routed for prompt_name (see routing.py) with a single user message.
+
+    With cache=True the reply is memoized by (model, prompt, temperature, max_tokens) -
+    only for prompts where a repeated answer is as good as a fresh one.
+    """
+    return invoke_route(prompt, prompt_name, get_route(prompt_name), cache=cache)
+
+def invoke_route(prompt: str, prompt_name: str, route: Route, cache=False):
+    with _track_call(prompt_name, route.model_id) as call:
+        cache_key = response_cache.make_key(route.model_id, prompt, route.temperature, route.max_tokens) if cache else None
+        if cache_key is not None:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logging.info(f"Bedrock response served from cache", extra={"bedrock_cache": response_cache.stats()})
+                call["cacheHits"] += 1
+                return cached
+
+        _record_prompt(prompt_name, prompt)
+        start = time.perf_counter()
+        try:
+            logging.debug(f"Calling Bedrock ({prompt_name} -> {route.model_id}) with prompt: {prompt}")
+
+            try:
+                response = governor.invoke(
+                    bedrock.invoke_model,
+                    modelId=route.model_id,
+                    body=_request_body(prompt, route.temperature, route.max_tokens),
+                    contentType="application/json",
+                    accept="application/json"
+                )
+            finally:
+                call["retries"] += max(governor.last_attempts() - 1, 0)
+            call["calls"] += 1
+
+            response_body = response["body"].read().decode("utf-8")
+            result = json.loads(response_body)
+
+            logging.debug(f"Received response from Bedrock: {result}")
+            _add_tokens(call, result.get("usage", {}))
+
+            if cache_key is not None:
+                response_cache.put(cache_key, result)
+
+            return result
+        except Exception as e:
+            call["errors"] += 1
+            logging.exception(f"Error calling Bedrock model: {str(e)}")
+            raise
+        finally:
+            call["latencyMs"] += (time.perf_counter() - start) * 1000
@@ -0,0 +1,85 @@
+"""
+Replay a recorded prompt set against the routing table and report latency and token cost.
+
+Record prompts by running the API with BEDROCK_RECORD_PROMPTS=prompts.jsonl, then (from lambda/):
+
+    python -m bedrock_service.benchmark prompts.jsonl
+    python -m bedrock_service.benchmark prompts.jsonl --models amazon.nova-micro-v1:0,amazon.nova-lite-v1:0 --repeat 3
+"""
+import argparse
+import json
+import statistics
+import time
+from collections import defaultdict
+
+from .bedrock import invoke_route, measure_usage
+from .routing import get_route
+
+# On-demand USD per 1M (input, output) tokens, us-east-1
+MODEL_PRICES = {
+    "amazon.nova-micro-v1:0": (0.035, 0.14),
+    "amazon.nova-lite-v1:0": (0.06, 0.24),
+    "amazon.nova-pro-v1:0": (0.8, 3.2),
+    "amazon.nova-premier-v1:0": (2.5, 12.5),
+}
+
+
+def load_prompts(path: str) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run(prompts: list[dict], models: list[str] | None = None, repeat: int = 1) -> list[dict]:
+    samples = defaultdict(list)
+    for record in prompts:
+        route = get_route(record["prompt_name"])
+        for model_id in models or [route.model_id]:
+            candidate = route._replace(model_id=model_id)
+            for _ in range(repeat):
+                with measure_usage() as usage:
+                    start = time.perf_counter()
+                    invoke_route(record["prompt"], record["prompt_name"], candidate)
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                samples[(record["prompt_name"], model_id)].append((elapsed_ms, usage["inputTokens"], usage["outputTokens"]))
+    return [_summarize(name, model_id, rows) for (name, model_id), rows in sorted(samples.items())]
+
+
+def _summarize(prompt_name: str, model_id: str, rows: list[tuple]) -> dict:
+    latencies = sorted(r[0] for r in rows)
+    input_tokens = statistics.mean(r[1] for r in rows)
+    output_tokens = statistics.mean(r[2] for r in rows)
+    # Inference profiles (us.amazon.nova-...) are billed as the underlying model
+    price = MODEL_PRICES.get(model_id[model_id.find("amazon."):])
+    return {
+        "prompt_name": prompt_name,
+        "model_id": model_id,
+        "calls": len(rows),
+        "p50_ms": round(latencies[len(latencies) // 2]),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]),
+        "avg_input_tokens": round(input_tokens, 1),
+        "avg_output_tokens": round(output_tokens, 1),
+        "usd_per_1k_calls": round((input_tokens * price[0] + output_tokens * price[1]) / 1000, 4) if price else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded prompts against the Bedrock routing table")
+    parser.add_argument("prompts", help="JSONL file with prompt_name and prompt per line (see BEDROCK_RECORD_PROMPTS)")
+    parser.add_argument("--models", help="Comma separated model ids to compare instead of each route's own model")
+    parser.add_argument("--repeat", type=int, default=1, help="Calls per prompt and model")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run(load_prompts(args.prompts), args.models.split(",") if args.models else None, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'prompt':<26} {'model':<28} {'calls':>5} {'p50 ms':>7} {'p95 ms':>7} {'in tok':>7} {'out tok':>7} {'$/1k':>8}")
+    for r in results:
+        cost = f"{r['usd_per_1k_calls']:.4f}" if r["usd_per_1k_calls"] is not None else "n/a"
+        print(f"{r['prompt_name']:<26} {r['model_id']:<28} {r['calls']:>5} {r['p50_ms']:>7} {r['p95_ms']:>7} "
+              f"{r['avg_input_tokens']:>7} {r['avg_output_tokens']:>7} {cost:>8}")
+
+
+if __name__ == "__main__":
+    main()
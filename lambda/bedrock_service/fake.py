@@ -0,0 +1,83 @@
+import io
+import json
+import os
+import time
+
+# Delay before the first token and between streamed chunks, in seconds
+FAKE_FIRST_TOKEN_DELAY = float(os.getenv("BEDROCK_FAKE_FIRST_TOKEN_DELAY", "0.5"))
+FAKE_CHUNK_DELAY = float(os.getenv("BEDROCK_FAKE_CHUNK_DELAY", "0.05"))
+FAKE_CHUNK_SIZE = int(os.getenv("BEDROCK_FAKE_CHUNK_SIZE", "16"))
+
+FAKE_MEANING = {
+    "translation": "shy",
+    "definition": "che prova disagio con le altre persone",
+    "examples": ["Il bambino è timido.", "Erano timidi alla festa.", "Sarà meno timida domani."],
+    "type": "ADJECTIVE",
+}
+
+
+def fake_reply(prompt: str) -> str:
+    """
+    Canned reply in the shape the given prompt asks for.
+    """
+    if '"candidates"' in prompt:
+        return json.dumps({"candidates": [
+            {"word": word, "meanings": [FAKE_MEANING]} for word in ("timido", "riservato", "introverso")
+        ]}, ensure_ascii=False)
+    if '"close"' in prompt:
+        return json.dumps({"close": True, "hint": "Pensa a una persona che arrossisce facilmente."}, ensure_ascii=False)
+    if '"meanings"' in prompt:
+        return json.dumps({"word": "timido", "meanings": [FAKE_MEANING]}, ensure_ascii=False)
+    if '"Presente"' in prompt:
+        return json.dumps({"Presente": ["io corro", "tu corri", "lui/lei corre", "noi corriamo", "voi correte", "loro corrono"]})
+    if "SI o NO" in prompt:
+        return "NO"
+    return "Una persona che ha paura di parlare con gli sconosciuti."
+
+
+class FakeBedrockClient:
+    """
+    Stand-in for the bedrock-runtime client with a fixed latency profile.
+
+    invoke_model waits for the whole (simulated) generation, invoke_model_with_response_stream
+    emits the first chunk after FAKE_FIRST_TOKEN_DELAY and the rest FAKE_CHUNK_DELAY apart,
+    so time-to-first-token can be measured offline.
+    """
+
+    def _reply(self, body: bytes) -> str:
+        request = json.loads(body)
+        return fake_reply(request["messages"][0]["content"][0]["text"])
+
+    def _chunks(self, text: str) -> list[str]:
+        return [text[i:i + FAKE_CHUNK_SIZE] for i in range(0, len(text), FAKE_CHUNK_SIZE)]
+
+    def _usage(self, body: bytes, text: str) -> dict:
+        # Rough token estimate, about 4 characters per token
+        input_tokens = len(body) // 4
+        output_tokens = len(text) // 4
+        return {"inputTokens": input_tokens, "outputTokens": output_tokens, "totalTokens": input_tokens + output_tokens}
+
+    def invoke_model(self, modelId: str, body: bytes, **kwargs) -> dict:
+        text = self._reply(body)
+        time.sleep(FAKE_FIRST_TOKEN_DELAY + FAKE_CHUNK_DELAY * (len(self._chunks(text)) - 1))
+        result = {
+            "output": {"message": {"role": "assistant", "content": [{"text": text}]}},
+            "stopReason": "end_turn",
+            "usage": self._usage(body, text),
+        }
+        return {"body": io.BytesIO(json.dumps(result).encode("utf-8"))}
+
+    def invoke_model_with_response_stream(self, modelId: str, body: bytes, **kwargs) -> dict:
+        text = self._reply(body)
+
+        def events():
+            time.sleep(FAKE_FIRST_TOKEN_DELAY)
+            for index, chunk in enumerate(self._chunks(text)):
+                if index:
+                    time.sleep(FAKE_CHUNK_DELAY)
+                payload = {"contentBlockDelta": {"delta": {"text": chunk}, "contentBlockIndex": 0}}
+                yield {"chunk": {"bytes": json.dumps(payload).encode("utf-8")}}
+            payload = {"metadata": {"usage": self._usage(body, text)}}
+            yield {"chunk": {"bytes": json.dumps(payload).encode("utf-8")}}
+
+        return {"body": events()}
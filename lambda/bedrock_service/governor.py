@@ -0,0 +1,206 @@
+import os
+import random
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError, ReadTimeoutError
+
+from utils import logging
+
+# Concurrent model invocations per container
+BEDROCK_MAX_CONCURRENCY = int(os.getenv("BEDROCK_MAX_CONCURRENCY", "4"))
+# Token bucket - sustained invocations per second and burst size
+BEDROCK_RATE_PER_SECOND = float(os.getenv("BEDROCK_RATE_PER_SECOND", "5"))
+BEDROCK_BURST = int(os.getenv("BEDROCK_BURST", "10"))
+# Longest wait for a free slot or a token before giving up with ModelUnavailableError
+BEDROCK_MAX_WAIT = float(os.getenv("BEDROCK_MAX_WAIT", "10"))
+# Attempts per invocation (1 = no retry) and backoff bounds in seconds
+BEDROCK_MAX_ATTEMPTS = int(os.getenv("BEDROCK_MAX_ATTEMPTS", "4"))
+BEDROCK_BACKOFF_BASE = float(os.getenv("BEDROCK_BACKOFF_BASE", "0.25"))
+BEDROCK_BACKOFF_MAX = float(os.getenv("BEDROCK_BACKOFF_MAX", "4"))
+# Consecutive failed invocations that open the circuit, and how long it stays open
+BEDROCK_BREAKER_THRESHOLD = int(os.getenv("BEDROCK_BREAKER_THRESHOLD", "5"))
+BEDROCK_BREAKER_COOLDOWN = float(os.getenv("BEDROCK_BREAKER_COOLDOWN", "30"))
+
+# Retryable error codes and the backoff multiplier for each - throttling backs off harder
+RETRYABLE_ERRORS = {
+    "ThrottlingException": 2.0,
+    "TooManyRequestsException": 2.0,
+    "ServiceQuotaExceededException": 2.0,
+    "ModelNotReadyException": 1.0,
+    "ServiceUnavailableException": 1.0,
+    "InternalServerException": 1.0,
+    "ModelTimeoutException": 1.0,
+}
+TRANSPORT_ERROR_MULTIPLIER = 1.0
+
+# Attempts made by the last invoke() in this context, read back for per-call metrics
+_last_attempts: ContextVar[int] = ContextVar("bedrock_attempts", default=0)
+
+
+class ModelUnavailableError(Exception):
+    """
+    The model is degraded (circuit open) or saturated - callers should answer 503.
+    """
+
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class BedrockGovernor:
+    """
+    Shared gate for every model invocation in the container: concurrency semaphore,
+    token-bucket rate limit, jittered exponential backoff by error type and a circuit breaker.
+    """
+
+    def __init__(self):
+        self._semaphore = threading.BoundedSemaphore(BEDROCK_MAX_CONCURRENCY)
+        self._lock = threading.Lock()
+        self._tokens = float(BEDROCK_BURST)
+        self._refilled_at = time.monotonic()
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._consecutive_failures = 0
+        self._in_flight = 0
+        self.metrics = Counter()
+
+    def invoke(self, func, *args, **kwargs):
+        """
+        Call func (a boto3 bedrock-runtime call) under the governor's rules.
+
+        Raises:
+            ModelUnavailableError: Circuit open, or no slot / token within BEDROCK_MAX_WAIT
+            ClientError: Non-retryable errors, or retryable ones after the last attempt
+        """
+        _last_attempts.set(0)
+        trial = self._enter_breaker()
+        try:
+            return self._invoke(func, *args, **kwargs)
+        finally:
+            # Whatever happened (caller error, no token / slot), the next call may probe again
+            if trial:
+                self._release_trial()
+
+    def _invoke(self, func, *args, **kwargs):
+        for attempt in range(1, BEDROCK_MAX_ATTEMPTS + 1):
+            _last_attempts.set(attempt)
+            self._take_token()
+            if not self._semaphore.acquire(timeout=BEDROCK_MAX_WAIT):
+                self.metrics["rejected_saturated"] += 1
+                raise ModelUnavailableError("Model invocation queue is full", retry_after=1)
+            try:
+                with self._lock:
+                    self._in_flight += 1
+                self.metrics["invocations"] += 1
+                result = func(*args, **kwargs)
+            except Exception as e:
+                multiplier = self._retry_multiplier(e)
+                if multiplier is None:
+                    # Caller error (validation, access) - says nothing about model health
+                    raise
+                self.metrics[f"error_{self._error_code(e)}"] += 1
+                if attempt == BEDROCK_MAX_ATTEMPTS:
+                    self._record_failure()
+                    raise
+                delay = random.uniform(0, min(BEDROCK_BACKOFF_MAX, BEDROCK_BACKOFF_BASE * multiplier * 2 ** (attempt - 1)))
+                self.metrics["retries"] += 1
+                logging.warning(f"Bedrock {self._error_code(e)} at attempt {attempt}, retrying in {delay:.2f}s",
+                                extra={"bedrock_governor": self.snapshot()})
+            else:
+                self._record_success()
+                return result
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                self._semaphore.release()
+            time.sleep(delay)
+
+    def last_attempts(self) -> int:
+        return _last_attempts.get()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "in_flight": self._in_flight,
+                "tokens": round(self._tokens, 2),
+                **self.metrics,
+            }
+
+    def _error_code(self, e: Exception) -> str:
+        if isinstance(e, ClientError):
+            return e.response["Error"]["Code"]
+        return type(e).__name__
+
+    def _retry_multiplier(self, e: Exception):
+        if isinstance(e, ClientError):
+            return RETRYABLE_ERRORS.get(e.response["Error"]["Code"])
+        if isinstance(e, (BotoConnectionError, ReadTimeoutError)):
+            return TRANSPORT_ERROR_MULTIPLIER
+        return None
+
+    def _take_token(self):
+        deadline = time.monotonic() + BEDROCK_MAX_WAIT
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(BEDROCK_BURST, self._tokens + (now - self._refilled_at) * BEDROCK_RATE_PER_SECOND)
+                self._refilled_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / BEDROCK_RATE_PER_SECOND
+            if now + wait > deadline:
+                self.metrics["rejected_rate"] += 1
+                raise ModelUnavailableError("Model invocation rate limit reached", retry_after=wait)
+            self.metrics["rate_limited"] += 1
+            time.sleep(wait)
+
+    def _enter_breaker(self) -> bool:
+        # Returns True if this call is the half-open trial (released by the caller)
+        with self._lock:
+            if self._state == "closed":
+                return False
+            remaining = self._opened_at + BEDROCK_BREAKER_COOLDOWN - time.monotonic()
+            if self._state == "open" and remaining <= 0:
+                self._state = "half_open"
+            if self._state == "half_open" and not self._trial_in_flight:
+                # Let a single trial call through to probe the model
+                self._trial_in_flight = True
+                return True
+        self.metrics["rejected_open"] += 1
+        raise ModelUnavailableError("Model is temporarily unavailable", retry_after=max(remaining, 1))
+
+    def _release_trial(self):
+        with self._lock:
+            self._trial_in_flight = False
+
+    def _record_success(self):
+        with self._lock:
+            changed = self._state != "closed"
+            self._state = "closed"
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+        if changed:
+            logging.info("Bedrock circuit closed", extra={"bedrock_governor": self.snapshot()})
+
+    def _record_failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            self._trial_in_flight = False
+            opened = self._state == "half_open" or (
+                self._state == "closed" and self._consecutive_failures >= BEDROCK_BREAKER_THRESHOLD)
+            if opened:
+                self._state = "open"
+                self._opened_at = time.monotonic()
+        if opened:
+            self.metrics["circuit_opened"] += 1
+            logging.error("Bedrock circuit opened", extra={"bedrock_governor": self.snapshot()})
+
+
+governor = BedrockGovernor()
@@ -0,0 +1,130 @@
+import json
+import re
+
+# Opening quote -> quotes that may close it
+QUOTE_PAIRS = {
+    '"': ('"',),
+    "“": ("”", '"'),
+    "„": ("“", "”", '"'),
+    "«": ("»",),
+    "'": ("'", "’"),
+    "‘": ("’", "'"),
+}
+# Characters that may follow a closing quote - anything else means the quote belongs to the text
+AFTER_STRING = ":,}]"
+LITERALS = {"True": "true", "False": "false", "None": "null"}
+FENCE_PATTERN = re.compile(r"```(?:json|JSON)?\s*(.*?)(?:```|$)", re.DOTALL)
+BARE_WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+
+def _next_significant(text: str, index: int) -> str:
+    while index < len(text) and text[index].isspace():
+        index += 1
+    return text[index] if index < len(text) else ""
+
+
+def repair_json(text: str):
+    """
+    Parse JSON from a model reply, fixing the usual formatting mistakes.
+
+    Handles code fences, text around the JSON, trailing commas, single, smart (“”)
+    and angle («») quotes, unescaped quotes and newlines inside strings, Python
+    literals and output truncated in the middle of a string, array or object.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        The parsed JSON value
+
+    Raises:
+        ValueError: If the text cannot be repaired
+    """
+    fence = FENCE_PATTERN.search(text)
+    if fence:
+        text = fence.group(1)
+
+    start = min([i for i in (text.find("{"), text.find("[")) if i != -1], default=-1)
+    if start == -1:
+        raise ValueError("Invalid JSON format: no braces found")
+
+    out = []
+    stack = []
+    closers = None
+    i = start
+    while i < len(text):
+        char = text[i]
+
+        if closers is not None:
+            # Inside a string
+            if char == "\\" and i + 1 < len(text):
+                out.append(text[i:i + 2])
+                i += 2
+                continue
+            if char in closers and (_next_significant(text, i + 1) in AFTER_STRING):
+                out.append('"')
+                closers = None
+            elif char == '"':
+                out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            elif char == "\r":
+                out.append("\\r")
+            elif char == "\t":
+                out.append("\\t")
+            else:
+                out.append(char)
+            i += 1
+            continue
+
+        if char in QUOTE_PAIRS:
+            closers = QUOTE_PAIRS[char]
+            out.append('"')
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char in "}]":
+            if not stack:
+                break
+            _drop_trailing_comma(out)
+            out.append(stack.pop())
+            if not stack:
+                break
+        elif char == ",":
+            if _next_significant(text, i + 1) not in ("}", "]"):
+                out.append(char)
+        elif char.isalpha():
+            # Bare word - a Python literal is translated, anything else (è, si) is left to fail the parse
+            match = BARE_WORD_PATTERN.match(text, i)
+            if match is None:
+                raise ValueError(f"Invalid JSON format: unexpected character {char!r}")
+            word = match.group(0)
+            out.append(LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    # Truncated reply - close whatever is still open
+    if closers is not None:
+        out.append('"')
+    if stack:
+        _drop_trailing_comma(out)
+        if "".join(out).rstrip().endswith(":"):
+            out.append("null")
+        while stack:
+            _drop_trailing_comma(out)
+            out.append(stack.pop())
+
+    try:
+        return json.loads("".join(out))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Could not repair JSON: {str(e)}") from e
+
+
+def _drop_trailing_comma(out: list) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
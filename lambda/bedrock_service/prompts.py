@@ -0,0 +1,143 @@
+import json
+import os
+import random
+import string
+import threading
+import time
+
+from utils import logging
+
+# Resolved against the package, not the working directory (openapi.py runs from the repo root)
+PROMPTS_DIR = os.getenv("PROMPTS_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resources", "prompts"))
+# Dev mode - re-check template mtimes (at most every PROMPTS_RELOAD_INTERVAL seconds) and reload changed ones
+PROMPTS_RELOAD = os.getenv("PROMPTS_RELOAD", "false").lower() == "true"
+PROMPTS_RELOAD_INTERVAL = float(os.getenv("PROMPTS_RELOAD_INTERVAL", "2"))
+# Optional file in a variant directory mapping variant name -> selection weight (default 1)
+WEIGHTS_FILE = "weights.json"
+
+# Placeholders each prompt must use - a template missing one (or using an unknown one) fails at startup
+PLACEHOLDERS = {
+    "add_other_meanings": {"json", "word"},
+    "challenge_check": {"challenge", "guess"},
+    "challenge_check_hint": {"challenge", "guess", "word"},
+    "challenge_hint": {"challenge", "guess", "word"},
+    "clean_json": {"output"},
+    "create_challenge": {"word"},
+    "describe_word": {"count", "definition"},
+    "describe_word_exclusions": {"count", "definition", "exclusions"},
+    "verb_forms": {"verb"},
+}
+
+
+class PromptTemplate:
+    def __init__(self, name: str, variant: str, text: str, weight: float = 1.0):
+        self.name = name
+        self.variant = variant
+        self.text = text
+        self.weight = weight
+        # Parsing also rejects broken templates (unbalanced braces) at load time
+        self.fields = {field for _, field, _, _ in string.Formatter().parse(text) if field is not None}
+
+    def render(self, **params) -> str:
+        return self.text.format(**params)
+
+
+class PromptRegistry:
+    """
+    All prompt templates, read and validated once per container.
+    A prompt is either <name>.txt or a directory <name>/ of weighted variants (<variant>.txt).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._templates = self._load()
+        self._mtimes = self._file_mtimes()
+
+    def get(self, name: str) -> list[PromptTemplate]:
+        if PROMPTS_RELOAD:
+            self._reload_if_changed()
+        try:
+            return self._templates[name]
+        except KeyError:
+            logging.error(f"Prompt template {name} not found in {self.directory}")
+            raise
+
+    def render(self, name: str, **params) -> str:
+        return self.get(name)[0].render(**params)
+
+    def render_random(self, name: str, **params) -> str:
+        variants = self.get(name)
+        template = random.choices(variants, weights=[v.weight for v in variants])[0]
+        logging.debug(f"Using prompt variant {name}/{template.variant}")
+        return template.render(**params)
+
+    def _file_mtimes(self) -> dict[str, float]:
+        mtimes = {}
+        for root, _, names in os.walk(self.directory):
+            for n in names:
+                if n.endswith(".txt") or n == WEIGHTS_FILE:
+                    mtimes[os.path.join(root, n)] = os.path.getmtime(os.path.join(root, n))
+        return mtimes
+
+    def _load(self) -> dict[str, list[PromptTemplate]]:
+        templates = {}
+        for entry in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, entry)
+            if os.path.isdir(path):
+                templates[entry] = self._load_variants(entry, path)
+            elif entry.endswith(".txt"):
+                name = entry[:-len(".txt")]
+                templates[name] = [PromptTemplate(name, name, self._read(path))]
+
+        errors = []
+        for name, expected in PLACEHOLDERS.items():
+            if name not in templates:
+                errors.append(f"{name}: template missing")
+                continue
+            for template in templates[name]:
+                if template.fields != expected:
+                    errors.append(f"{name}/{template.variant}: placeholders {sorted(template.fields)}, expected {sorted(expected)}")
+        if errors:
+            raise ValueError(f"Invalid prompt templates in {self.directory}: " + "; ".join(errors))
+
+        logging.info(f"Loaded {sum(len(v) for v in templates.values())} prompt templates from {self.directory}")
+        return templates
+
+    def _load_variants(self, name: str, directory: str) -> list[PromptTemplate]:
+        weights = {}
+        weights_path = os.path.join(directory, WEIGHTS_FILE)
+        if os.path.exists(weights_path):
+            with open(weights_path, "r", encoding="utf-8") as f:
+                weights = json.load(f)
+        variants = [
+            PromptTemplate(name, f[:-len(".txt")], self._read(os.path.join(directory, f)), float(weights.get(f[:-len(".txt")], 1)))
+            for f in sorted(os.listdir(directory)) if f.endswith(".txt")
+        ]
+        if not any(v.weight > 0 for v in variants):
+            raise ValueError(f"No prompt templates with a positive weight in {directory}")
+        return variants
+
+    def _read(self, path: str) -> str:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def _reload_if_changed(self):
+        now = time.monotonic()
+        if now - self._checked_at < PROMPTS_RELOAD_INTERVAL:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtimes = self._file_mtimes()
+                if mtimes == self._mtimes:
+                    return
+                self._mtimes = mtimes
+                self._templates = self._load()
+            except (OSError, ValueError) as e:
+                # Keep serving the last good templates while the files are being edited
+                logging.error(f"Failed to reload prompt templates: {str(e)}")
+
+
+registry = PromptRegistry(PROMPTS_DIR)
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+
+from botocore.exceptions import ClientError
+
+from utils import logging, aws
+from utils.cache import LRUCache
+
+# Kill switch for all tiers, call sites still have to opt in
+BEDROCK_CACHE_ENABLED = os.getenv("BEDROCK_CACHE_ENABLED", "true").lower() == "true"
+BEDROCK_CACHE_SIZE = int(os.getenv("BEDROCK_CACHE_SIZE", "512"))
+BEDROCK_CACHE_TTL = int(os.getenv("BEDROCK_CACHE_TTL", str(7 * 24 * 3600)))
+# Empty table name disables the DynamoDB tier
+response_cache_table_name = os.getenv("BEDROCK_CACHE_TABLE", "oghmai_bedrock_cache")
+
+memory_tier = LRUCache(maxsize=BEDROCK_CACHE_SIZE, ttl=BEDROCK_CACHE_TTL)
+cache_metrics = Counter()
+
+_table = None
+
+
+def _get_table():
+    global _table
+    if _table is None and response_cache_table_name:
+        _table = aws.resource("dynamodb").Table(response_cache_table_name)
+    return _table
+
+
+def warm_up() -> None:
+    """
+    Load the DynamoDB tier table ahead of the first lookup.
+    """
+    table = _get_table()
+    if table is not None:
+        try:
+            table.load()
+        except ClientError as e:
+            logging.warning(f"Failed to warm up Bedrock cache table: {e.response['Error']['Message']}")
+
+
+def make_key(model_id: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    payload = json.dumps([model_id, temperature, max_tokens, prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get(key: str) -> dict | None:
+    """
+    Cached Bedrock response for the key, from memory first, then DynamoDB.
+    """
+    if not BEDROCK_CACHE_ENABLED:
+        return None
+
+    result = memory_tier.get(key)
+    if result is not None:
+        cache_metrics["memory_hits"] += 1
+        return result
+
+    table = _get_table()
+    if table is not None:
+        try:
+            item = table.get_item(Key={"cache_key": key}).get("Item")
+            # TTL deletion is lazy, expired items can still be returned for a while
+            if item is not None and int(item.get("ttl", 0)) > time.time():
+                result = json.loads(item["response"])
+                memory_tier.put(key, result)
+                cache_metrics["table_hits"] += 1
+                return result
+        except ClientError as e:
+            logging.warning(f"Error reading Bedrock response cache: {str(e)}")
+
+    cache_metrics["misses"] += 1
+    return None
+
+
+def put(key: str, result: dict) -> None:
+    if not BEDROCK_CACHE_ENABLED:
+        return
+
+    memory_tier.put(key, result)
+    table = _get_table()
+    if table is not None:
+        try:
+            table.put_item(Item={
+                "cache_key": key,
+                # Stored as a string - DynamoDB rejects floats in the raw response
+                "response": json.dumps(result),
+                "ttl": int(time.time()) + BEDROCK_CACHE_TTL
+            })
+        except ClientError as e:
+            logging.warning(f"Error writing Bedrock response cache: {str(e)}")
+
+
+def invalidate(key: str) -> None:
+    # Used when a cached reply turned out to be unusable, so a retry asks the model again
+    memory_tier.pop(key)
+    cache_metrics["invalidations"] += 1
+    table = _get_table()
+    if table is not None:
+        try:
+            table.delete_item(Key={"cache_key": key})
+        except ClientError as e:
+            logging.warning(f"Error invalidating Bedrock response cache: {str(e)}")
+
+
+def stats() -> dict:
+    lookups = cache_metrics["memory_hits"] + cache_metrics["table_hits"] + cache_metrics["misses"]
+    hits = cache_metrics["memory_hits"] + cache_metrics["table_hits"]
+    return {
+        **cache_metrics,
+        "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        "memory": memory_tier.stats(),
+    }
@@ -0,0 +1,68 @@
+import json
+import os
+import re
+from typing import NamedTuple
+
+# Strong model for generation, fast model for short classification / repair prompts
+BEDROCK_MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "amazon.nova-lite-v1:0")
+BEDROCK_FAST_MODEL_ID = os.getenv("BEDROCK_FAST_MODEL_ID", "amazon.nova-micro-v1:0")
+# All meanings come back in one reply, so describe needs more room than the default
+DESCRIBE_MAX_TOKENS = int(os.getenv("DESCRIBE_MAX_TOKENS", "3000"))
+# Optional JSON file with per-route overrides: {"challenge_check": {"model_id": "...", "max_tokens": 20}}
+BEDROCK_ROUTES_FILE = os.getenv("BEDROCK_ROUTES_FILE")
+
+# Only Nova models share the request body built in bedrock._request_body (optionally via an inference profile)
+NOVA_MODEL_PATTERN = re.compile(r"^(?:[a-z]{2,4}\.)?amazon\.nova-")
+
+
+class Route(NamedTuple):
+    model_id: str
+    temperature: float
+    max_tokens: int
+
+
+DEFAULT_ROUTES = {
+    "create_challenge": Route(BEDROCK_MODEL_ID, 0.9, 500),
+    "describe_word": Route(BEDROCK_MODEL_ID, 0.9, DESCRIBE_MAX_TOKENS),
+    "describe_word_exclusions": Route(BEDROCK_MODEL_ID, 0.9, DESCRIBE_MAX_TOKENS),
+    "add_other_meanings": Route(BEDROCK_MODEL_ID, 0.5, DESCRIBE_MAX_TOKENS),
+    "verb_forms": Route(BEDROCK_MODEL_ID, 0.3, 1000),
+    "challenge_check": Route(BEDROCK_FAST_MODEL_ID, 0.2, 20),
+    "challenge_hint": Route(BEDROCK_FAST_MODEL_ID, 0.7, 200),
+    "challenge_check_hint": Route(BEDROCK_FAST_MODEL_ID, 0.2, 300),
+    # max_tokens is raised to the source route's when cleaning up its reply
+    "clean_json": Route(BEDROCK_FAST_MODEL_ID, 0.0, 500),
+}
+
+
+def _load_routes() -> dict[str, Route]:
+    routes = dict(DEFAULT_ROUTES)
+    overrides = {}
+    if BEDROCK_ROUTES_FILE:
+        with open(BEDROCK_ROUTES_FILE, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+
+    for name in set(routes) | set(overrides):
+        route = routes.get(name, Route(BEDROCK_MODEL_ID, 0.9, 500))
+        values = route._asdict()
+        values.update(overrides.get(name, {}))
+        # Environment wins over the file: BEDROCK_ROUTE_<NAME>_MODEL_ID / _TEMPERATURE / _MAX_TOKENS
+        for field in Route._fields:
+            env_value = os.getenv(f"BEDROCK_ROUTE_{name.upper()}_{field.upper()}")
+            if env_value is not None:
+                values[field] = env_value
+        route = Route(str(values["model_id"]), float(values["temperature"]), int(values["max_tokens"]))
+        if not NOVA_MODEL_PATTERN.match(route.model_id):
+            raise ValueError(f"Route {name} uses {route.model_id}, only Amazon Nova models are supported")
+        routes[name] = route
+    return routes
+
+
+routes = _load_routes()
+
+
+def get_route(prompt_name: str) -> Route:
+    """
+    Model, temperature and max_tokens for a prompt. Unknown prompts use the default model.
+    """
+    return routes.get(prompt_name, Route(BEDROCK_MODEL_ID, 0.9, 500))
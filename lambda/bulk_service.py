@@ -0,0 +1,160 @@
+import contextvars
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+import db_service
+from models import *
+from utils import logging, tasks
+
+# Words written in parallel (each is its own conditional update / transaction)
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "8"))
+# Words read (keys only) and processed per step, the run can stop between steps
+BULK_PAGE_SIZE = int(os.getenv("BULK_PAGE_SIZE", "100"))
+# Seconds kept free before the Lambda timeout when deciding whether to start another step
+BULK_DEADLINE_MARGIN = float(os.getenv("BULK_DEADLINE_MARGIN", "4"))
+
+
+def deadline_from_context(context) -> float | None:
+    # Lambda context (or None locally, where there is no timeout)
+    if context is None:
+        return None
+    return time.time() + context.get_remaining_time_in_millis() / 1000 - BULK_DEADLINE_MARGIN
+
+
+def run_bulk_action(user_id: str, lang: str, action: WordActionEnum, request: BulkWordRequest,
+                    deadline: float = None) -> BulkWordResult:
+    """
+    Reset, delete or undelete many words - the explicit list in the request, or all words
+    (of the requested status) read page by page, keys only.
+
+    Words of a step are written in parallel, failures are collected per word and do not stop the run.
+    The statistics counters are updated once at the end. With a deadline, the run stops between
+    steps and the result carries a cursor to continue from.
+    """
+    logging.info(f"Bulk {action.value} for user {user_id} @ {lang}", extra={"bulk_request": request.model_dump()})
+
+    result = BulkWordResult(action=action)
+    deltas = Counter()
+    due_times = []
+    with ThreadPoolExecutor(max_workers=BULK_CONCURRENCY) as executor:
+        for words, cursor in _steps(user_id, lang, action, request):
+            _process_step(executor, user_id, lang, action, words, result, deltas, due_times)
+            result.cursor = cursor
+            logging.info(f"Bulk {action.value} progress: {result.processed} processed, {len(result.failed)} failed")
+            if cursor is not None and deadline is not None and time.time() >= deadline:
+                result.complete = False
+                break
+
+    if deltas or due_times:
+        db_service.adjust_statistics(user_id, lang, dict(deltas), min(due_times) if due_times else None)
+
+    result.message = f"{result.succeeded} of {result.processed} words processed" + ("" if result.complete else ", stopped early")
+    logging.info(f"Bulk {action.value} for user {user_id} @ {lang} done: {result.message}",
+                 extra={"bulk_failed": len(result.failed), "bulk_complete": result.complete})
+    return result
+
+
+def run_bulk_task(event: dict, context) -> dict:
+    """
+    Scheduled-task entry point ({"oghmai_task": "bulk_words", ...}): continue a bulk run and
+    chain another invocation until it completes.
+    """
+    action = WordActionEnum(event["action"])
+    request = BulkWordRequest(**event["request"])
+    result = run_bulk_action(event["user_id"], event["lang"], action, request, deadline_from_context(context))
+    if not result.complete:
+        continue_later(event["user_id"], event["lang"], action, request, result.cursor)
+    return result.model_dump(mode="json")
+
+
+def continue_later(user_id: str, lang: str, action: WordActionEnum, request: BulkWordRequest, cursor: str) -> bool:
+    # Returns False when not running on Lambda (the caller gets the cursor instead)
+    request = request.model_copy(update={"cursor": cursor})
+    return tasks.dispatch("bulk_words", user_id=user_id, lang=lang, action=action.value,
+                          request=request.model_dump(mode="json"))
+
+
+def purge_words(user_id: str, lang: str, cursor: str = None, context=None) -> dict:
+    """
+    Delete all words of the user (db_service.purge_words) and, when it stops at the Lambda
+    deadline, continue in a separate invocation ("purge_words" task).
+
+    Returns:
+        {"deleted", "complete", "cursor", "continued"} - deleted counts this invocation only
+    """
+    result = db_service.purge_words(user_id, lang, cursor, deadline_from_context(context))
+    result["continued"] = not result["complete"] and tasks.dispatch(
+        "purge_words", user_id=user_id, lang=lang, cursor=result["cursor"])
+    return result
+
+
+def run_purge_task(event: dict, context) -> dict:
+    # Scheduled-task entry point ({"oghmai_task": "purge_words", ...}), chains itself until complete
+    return purge_words(event["user_id"], event["lang"], event.get("cursor"), context)
+
+
+def _steps(user_id: str, lang: str, action: WordActionEnum, request: BulkWordRequest):
+    # Yields (words, cursor after them) - cursor None after the last step
+    if request.words is not None:
+        # Explicit list, the cursor is the offset into it
+        cursor = request.cursor or "0"
+        if not cursor.isdigit():
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        offset = int(cursor)
+        while offset < len(request.words):
+            end = offset + BULK_PAGE_SIZE
+            yield request.words[offset:end], str(end) if end < len(request.words) else None
+            offset = end
+        return
+
+    status = request.status.value if request.status else None
+    pages = db_service.iter_word_key_pages(user_id, lang, recycle_bin=action == WordActionEnum.UNDELETE,
+                                           status=status, cursor=request.cursor, page_size=BULK_PAGE_SIZE)
+    for items, cursor in pages:
+        if items or cursor is None:
+            yield [item["word"] for item in items], cursor
+
+
+def _process_step(executor: ThreadPoolExecutor, user_id: str, lang: str, action: WordActionEnum, words: list[str],
+                  result: BulkWordResult, deltas: Counter, due_times: list):
+    items = {}
+    if action in (WordActionEnum.DELETE, WordActionEnum.UNDELETE):
+        # One BatchGetItem for the step instead of a read per word
+        items = db_service.get_word_items(user_id, lang, words, recycle_bin=action == WordActionEnum.UNDELETE)
+
+    def process(word: str):
+        if action == WordActionEnum.RESET:
+            old_status = db_service.reset_word_status(user_id, lang, word)
+            deltas = {old_status: -1, StatusEnum.NEW: 1} if old_status != StatusEnum.NEW else {}
+            return deltas, StatusEnum.NEW.due_at(None)
+
+        item = items.get(word.lower())
+        if item is None:
+            raise HTTPException(status_code=404, detail="Word not found")
+        if action == WordActionEnum.DELETE:
+            db_service.delete_word(user_id, lang, word, item=item, update_statistics=False)
+            return {item["status"]: -1}, None
+        db_service.undelete_word(user_id, lang, word, item=item, update_statistics=False)
+        return {item["status"]: 1}, item.get("due_at")
+
+    # Each task runs in a copy of this context, so logs keep the request ID
+    futures = [(word, executor.submit(contextvars.copy_context().run, process, word)) for word in words]
+    for word, future in futures:
+        result.processed += 1
+        try:
+            word_deltas, due_at = future.result()
+        except HTTPException as e:
+            result.failed.append(BulkWordFailure(word=word, error=str(e.detail)))
+            continue
+        except Exception as e:
+            logging.exception(f"Bulk {action.value} of word {word} failed: {str(e)}")
+            result.failed.append(BulkWordFailure(word=word, error="Internal Server Error"))
+            continue
+        result.succeeded += 1
+        deltas.update(word_deltas)
+        if due_at is not None:
+            due_times.append(int(due_at))
@@ -1,25 +1,43 @@
+import os
 import random
-from datetime import datetime
+import time
+from collections import Counter
+from datetime import datetime, timezone
 
 import bedrock_service
 import db_service
+import matching_service
 from models import *
 from utils import logging
 from typing import List
 
-FILTER = {
-    StatusEnum.NEW: 1,
-    StatusEnum.LEARNED: 3,
-    StatusEnum.KNOWN: 7,
-    StatusEnum.MASTERED: 14,
-}
-
 MAX_MISSES = 2
 
+# "merged" asks for closeness and hint in one Bedrock call, "split" uses the old two prompts
+CHALLENGE_CHECK_MODE = os.getenv("CHALLENGE_CHECK_MODE", "merged").lower()
+
+# Pre-generated challenge pool - depth 0 disables it
+CHALLENGE_POOL_DEPTH = int(os.getenv("CHALLENGE_POOL_DEPTH", "3"))
+# Comma separated events that refill the pool: validate, save, schedule
+CHALLENGE_POOL_REFILL_ON = {t.strip() for t in os.getenv("CHALLENGE_POOL_REFILL_ON", "validate,save,schedule").split(",") if t.strip()}
+# Pooled challenges are only kept this long, after that they are regenerated
+CHALLENGE_POOL_TTL = int(os.getenv("CHALLENGE_POOL_TTL", str(24 * 3600)))
+
+# Per-container pool counters, logged with every pool operation
+pool_metrics = Counter()
+
 def get_statistics(user_id: str, lang: str):
     logging.info(f"Getting statistics for user {user_id} @ {lang}")
-    words = db_service.get_testable_words(user_id, lang, FILTER)
-    response =  TestStatistics()
+    stats = db_service.get_statistics(user_id, lang)
+    response = TestStatistics()
+    response.total.update(stats["counts"])
+    response.nextDueAt = _to_datetime(stats["next_due_at"])
+
+    # Nothing is due yet - the counters item alone answers the request
+    if not _has_due_words(stats):
+        return response
+
+    words = _get_due_words(user_id, lang)
 
     # group by word.status in words in response.available
     for word in words:
@@ -27,36 +45,196 @@ def get_statistics(user_id: str, lang: str):
 
     return response
 
+def _has_due_words(stats: dict) -> bool:
+    # next_due_at is a lower bound, so a future value guarantees nothing is due
+    return stats["next_due_at"] is not None and stats["next_due_at"] <= int(time.time())
+
+def _get_due_words(user_id: str, lang: str):
+    words = db_service.get_testable_words(user_id, lang)
+    if not words:
+        # The lower bound went stale (words were tested since), move it to the real next due time
+        db_service.set_next_due_at(user_id, lang, db_service.get_next_due_at(user_id, lang))
+    return words
+
+def _to_datetime(timestamp: int | None):
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp is not None else None
+
 def get_next_test(user_id: str, lang: str):
     logging.info(f"Getting next test for user {user_id} @ {lang}")
-    words = db_service.get_testable_words(user_id, lang, FILTER)
+    if not _has_due_words(db_service.get_statistics(user_id, lang)):
+        logging.info(f"No words due for user {user_id} @ {lang}")
+        return None
+
+    words = _get_due_words(user_id, lang)
 
     if not words:
         logging.info(f"No words available for user {user_id} @ {lang}")
         return None
 
+    pooled = _pop_pooled_challenge(user_id, lang, {w.word for w in words})
+    if pooled is not None:
+        return pooled
+
     # select a random word
     word = random.choice(words)
 
     # get from bedrock
     desc = bedrock_service.create_challenge(word.word)
 
-    # store
+    return _store_live_challenge(user_id, lang, word, desc)
+
+
+def get_next_test_stream(user_id: str, lang: str):
+    """
+    Streaming variant of get_next_test.
+
+    Yields:
+        ("delta", text) while a new challenge is generated, then ("result", TestChallenge | None) once
+    """
+    logging.info(f"Streaming next test for user {user_id} @ {lang}")
+    if not _has_due_words(db_service.get_statistics(user_id, lang)):
+        yield "result", None
+        return
+
+    words = _get_due_words(user_id, lang)
+    if not words:
+        yield "result", None
+        return
+
+    pooled = _pop_pooled_challenge(user_id, lang, {w.word for w in words})
+    if pooled is not None:
+        yield "result", pooled
+        return
+
+    word = random.choice(words)
+    chunks = []
+    # Summed locally - a measure_usage() block must not be held across a yield
+    usage = bedrock_service.new_usage()
+    for text in bedrock_service.create_challenge_stream(word.word, usage):
+        chunks.append(text)
+        yield "delta", text
+    logging.info(f"Streamed challenge for {word.word} with {usage['totalTokens']} tokens")
+
+    yield "result", _store_live_challenge(user_id, lang, word, "".join(chunks))
+
+
+def _store_live_challenge(user_id: str, lang: str, word: WordResult, desc: str) -> TestChallenge:
     ch_id = db_service.store_challenge(user_id, word.language, desc, word.word)
     logging.info(f"Stored challenge {ch_id} ({desc}) for user {user_id} @ {lang}")
     return TestChallenge(description=desc, id=ch_id)
 
 
+def _pop_pooled_challenge(user_id: str, lang: str, due_words: set):
+    if CHALLENGE_POOL_DEPTH <= 0:
+        return None
+
+    # Only hand out challenges for words that are still due
+    candidates = [c for c in db_service.get_pooled_challenges(user_id, lang) if c["word"] in due_words]
+    random.shuffle(candidates)
+    for candidate in candidates:
+        if db_service.claim_pooled_challenge(user_id, candidate["challenge_id"]):
+            _record_pool_event("hit")
+            return TestChallenge(description=candidate["description"], id=candidate["challenge_id"])
+
+    _record_pool_event("miss")
+    return None
+
+
+def _record_pool_event(event: str, count: int = 1):
+    pool_metrics[event] += count
+    lookups = pool_metrics["hit"] + pool_metrics["miss"]
+    hit_rate = pool_metrics["hit"] / lookups if lookups else 0.0
+    logging.info(f"Challenge pool {event} ({count})", extra={"challenge_pool": dict(pool_metrics), "challenge_pool_hit_rate": round(hit_rate, 3)})
+
+
+def pool_needs_refill(user_id: str, lang: str, trigger: str) -> bool:
+    """
+    Whether a refill on this trigger is worth dispatching: it is enabled and the pool holds fewer than
+    CHALLENGE_POOL_DEPTH live challenges. One query, so a full pool costs no extra invocation.
+    Challenges of words that are no longer due still count here - the refill itself ignores them.
+    """
+    if CHALLENGE_POOL_DEPTH <= 0 or trigger not in CHALLENGE_POOL_REFILL_ON:
+        return False
+    pooled = len(db_service.get_pooled_challenges(user_id, lang))
+    if pooled >= CHALLENGE_POOL_DEPTH:
+        logging.info(f"Challenge pool of user {user_id} @ {lang} is full, no refill on {trigger}")
+        return False
+    return True
+
+
+def refill_challenge_pool(user_id: str, lang: str, trigger: str):
+    """
+    Generate challenges ahead of time for due words until the pool holds CHALLENGE_POOL_DEPTH of them.
+
+    Args:
+        user_id: The user ID
+        lang: The language code
+        trigger: What caused the refill (validate, save, schedule) - ignored if not enabled
+
+    Returns:
+        Number of generated challenges
+    """
+    if CHALLENGE_POOL_DEPTH <= 0 or trigger not in CHALLENGE_POOL_REFILL_ON:
+        return 0
+
+    logging.info(f"Refilling challenge pool for user {user_id} @ {lang} on {trigger}")
+
+    words = db_service.get_testable_words(user_id, lang)
+    due_words = {w.word for w in words}
+    pooled_words = [c["word"] for c in db_service.get_pooled_challenges(user_id, lang) if c["word"] in due_words]
+    missing = CHALLENGE_POOL_DEPTH - len(pooled_words)
+    if missing <= 0 or not words:
+        return 0
+
+    # Prefer words without a pooled challenge, so consecutive tests differ
+    unpooled = [w for w in words if w.word not in pooled_words]
+    selection = random.sample(unpooled, min(missing, len(unpooled)))
+
+    generated = 0
+    for word in selection:
+        try:
+            desc = bedrock_service.create_challenge(word.word)
+            db_service.store_challenge(user_id, word.language, desc, word.word, pooled=True, ttl_seconds=CHALLENGE_POOL_TTL)
+            generated += 1
+        except Exception as e:
+            logging.error(f"Error pre-generating challenge for {word.word}: {str(e)}")
+
+    logging.info(f"Refilled challenge pool for user {user_id} @ {lang} on {trigger} with {generated} challenges")
+    if generated:
+        _record_pool_event("generated", generated)
+    return generated
+
+
+def refill_all_challenge_pools(horizon_seconds: int = 3600, deadline: float = None):
+    """
+    Scheduled worker - refill the pool of every user who has (or will soon have) due words.
+
+    Stops early once the deadline (epoch seconds) has passed, the next run picks up the rest.
+    """
+    due_before = int(time.time()) + horizon_seconds
+    total = 0
+    users = 0
+    for user_id, lang in db_service.get_users_with_due_words(due_before):
+        if deadline is not None and time.time() >= deadline:
+            logging.warning(f"Challenge pool refill stopped at deadline after {users} users")
+            break
+        total += refill_challenge_pool(user_id, lang, "schedule")
+        users += 1
+    return {"generated": total, "users": users}
+
+
 def validate_test(user_id: str, challenge_id: str, guess: str):
     logging.info(f"Validating test {challenge_id} for user {user_id}")
     guess = guess.strip().lower()
     # get the challenge
     challenge = db_service.load_challenge_result(user_id, challenge_id)
 
-    # validate directly
-    if guess == challenge["word"]:
+    word = db_service.get_word(user_id, challenge["lang"], challenge["word"])
+
+    # validate locally first - exact, accent / article variants and inflections valid for the word types
+    decision = matching_service.match_answer(guess, challenge["word"], {m.type for m in word.meanings})
+    if decision == matching_service.MatchDecision.MATCH:
         logging.info(f"Correct test {challenge_id} for user {user_id}")
-        word = db_service.get_word(user_id, challenge["lang"], challenge["word"])
         word.testResults.append(True)
         word.testResults = word.testResults[-3:]
         word.lastTest = datetime.now()
@@ -73,15 +251,15 @@ def validate_test(user_id: str, challenge_id: str, guess: str):
         db_service.delete_challenge(user_id, challenge_id)
         return TestResult(result=ResultEnum.CORRECT, word=challenge["word"], newStatus=word.status, oldStatus=old_status)
 
-    # validate "similarity"
-    if challenge["tries"] < MAX_MISSES and bedrock_service.is_challenge_close(challenge["description"], guess):
-        db_service.increment_challenge_tries(user_id, challenge_id)
-        logging.info(f"Close guess {guess} for {challenge_id} for user {user_id}")
-        hint = bedrock_service.get_challenge_hint(challenge["description"], guess, challenge["word"])
-        return TestResult(result=ResultEnum.PARTIAL, suggestion=hint)
+    # validate "similarity" - only worth asking the model if the guess is not obviously wrong
+    if decision == matching_service.MatchDecision.AMBIGUOUS and challenge["tries"] < MAX_MISSES:
+        close, hint = check_closeness(challenge, guess)
+        if close:
+            db_service.increment_challenge_tries(user_id, challenge_id)
+            logging.info(f"Close guess {guess} for {challenge_id} for user {user_id}")
+            return TestResult(result=ResultEnum.PARTIAL, suggestion=hint)
 
     # totally wrong?
-    word = db_service.get_word(user_id, challenge["lang"], challenge["word"])
     word.testResults.append(False)
     word.testResults = word.testResults[-3:]
     word.lastTest = datetime.now()
@@ -99,10 +277,35 @@ def validate_test(user_id: str, challenge_id: str, guess: str):
     return TestResult(result=ResultEnum.INCORRECT, word=challenge["word"], newStatus=word.status, oldStatus=old_status)
 
 
+def check_closeness(challenge: dict, guess: str):
+    """
+    Ask the model whether a wrong guess is close, and for a hint if it is.
+
+    CHALLENGE_CHECK_MODE picks one merged call ("merged") or the check and hint
+    prompts one after the other ("split"); the latency is logged per mode to compare them.
+
+    Returns:
+        Tuple of (close, hint)
+    """
+    start_time = time.time()
+    if CHALLENGE_CHECK_MODE == "split":
+        close = bedrock_service.is_challenge_close(challenge["description"], guess)
+        hint = bedrock_service.get_challenge_hint(challenge["description"], guess, challenge["word"]) if close else None
+    else:
+        close, hint = bedrock_service.check_challenge(challenge["description"], guess, challenge["word"])
+
+    logging.info(f"Closeness check ({CHALLENGE_CHECK_MODE}) took {time.time() - start_time:.2f} seconds",
+                 extra={"challenge_check_mode": CHALLENGE_CHECK_MODE, "challenge_check_seconds": round(time.time() - start_time, 3)})
+    return close, hint
+
+
 def get_random_word_translation_pairs(user_id: str, lang: str, count: int) -> List[WordTranslationPair]:
     """
     Get random word-translation pairs for the match test.
 
+    Streams all pairs from a single paginated query and keeps a uniform sample
+    of 'count' of them (reservoir sampling), so memory stays O(count).
+
     Args:
         user_id: The user ID
         lang: The language code
@@ -113,24 +316,18 @@ def get_random_word_translation_pairs(user_id: str, lang: str, count: int) -> Li
     """
     logging.info(f"Getting random word-translation pairs for user {user_id} @ {lang}, count={count}")
 
-    # Get all words for the user and language
-    word_results = db_service.get_words(user_id, lang)
-
-    # Create a flat list of word-translation pairs
-    all_pairs = []
-    for word_item in word_results:
-        # Get the full word details
-        word_result = db_service.get_word(user_id, lang, word_item.word)
-        if word_result and word_result.meanings:
-            for meaning in word_result.meanings:
-                all_pairs.append(WordTranslationPair(
-                    word=word_result.word,
-                    translation=meaning.translation
-                ))
-
-    # If we don't have enough pairs, return all we have
-    if len(all_pairs) <= count:
-        return all_pairs
-
-    # Randomly select 'count' pairs
-    return random.sample(all_pairs, count)
+    if count <= 0:
+        return []
+
+    reservoir = []
+    for seen, (word, translation) in enumerate(db_service.iter_word_translations(user_id, lang)):
+        if seen < count:
+            reservoir.append(WordTranslationPair(word=word, translation=translation))
+            continue
+        slot = random.randint(0, seen)
+        if slot < count:
+            reservoir[slot] = WordTranslationPair(word=word, translation=translation)
+
+    # Reservoir keeps insertion order for the first 'count' pairs, shuffle for the client
+    random.shuffle(reservoir)
+    return reservoir
@@ -0,0 +1,164 @@
+import os
+
+import bedrock_service
+import db_service
+from models import *
+from utils import logging
+from utils.cache import LRUCache
+
+PERSONS = ["io", "tu", "lui/lei", "noi", "voi", "loro"]
+IMPERATIVE_PERSONS = ["tu", "lui/lei", "noi", "voi", "loro"]
+
+# Endings per tense, in PERSONS order (IMPERATIVE_PERSONS for the imperative)
+ENDINGS = {
+    "are": {
+        "Presente": ["o", "i", "a", "iamo", "ate", "ano"],
+        "Imperfetto": ["avo", "avi", "ava", "avamo", "avate", "avano"],
+        "Futuro Semplice": ["erò", "erai", "erà", "eremo", "erete", "eranno"],
+        "Condizionale Presente": ["erei", "eresti", "erebbe", "eremmo", "ereste", "erebbero"],
+        "Imperativo Presente": ["a", "i", "iamo", "ate", "ino"],
+        "Participio Passato": ["ato", "ata", "ati", "ate"],
+        "Gerundio Presente": ["ando"],
+    },
+    "ere": {
+        "Presente": ["o", "i", "e", "iamo", "ete", "ono"],
+        "Imperfetto": ["evo", "evi", "eva", "evamo", "evate", "evano"],
+        "Futuro Semplice": ["erò", "erai", "erà", "eremo", "erete", "eranno"],
+        "Condizionale Presente": ["erei", "eresti", "erebbe", "eremmo", "ereste", "erebbero"],
+        "Imperativo Presente": ["i", "a", "iamo", "ete", "ano"],
+        "Participio Passato": ["uto", "uta", "uti", "ute"],
+        "Gerundio Presente": ["endo"],
+    },
+    "ire": {
+        "Presente": ["o", "i", "e", "iamo", "ite", "ono"],
+        "Imperfetto": ["ivo", "ivi", "iva", "ivamo", "ivate", "ivano"],
+        "Futuro Semplice": ["irò", "irai", "irà", "iremo", "irete", "iranno"],
+        "Condizionale Presente": ["irei", "iresti", "irebbe", "iremmo", "ireste", "irebbero"],
+        "Imperativo Presente": ["i", "a", "iamo", "ite", "ano"],
+        "Participio Passato": ["ito", "ita", "iti", "ite"],
+        "Gerundio Presente": ["endo"],
+    },
+}
+ISC_ENDINGS = {
+    "Presente": ["isco", "isci", "isce", "iamo", "ite", "iscono"],
+    "Imperativo Presente": ["isci", "isca", "iamo", "ite", "iscano"],
+}
+
+# -are verbs are regular unless listed here: andare, dare, stare and their compounds (ridarò, sottostarò)
+# and stressed -iare verbs, which keep the double i (tu invii)
+IRREGULAR_ARE = {
+    "andare", "riandare", "dare", "ridare", "fare", "stare", "ristare", "soprastare", "sottostare",
+    "sciare", "inviare", "rinviare", "avviare", "ravviare", "spiare", "espiare", "deviare", "sviare",
+    "traviare", "fuorviare", "obliare",
+}
+# Most -ere verbs have an irregular past participle or a syncopated future (godrò, vivrò), so only
+# known fully regular ones are conjugated locally
+REGULAR_ERE = {
+    "abbattere", "battere", "cedere", "combattere", "credere", "fremere", "pendere", "premere",
+    "ricevere", "ripetere", "temere", "vendere",
+}
+# -ire verbs either follow the plain pattern or insert -isc-, which cannot be told from the spelling
+REGULAR_IRE = {
+    "avvertire", "bollire", "consentire", "convertire", "divertire", "dormire", "eseguire", "fuggire",
+    "investire", "partire", "pentire", "seguire", "sentire", "servire", "vestire",
+}
+ISC_IRE = {
+    "agire", "capire", "colpire", "costruire", "definire", "distribuire", "ferire", "finire", "fornire",
+    "favorire", "garantire", "gestire", "impedire", "obbedire", "preferire", "pulire", "punire", "reagire",
+    "restituire", "sparire", "spedire", "stabilire", "suggerire", "tradire", "unire", "arricchire", "chiarire",
+}
+# In-process tier in front of the shared conjugation table
+conjugation_cache = LRUCache(maxsize=int(os.getenv("CONJUGATION_CACHE_SIZE", "512")))
+
+
+def _join(stem: str, ending: str) -> str:
+    # Keep the hard sound of -care / -gare (cerchi, paghiamo) and avoid a double i (mangi, studi)
+    if stem.endswith(("c", "g")) and ending[0] in "ie":
+        return stem + "h" + ending
+    if stem.endswith("i") and ending[0] in "ie":
+        if stem.endswith(("ci", "gi")) and ending[0] == "e":
+            return stem[:-1] + ending
+        return stem + ending[1:] if ending[0] == "i" else stem + ending
+    return stem + ending
+
+
+def conjugate_regular(verb: str) -> dict[str, list[str]] | None:
+    """
+    Conjugate a regular Italian verb locally, in the same shape as the verb_forms prompt.
+
+    Args:
+        verb: Infinitive (lowercase)
+
+    Returns:
+        Tense name -> forms, or None if the verb is (or may be) irregular
+    """
+    verb = verb.strip().lower()
+    if len(verb) < 5:
+        return None
+
+    conjugation = verb[-3:]
+    stem = verb[:-3]
+    if conjugation == "are":
+        if verb in IRREGULAR_ARE or verb.endswith("fare"):
+            return None
+        endings = dict(ENDINGS["are"])
+    elif conjugation == "ere" and verb in REGULAR_ERE:
+        endings = dict(ENDINGS["ere"])
+    elif conjugation == "ire" and (verb in REGULAR_IRE or verb in ISC_IRE):
+        endings = dict(ENDINGS["ire"])
+        if verb in ISC_IRE:
+            endings.update(ISC_ENDINGS)
+    else:
+        return None
+
+    result = {}
+    for tense, tense_endings in endings.items():
+        forms = [stem + e if conjugation != "are" else _join(stem, e) for e in tense_endings]
+        if tense == "Imperativo Presente":
+            result[tense] = [f"{p} {f}" for p, f in zip(IMPERATIVE_PERSONS, forms)]
+        elif len(forms) == len(PERSONS):
+            result[tense] = [f"{p} {f}" for p, f in zip(PERSONS, forms)]
+        else:
+            result[tense] = forms
+    return result
+
+
+def get_verb_explanation(word: WordResult) -> ExplanationResponse | None:
+    """
+    Conjugation table of a verb - from the in-process cache, the shared table, the local
+    conjugator or (for irregular verbs) Bedrock, in that order. New tables are stored for everyone.
+    """
+    logging.info(f"Getting conjugation for word {word.word} @ {word.language}")
+
+    # Currently only VERB type is supported
+    if not any([m.type == WordTypeEnum.VERB for m in word.meanings]):
+        logging.warning(f"Only VERB type is supported for explanations!")
+        return None
+
+    key = (word.language, word.word.lower())
+    explanations = conjugation_cache.get(key)
+    source = "memory"
+
+    if explanations is None:
+        explanations = db_service.get_conjugation(*key)
+        source = "table"
+
+    if explanations is None:
+        explanations = conjugate_regular(word.word)
+        source = "local"
+        if explanations is None:
+            result = bedrock_service.get_verb_explanation(word)
+            if result is None:
+                return None
+            explanations = result.explanations
+            source = "bedrock"
+        db_service.store_conjugation(*key, explanations, source)
+
+    conjugation_cache.put(key, explanations)
+    logging.info(f"Conjugation of {word.word} served from {source}", extra={"conjugation_cache": conjugation_cache.stats()})
+
+    return ExplanationResponse(
+        word=word.word,
+        type=WordTypeEnum.VERB,
+        explanations=explanations
+    )
@@ -4,7 +4,9 @@ import json
 import time
 
 # Import local modules
-from bedrock_service.bedrock import call_bedrock_json, load_prompt_template
+from bedrock_service.bedrock import call_bedrock_json
+from bedrock_service.prompts import registry as prompts
+from models import StatusEnum
 from utils import logging
 
 # Initialize DynamoDB client
@@ -48,12 +50,12 @@ def enrich_with_bedrock(item):
         for i in item["meanings"]:
             i["type"] = "OTHER"
 
-        enhance_prompt = load_prompt_template("add_other_meanings").format(
+        enhance_prompt = prompts.render("add_other_meanings",
             json=json.dumps({"word" : item["word"], "meanings": item["meanings"]}),
             word=item["word"]
         )
 
-        enriched_data = call_bedrock_json(enhance_prompt, max_tokens=2500)
+        enriched_data = call_bedrock_json(enhance_prompt, "add_other_meanings")
 
         if enriched_data and "meanings" in enriched_data and len(enriched_data["meanings"]) > 0:
             # Update the meanings in the item
@@ -131,20 +133,77 @@ def migrate_v1_to_v2():
 
     return failed
 
+def scan_items_without_due_at():
+    """
+    Scan DynamoDB for items saved before due_at was introduced
+    """
+    items = []
+    last_evaluated_key = None
+
+    scan_kwargs = {
+        "FilterExpression": "attribute_not_exists(#due_at) AND attribute_exists(#status)",
+        "ProjectionExpression": "user_id, word, #status, last_test",
+        "ExpressionAttributeNames": {"#due_at": "due_at", "#status": "status"}
+    }
+
+    while True:
+        if last_evaluated_key:
+            scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+        response = vocabulary_table.scan(**scan_kwargs)
+        items.extend(response.get("Items", []))
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+
+        if not last_evaluated_key:
+            break
+
+    return items
+
+def backfill_due_at():
+    """
+    Compute due_at for items that do not have it yet, so they show up in the due index
+    """
+    logging.info("Scanning for items without due_at...")
+    items = scan_items_without_due_at()
+    logging.info(f"Found {len(items)} items without due_at")
+
+    failed = []
+    for item in items:
+        due_at = StatusEnum(item["status"]).due_at(item.get("last_test"))
+        if due_at is None:
+            continue
+        try:
+            vocabulary_table.update_item(
+                Key={"user_id": item["user_id"], "word": item["word"]},
+                UpdateExpression="SET due_at = :due_at",
+                ConditionExpression="attribute_exists(word)",
+                ExpressionAttributeValues={":due_at": due_at}
+            )
+        except Exception as e:
+            logging.error(f"Error backfilling due_at for {item['word']}: {str(e)}")
+            failed.append(item)
+
+    return failed
+
 def main():
     # Here should be "loop over versions"
 
-    failed_items = {"v1": []}
+    failed_items = {"v1": [], "due_at": []}
     # Migrate V1 to V2
     logging.info("Migrating V1 items to V2...")
     failed_items["v1"] = migrate_v1_to_v2()
 
+    # Backfill due_at for the due index
+    logging.info("Backfilling due_at...")
+    failed_items["due_at"] = backfill_due_at()
+
     # Print result - if there were failed items, print them
     # If not print "all fine"
     for v in failed_items.keys():
         if failed_items[v]:
-            logging.error(f"Failed to update {len(failed_items['v1'])} items from {v}")
-            for item in failed_items["v1"]:
+            logging.error(f"Failed to update {len(failed_items[v])} items from {v}")
+            for item in failed_items[v]:
                 logging.error(f"Failed item: {item}")
 
     if all(not failed_items[v] for v in failed_items.keys()):
@@ -0,0 +1,68 @@
+import os
+import time
+import boto3
+
+# Import local modules
+from models import StatusEnum
+from utils import logging
+
+# Initialize DynamoDB client
+dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+vocabulary_table_name = os.getenv("VOCABULARY_TABLE", "oghmai_vocabulary_words")
+vocabulary_table = dynamodb.Table(vocabulary_table_name)
+statistics_table_name = os.getenv("STATISTICS_TABLE", "oghmai_user_statistics")
+statistics_table = dynamodb.Table(statistics_table_name)
+
+TESTED_STATUSES = [s for s in StatusEnum if s != StatusEnum.UNSAVED]
+
+def scan_word_statistics():
+    """
+    Scan all words and aggregate counts by status and the earliest due time per (user, lang)
+    """
+    aggregates = {}
+    last_evaluated_key = None
+
+    scan_kwargs = {
+        "ProjectionExpression": "user_id, lang, #status, due_at",
+        "ExpressionAttributeNames": {"#status": "status"}
+    }
+
+    while True:
+        if last_evaluated_key:
+            scan_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+        response = vocabulary_table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            key = (item["user_id"], item["lang"])
+            aggregate = aggregates.setdefault(key, {"counts": {s: 0 for s in TESTED_STATUSES}, "next_due_at": None})
+            aggregate["counts"][StatusEnum(item["status"])] += 1
+            if item.get("due_at") is not None:
+                due_at = int(item["due_at"])
+                if aggregate["next_due_at"] is None or due_at < aggregate["next_due_at"]:
+                    aggregate["next_due_at"] = due_at
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+
+        if not last_evaluated_key:
+            break
+
+    return aggregates
+
+def main():
+    logging.info("Rebuilding user statistics from scratch...")
+    aggregates = scan_word_statistics()
+    logging.info(f"Found {len(aggregates)} user/lang combinations")
+
+    # Overwrite every statistics item with absolute values
+    with statistics_table.batch_writer() as batch:
+        for (user_id, lang), aggregate in aggregates.items():
+            item = {"user_id": user_id, "lang": lang, "updated_at": int(time.time())}
+            item.update({f"count_{s.value}": count for s, count in aggregate["counts"].items()})
+            if aggregate["next_due_at"] is not None:
+                item["next_due_at"] = aggregate["next_due_at"]
+            batch.put_item(Item=item)
+
+    logging.info("Statistics rebuilt")
+
+if __name__ == "__main__":
+    main()
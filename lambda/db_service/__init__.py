@@ -1,3 +1,4 @@
-from .dynamo import save_word, purge_words, get_words, get_word, delete_word, undelete_word, get_testable_words, store_challenge, load_challenge_result, delete_challenge, increment_challenge_tries, reset_word
+from .dynamo import WORDS_PAGE_SIZE, save_word, purge_words, get_words, iter_word_translations, get_word, delete_word, undelete_word, get_testable_words, store_challenge, load_challenge_result, delete_challenge, increment_challenge_tries, reset_word, get_statistics, reconcile_statistics, set_next_due_at, get_next_due_at, get_pooled_challenges, claim_pooled_challenge, get_users_with_due_words, get_conjugation, store_conjugation, get_dictionary_entry, put_dictionary_entry, warm_up_tables, reset_word_status, iter_word_key_pages, get_word_items, adjust_statistics
+from .unit_of_work import unit_of_work
 
-__all__ = ['save_word', 'purge_words', 'get_word', 'get_words', 'delete_word', 'undelete_word', 'get_testable_words', 'store_challenge', 'load_challenge_result', 'delete_challenge', 'increment_challenge_tries', 'reset_word']
+__all__ = ['WORDS_PAGE_SIZE', 'save_word', 'purge_words', 'get_word', 'get_words', 'iter_word_translations', 'delete_word', 'undelete_word', 'get_testable_words', 'store_challenge', 'load_challenge_result', 'delete_challenge', 'increment_challenge_tries', 'reset_word', 'get_statistics', 'reconcile_statistics', 'set_next_due_at', 'get_next_due_at', 'get_pooled_challenges', 'claim_pooled_challenge', 'get_users_with_due_words', 'get_conjugation', 'store_conjugation', 'get_dictionary_entry', 'put_dictionary_entry', 'warm_up_tables', 'reset_word_status', 'iter_word_key_pages', 'get_word_items', 'adjust_statistics', 'unit_of_work']
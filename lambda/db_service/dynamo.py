@@ -1,26 +1,114 @@
+import base64
+import contextvars
 import json
+import random
 import uuid
 
-import boto3
 from botocore.exceptions import ClientError
 from models import *
 import os
 from fastapi import HTTPException
-from boto3.dynamodb.conditions import Key, Attr
 import time
-from utils import logging
+from utils import logging, aws
+from utils.aws import Key, Attr
+from . import unit_of_work
 from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+# Tables are created on first use (cold start), see utils.aws
 vocabulary_table_name = os.getenv("VOCABULARY_TABLE", "oghmai_vocabulary_words")
-vocabulary_table = dynamodb.Table(vocabulary_table_name)
+vocabulary_table = aws.LazyTable(vocabulary_table_name)
 recycle_bin_table_name = os.getenv("TRASH_BIN_TABLE", "oghmai_vocabulary_recycle_bin")
-recycle_bin_table = dynamodb.Table(recycle_bin_table_name)
+recycle_bin_table = aws.LazyTable(recycle_bin_table_name)
 challenge_table_name = os.getenv("CHALLENGE_TABLE", "oghmai_challenges")
-challenge_table = dynamodb.Table(challenge_table_name)
+challenge_table = aws.LazyTable(challenge_table_name)
+due_index_name = os.getenv("DUE_INDEX", "due_at_index")
+statistics_table_name = os.getenv("STATISTICS_TABLE", "oghmai_user_statistics")
+statistics_table = aws.LazyTable(statistics_table_name)
+conjugation_table_name = os.getenv("CONJUGATION_TABLE", "oghmai_verb_conjugations")
+conjugation_table = aws.LazyTable(conjugation_table_name)
+dictionary_table_name = os.getenv("DICTIONARY_TABLE", "oghmai_dictionary")
+dictionary_table = aws.LazyTable(dictionary_table_name)
+
+WORD_LIST_PROJECTION = "#word, #lang, #status, #test_results"
+WORD_LIST_ATTRIBUTE_NAMES = {
+    "#word": "word",
+    "#lang": "lang",
+    "#status": "status",
+    "#test_results": "test_results",
+}
+WORDS_PAGE_SIZE = int(os.getenv("WORDS_PAGE_SIZE", "200"))
+# Counter updates only apply to a complete statistics item (written by reconcile_statistics / rebuild_statistics)
+STATISTICS_EXIST = "attribute_exists(updated_at)"
+# Purge: keys read per page, BatchWriteItem calls in flight, attempts for unprocessed items
+PURGE_PAGE_SIZE = int(os.getenv("PURGE_PAGE_SIZE", "1000"))
+PURGE_CONCURRENCY = int(os.getenv("PURGE_CONCURRENCY", "8"))
+PURGE_MAX_ATTEMPTS = int(os.getenv("PURGE_MAX_ATTEMPTS", "8"))
+BATCH_WRITE_SIZE = 25  # DynamoDB limit per BatchWriteItem
+
+def warm_up_tables() -> list[str]:
+    """
+    Load all tables in parallel (DescribeTable), so the container has resolved credentials
+    and the endpoint and holds open pooled connections before the first request.
+
+    Returns:
+        Names of the tables that could not be loaded
+    """
+    tables = [vocabulary_table, recycle_bin_table, challenge_table, statistics_table, conjugation_table, dictionary_table]
+
+    def load(table) -> str | None:
+        try:
+            table.load()
+            return None
+        except ClientError as e:
+            logging.warning(f"Failed to warm up table {table.name}: {e.response['Error']['Message']}")
+            return table.name
+
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        return [name for name in executor.map(load, tables) if name is not None]
+
+def encode_cursor(key: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key, default=int).encode("utf-8")).decode("ascii")
 
-def get_words(user_id: str, lang: str, status: str = None, failed_last_test: bool = False, contains: str = None):
-    logging.info(f"Filtering words for user {user_id} @ {lang} with status={status}, failed_last_test={failed_last_test}, contains={contains}")
+def decode_cursor(cursor: str, user_id: str) -> dict:
+    """
+    ExclusiveStartKey from a cursor of encode_cursor, checked to be a word key of this user.
+
+    Raises:
+        HTTPException: 400 for anything else (corrupt, forged or another user's cursor)
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        if not isinstance(key, dict) or set(key) != {"user_id", "word"} or not isinstance(key["word"], str):
+            raise ValueError("not a word key")
+        if key["user_id"] != user_id:
+            raise ValueError("key of another user")
+        return key
+    except (ValueError, UnicodeError) as e:
+        logging.warning(f"Invalid cursor {cursor}: {str(e)}")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def query_pages(table, **query_kwargs):
+    """
+    Iterate over all pages of a query, following LastEvaluatedKey.
+
+    Yields the raw query responses one page at a time, so callers can stop early
+    without reading the rest of the partition.
+    """
+    while True:
+        response = table.query(**query_kwargs)
+        yield response
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return
+        query_kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+def get_words(user_id: str, lang: str, status: str = None, failed_last_test: bool = False, contains: str = None,
+              limit: int = WORDS_PAGE_SIZE, cursor: str = None):
+    """
+    One page of the user's words (at most limit), with a cursor for the next page if there may be more.
+    """
+    logging.info(f"Filtering words for user {user_id} @ {lang} with status={status}, failed_last_test={failed_last_test}, contains={contains}, limit={limit}")
 
     try:
         # Start with a base filter expression for the language
@@ -44,55 +132,158 @@ def get_words(user_id: str, lang: str, status: str = None, failed_last_test: boo
                 logging.warning(f"Invalid status value in filter: {str(e)}")
                 raise HTTPException(status_code=400, detail=f"Invalid status value: {str(e)}")
 
-        # Query the table with the filter expression
-        response = vocabulary_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id),
-            FilterExpression=filter_expression
-        )
-        items = response.get("Items", [])
-
-        # Apply the 'contains' filter in memory
+        # Words are stored lowercase, so 'contains' can be evaluated by DynamoDB
         if contains:
-            items = [item for item in items if contains.lower() in item["word"].lower()]
-
-        # Convert items to WordResult objects
-        word_results = [convert_to_result(item) for item in items]
-
-        # Apply failed_last_test filter in memory (can't be done efficiently in DynamoDB)
-        if failed_last_test:
-            word_results = [w for w in word_results if w.testResults and w.testResults[-1] == False]
-
-        logging.info(f"Retrieved {len(word_results)} filtered words for user {user_id} @ {lang}")
-
-        return [convert_result_to_item(word) for word in word_results]
+            filter_expression = filter_expression & Attr("word").contains(contains.lower())
+
+        query_kwargs = {
+            "KeyConditionExpression": Key("user_id").eq(user_id),
+            "FilterExpression": filter_expression,
+            "ProjectionExpression": WORD_LIST_PROJECTION,
+            "ExpressionAttributeNames": dict(WORD_LIST_ATTRIBUTE_NAMES),
+            # One more than needed: an item past the limit means there is a next page (a LastEvaluatedKey
+            # alone does not, DynamoDB sets it whenever Limit items were read)
+            "Limit": min(limit, WORDS_PAGE_SIZE) + 1,
+        }
+        if cursor:
+            query_kwargs["ExclusiveStartKey"] = decode_cursor(cursor, user_id)
+
+        words = []
+        more = False
+        pages = 0
+        for response in query_pages(vocabulary_table, **query_kwargs):
+            pages += 1
+            for item in response.get("Items", []):
+                # Apply failed_last_test filter in memory (can't be done efficiently in DynamoDB)
+                test_results = item.get("test_results") or []
+                if failed_last_test and not (test_results and test_results[-1] == False):
+                    continue
+                if len(words) == limit:
+                    more = True
+                    break
+                words.append(WordItem(word=item["word"], status=item["status"], testResults=test_results))
+
+            if more or (len(words) == limit and response.get("LastEvaluatedKey")):
+                more = True
+                break
+
+        # Resume right after the last returned word, even if the page had more
+        next_cursor = encode_cursor({"user_id": user_id, "word": words[-1].word}) if more else None
+
+        logging.info(f"Retrieved {len(words)} filtered words for user {user_id} @ {lang} in {pages} pages")
+
+        return WordList(words=words, cursor=next_cursor)
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
         logging.error(f"Error filtering words for user {user_id} @ {lang}: {str(e)}")
         raise HTTPException(status_code=500, detail="Error filtering words")
 
-def get_word(user_id: str, lang: str, word: str):
-    logging.info(f"Getting word details {user_id} @ {lang} - {word}")
+def iter_word_key_pages(user_id: str, lang: str, recycle_bin: bool = False, status: str = None,
+                        cursor: str = None, page_size: int = WORDS_PAGE_SIZE):
+    """
+    Walk the user's words (or recycle bin) page by page, reading only word and status.
+
+    Yields:
+        (items, cursor) per page - cursor resumes after this page, None after the last one
+    """
+    table = recycle_bin_table if recycle_bin else vocabulary_table
+    filter_expression = Attr("lang").eq(lang)
+    if status:
+        filter_expression = filter_expression & Attr("status").eq(status)
+    query_kwargs = {
+        "KeyConditionExpression": Key("user_id").eq(user_id),
+        "FilterExpression": filter_expression,
+        "ProjectionExpression": "#word, #status",
+        "ExpressionAttributeNames": {"#word": "word", "#status": "status"},
+        "Limit": page_size
+    }
+    if cursor:
+        query_kwargs["ExclusiveStartKey"] = decode_cursor(cursor, user_id)
+    try:
+        for response in query_pages(table, **query_kwargs):
+            last_key = response.get("LastEvaluatedKey")
+            yield response.get("Items", []), encode_cursor(last_key) if last_key else None
+    except ClientError as e:
+        logging.error(f"Error reading word keys for user {user_id} @ {lang}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error retrieving words")
+
+def get_word_items(user_id: str, lang: str, words: list[str], recycle_bin: bool = False) -> dict:
+    """
+    Full items of the given words (BatchGetItem, 100 keys per call), as {word: item}.
+    Words that do not exist in this language are missing from the result.
+    """
+    table = recycle_bin_table if recycle_bin else vocabulary_table
+    keys = [{"user_id": user_id, "word": w} for w in dict.fromkeys(w.lower() for w in words)]
+    items = {}
+    try:
+        for start in range(0, len(keys), 100):
+            request = {table.name: {"Keys": keys[start:start + 100]}}
+            attempt = 0
+            while request:
+                response = aws.resource("dynamodb").batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(table.name, []):
+                    if item.get("lang") == lang:
+                        items[item["word"]] = item
+                request = response.get("UnprocessedKeys") or None
+                if request:
+                    attempt += 1
+                    time.sleep(min(0.05 * 2 ** attempt, 1))
+    except ClientError as e:
+        logging.error(f"Error batch reading words for user {user_id} @ {lang}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error retrieving words")
+    return items
+
+def iter_word_translations(user_id: str, lang: str):
+    """
+    Yield (word, translation) pairs for every meaning of every word of the user.
+
+    DynamoDB cannot project a single field out of every list element, so the whole
+    'meanings' list is projected, but nothing else is read.
+    """
+    logging.info(f"Streaming word translations for user {user_id} @ {lang}")
 
     try:
-        response = vocabulary_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id) & Key("word").eq(word.lower()),
-            FilterExpression=Attr("lang").eq(lang)
+        pages = query_pages(
+            vocabulary_table,
+            KeyConditionExpression=Key("user_id").eq(user_id),
+            FilterExpression=Attr("lang").eq(lang),
+            ProjectionExpression="#word, #lang, #meanings",
+            ExpressionAttributeNames={"#word": "word", "#lang": "lang", "#meanings": "meanings"},
         )
+        for response in pages:
+            for item in response.get("Items", []):
+                for meaning in item.get("meanings") or []:
+                    if meaning.get("translation"):
+                        yield item["word"], meaning["translation"]
+    except ClientError as e:
+        logging.error(f"Error streaming word translations for user {user_id} @ {lang}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error retrieving words")
+
+def get_word(user_id: str, lang: str, word: str):
+    logging.info(f"Getting word details {user_id} @ {lang} - {word}")
 
-        items = response.get("Items", [])
-        if not items:
+    try:
+        item = _load_word_item(vocabulary_table, user_id, lang, word)
+        if item is None:
             logging.info(f"Word {word} not found")
             return None
 
-        item = items[0]
-
         return convert_to_result(item)
     except Exception as e:
         logging.error(f"Error retrieving word: {str(e)}")
         raise HTTPException(status_code=500, detail="Error retrieving word")
 
 
+def _load_word_item(table, user_id: str, lang: str, word: str):
+    # Point read of a word (vocabulary or recycle bin), at most once per request - see unit_of_work
+    def load():
+        item = table.get_item(Key={"user_id": user_id, "word": word.lower()}).get("Item")
+        # lang is not part of the key - the word saved for another language does not count
+        return item if item is not None and item.get("lang") == lang else None
+
+    return unit_of_work.read_through(table.name, (user_id, word.lower(), lang), load)
+
 def convert_to_result(item):
     # Not ideal, but I have divergent naming conventions in the DB
     # Will be fixed during migration and then removed!!!
@@ -113,175 +304,272 @@ def convert_result_to_item(item: WordResult):
     )
     return word_item
 
-def delete_word(user_id: str, lang: str, word: str):
+def delete_word(user_id: str, lang: str, word: str, item: dict = None, update_statistics: bool = True):
+    """
+    Move the word to the recycle bin (1 hour TTL).
+
+    The move and the counter update are one transaction. Round trips: 1 GetItem (none if the
+    request already read the word) + 1 TransactWriteItems. Before: query, put, delete, counter update.
+    Bulk callers pass the item they already read and update the counters once for all words.
+    """
     logging.info(f"Deleting word {user_id} @ {lang} - {word}")
 
     try:
         # Fetch the item before deleting
-        response = vocabulary_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id) & Key("word").eq(word.lower()),
-            FilterExpression=Attr("lang").eq(lang)
-        )
-        items = response.get("Items", [])
-        if not items:
+        if item is None:
+            item = _load_word_item(vocabulary_table, user_id, lang, word)
+        if item is None:
             logging.warning(f"Word {word} not found for deletion")
             raise HTTPException(status_code=404, detail="Word not found")
 
         # Save the item to the recycle bin with TTL set to 1 hour
         ttl = int(time.time()) + 3600  # 1 hour from now
-        item = items[0]
         item["ttl"] = ttl
 
-        recycle_bin_table.put_item(Item=item)  # Overwrites if the same word exists
-
-        vocabulary_table.delete_item(
-            Key={
-                "user_id": user_id,
-                "word": word.lower()
-            },
-            ConditionExpression=Attr("lang").eq(lang)
-        )
+        transaction = [
+            {"Put": {"TableName": recycle_bin_table.name, "Item": item}},  # Overwrites if the same word exists
+            {"Delete": {
+                "TableName": vocabulary_table.name,
+                "Key": {"user_id": user_id, "word": word.lower()},
+                # The copy in the bin (and the counter) must match what is deleted
+                "ConditionExpression": "#lang = :lang AND #status = :status",
+                "ExpressionAttributeNames": {"#lang": "lang", "#status": "status"},
+                "ExpressionAttributeValues": {":lang": lang, ":status": item["status"]},
+                "ReturnValuesOnConditionCheckFailure": "ALL_OLD"
+            }},
+        ]
+        statistics = _statistics_update(user_id, lang, {item["status"]: -1}) if update_statistics else None
+        _transact_write(transaction, statistics)
+        unit_of_work.remember(vocabulary_table.name, (user_id, word.lower(), lang), None)
+        unit_of_work.remember(recycle_bin_table.name, (user_id, word.lower(), lang), item)
 
         return {"status": "ok", "message": f"Word '{word}' deleted for user '{user_id}'"}
     except ClientError as e:
-        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-            logging.warning(f"Conditional check failed when deleting word {e.response['Error']['Code']}")
+        reasons = _cancellation_reasons(e)
+        if reasons and reasons[1].get("Code") == "ConditionalCheckFailed":
+            unit_of_work.forget(vocabulary_table.name, (user_id, word.lower(), lang))
+            if reasons[1].get("Item"):
+                logging.warning(f"Word {word} changed while being deleted")
+                raise HTTPException(status_code=409, detail="Word was modified, try again.")
+            logging.warning(f"Word {word} deleted concurrently")
             raise HTTPException(status_code=404, detail="Word not found.")
         else:
             logging.error(f"Error deleting word: {str(e)}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
-def undelete_word(user_id: str, lang: str, word: str):
+def undelete_word(user_id: str, lang: str, word: str, item: dict = None, update_statistics: bool = True):
+    """
+    Move the word back from the recycle bin.
+
+    The move and the counter update are one transaction (the next_due_at lower bound is a separate
+    conditional update, it cannot fail a transaction). Round trips: 1 GetItem + 1 TransactWriteItems
+    (+1 for next_due_at). Before: 2 queries, put, delete and 1-2 counter updates, not atomic.
+    Bulk callers pass the recycle bin item they already read and update the counters once for all words.
+    """
     logging.info(f"Undeleting word {user_id} @ {lang} - {word}")
 
     try:
         # Fetch the item from the recycle bin
-        response = recycle_bin_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id) & Key("word").eq(word.lower()),
-            FilterExpression=Attr("lang").eq(lang)
-        )
-        items = response.get("Items", [])
-        if not items:
+        if item is None:
+            item = _load_word_item(recycle_bin_table, user_id, lang, word)
+        if item is None:
             logging.warning(f"Word {word} not found in recycle bin")
             raise HTTPException(status_code=404, detail="Word not found in recycle bin")
 
-        main_table_response = vocabulary_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id) & Key("word").eq(word.lower()),
-            FilterExpression=Attr("lang").eq(lang)
-        )
-        if main_table_response.get("Items"):
-            logging.warning(f"Word already exists in main table")
-            raise HTTPException(status_code=409, detail="Word already exists in the main table")
-
-        # Restore the item to the main table
-        item = items[0]
-        vocabulary_table.put_item(Item=item)
-        recycle_bin_table.delete_item(
-            Key={
-                "user_id": user_id,
-                "word": word.lower()
-            }
-        )
+        # Restore the item to the main table (the bin TTL must not come along)
+        item.pop("ttl", None)
+        transaction = [
+            {"Put": {
+                "TableName": vocabulary_table.name,
+                "Item": item,
+                "ConditionExpression": "attribute_not_exists(#word)",
+                "ExpressionAttributeNames": {"#word": "word"}
+            }},
+            {"Delete": {
+                "TableName": recycle_bin_table.name,
+                "Key": {"user_id": user_id, "word": word.lower()},
+                "ConditionExpression": "#lang = :lang",
+                "ExpressionAttributeNames": {"#lang": "lang"},
+                "ExpressionAttributeValues": {":lang": lang}
+            }},
+        ]
+        statistics = _statistics_update(user_id, lang, {item["status"]: 1}) if update_statistics else None
+        _transact_write(transaction, statistics)
+        unit_of_work.remember(vocabulary_table.name, (user_id, word.lower(), lang), item)
+        unit_of_work.remember(recycle_bin_table.name, (user_id, word.lower(), lang), None)
+        if update_statistics:
+            adjust_statistics(user_id, lang, {}, item.get("due_at"))
 
         return {"status": "ok", "message": f"Word '{word}' restored for user '{user_id}'"}
     except ClientError as e:
+        reasons = _cancellation_reasons(e)
+        if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+            logging.warning(f"Word already exists in main table")
+            raise HTTPException(status_code=409, detail="Word already exists in the main table")
+        if reasons and reasons[1].get("Code") == "ConditionalCheckFailed":
+            unit_of_work.forget(recycle_bin_table.name, (user_id, word.lower(), lang))
+            logging.warning(f"Word {word} restored concurrently")
+            raise HTTPException(status_code=404, detail="Word not found in recycle bin")
         logging.error(f"Error restoring word: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
-def purge_words(user_id: str, lang: str):
-    logging.info(f"Purging all words for user {user_id} @ {lang}")
-
-    response = vocabulary_table.query(
-        KeyConditionExpression=Key("user_id").eq(user_id),
-        FilterExpression=Attr("lang").eq(lang)
-    )
-
-    items_to_delete = response.get("Items", [])
-
-    # Step 2: Batch delete items
+def _transact_write(items: list[dict], statistics: dict = None):
+    """
+    Write the items in one transaction, with the counter update (_statistics_update) last if given.
+
+    The counter update requires a complete statistics item - without one (the user predates the
+    counters) the items are written alone and the counters are rebuilt on the next read.
+    """
+    # Transactions are not available on the Table resource - its client takes the same Python
+    # values as the Table (it serializes them itself), so the items must not be serialized here
+    client = vocabulary_table.meta.client
+    if statistics is None:
+        client.transact_write_items(TransactItems=items)
+        return
     try:
-        with vocabulary_table.batch_writer() as batch:
-            for item in items_to_delete:
-                batch.delete_item(
-                    Key={
-                        "user_id": item["user_id"],
-                        "word": item["word"]
-                    }
-                )
-
-        return {"deleted": len(items_to_delete)}
-    except Exception as e:
+        client.transact_write_items(TransactItems=items + [statistics])
+    except ClientError as e:
+        reasons = _cancellation_reasons(e)
+        if not reasons or reasons[-1].get("Code") != "ConditionalCheckFailed" or \
+                any(r.get("Code") not in (None, "None") for r in reasons[:-1]):
+            raise
+        logging.info("No statistics item to update, writing without the counters")
+        client.transact_write_items(TransactItems=items)
+
+def _cancellation_reasons(e: ClientError) -> list[dict]:
+    # Per-item outcome of a cancelled transaction ("None" for items that were fine), empty for other errors
+    if e.response["Error"]["Code"] != "TransactionCanceledException":
+        return []
+    return e.response.get("CancellationReasons", [])
+
+def purge_words(user_id: str, lang: str, cursor: str = None, deadline: float = None) -> dict:
+    """
+    Delete all words of the user in the language.
+
+    Keys are read page by page (keys only) and deleted in 25-item BatchWriteItem chunks by
+    parallel workers, while the next page is being read. With a deadline (epoch seconds), stops
+    between pages once it has passed and returns a cursor to continue from.
+
+    Returns:
+        {"deleted": count, "complete": bool, "cursor": str or None}
+    """
+    logging.info(f"Purging all words for user {user_id} @ {lang}" + (" (continued)" if cursor else ""))
+
+    deleted = 0
+    next_cursor = None
+    with ThreadPoolExecutor(max_workers=PURGE_CONCURRENCY) as executor:
+        pending = []
+        for items, next_cursor in iter_word_key_pages(user_id, lang, cursor=cursor, page_size=PURGE_PAGE_SIZE):
+            words = [item["word"] for item in items]
+            chunks = [words[start:start + BATCH_WRITE_SIZE] for start in range(0, len(words), BATCH_WRITE_SIZE)]
+            # Finish the previous page while this one is being deleted, at most two pages in flight
+            deleted += _wait_for_deletes(pending)
+            pending = [executor.submit(contextvars.copy_context().run, _delete_word_keys, user_id, chunk) for chunk in chunks]
+            for word in words:
+                unit_of_work.forget(vocabulary_table.name, (user_id, word, lang))
+            if next_cursor is not None and deadline is not None and time.time() >= deadline:
+                break
+        deleted += _wait_for_deletes(pending)
+
+    complete = next_cursor is None
+    if complete:
+        # Counters are rebuilt from scratch on the next read
+        try:
+            statistics_table.delete_item(Key={"user_id": user_id, "lang": lang})
+            unit_of_work.forget(statistics_table.name, (user_id, lang))
+        except ClientError as e:
+            logging.error(f"Error deleting statistics after purge: {str(e)}")
+            raise HTTPException(status_code=500, detail="Error purging words")
+
+    logging.info(f"Purged {deleted} words for user {user_id} @ {lang}", extra={"purge_complete": complete})
+    return {"deleted": deleted, "complete": complete, "cursor": next_cursor}
+
+def _wait_for_deletes(futures: list) -> int:
+    try:
+        return sum(future.result() for future in futures)
+    except ClientError as e:
         logging.error(f"Error purging words: {str(e)}")
         raise HTTPException(status_code=500, detail="Error purging words")
 
+def _delete_word_keys(user_id: str, words: list[str]) -> int:
+    # One BatchWriteItem (max 25 keys), unprocessed items are retried with jittered backoff
+    request = {vocabulary_table.name: [{"DeleteRequest": {"Key": {"user_id": user_id, "word": word}}} for word in words]}
+    for attempt in range(PURGE_MAX_ATTEMPTS):
+        response = aws.resource("dynamodb").batch_write_item(RequestItems=request)
+        request = response.get("UnprocessedItems") or None
+        if not request:
+            return len(words)
+        time.sleep(random.uniform(0, min(0.05 * 2 ** attempt, 2)))
+
+    unprocessed = len(request[vocabulary_table.name])
+    logging.error(f"Giving up on {unprocessed} unprocessed deletes for user {user_id}")
+    raise HTTPException(status_code=503, detail="Error purging words, try again later")
+
 def reset_word(user_id: str, lang: str, word: str):
     logging.info(f"Resetting word {user_id} @ {lang} - {word}")
 
+    old_status = reset_word_status(user_id, lang, word)
+    # A NEW word stays NEW (the keys would collapse to {"NEW": 1}), only its due time moves
+    deltas = {old_status: -1, StatusEnum.NEW: 1} if old_status != StatusEnum.NEW else {}
+    adjust_statistics(user_id, lang, deltas, StatusEnum.NEW.due_at(None))
+
+    return {"status": "ok", "message": f"Word '{word}' reset for user '{user_id}'"}
+
+def reset_word_status(user_id: str, lang: str, word: str) -> str:
+    """
+    Set the word back to NEW without test history (one conditional update, statistics untouched).
+
+    Returns:
+        The status the word had before
+    """
+    due_at = StatusEnum.NEW.due_at(None)
     try:
-        word = get_word(user_id, lang, word)
-        if not word:
+        response = vocabulary_table.update_item(
+            Key={"user_id": user_id, "word": word.lower()},
+            UpdateExpression="SET #status = :status, #last_test = :last_test, #test_results = :test_results, #due_at = :due_at",
+            ConditionExpression=Attr("lang").eq(lang),
+            ExpressionAttributeNames={
+                "#status": "status",
+                "#last_test": "last_test",
+                "#test_results": "test_results",
+                "#due_at": "due_at"
+            },
+            ExpressionAttributeValues={
+                ":status": StatusEnum.NEW,
+                ":last_test": None,
+                ":test_results": [],
+                ":due_at": due_at
+            },
+            ReturnValues="ALL_OLD"
+        )
+    except ClientError as e:
+        unit_of_work.forget(vocabulary_table.name, (user_id, word.lower(), lang))
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
             logging.warning(f"Word {word} not found for reset")
             raise HTTPException(status_code=404, detail="Word not found")
-        # Reset the word
-        word.status = StatusEnum.NEW
-        word.lastTest = None
-        word.testResults = []
-        save_word(user_id, word, allow_overwrite=True)
-
-        return {"status": "ok", "message": f"Word '{word.word}' reset for user '{user_id}'"}
-    except ClientError as e:
         logging.error(f"Error resetting word: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
-def save_word(user_id: str, word_result: WordResult, allow_overwrite: bool = False):
+    item = response["Attributes"]
+    old_status = item["status"]
+    item.update({"status": StatusEnum.NEW, "last_test": None, "test_results": [], "due_at": due_at})
+    unit_of_work.remember(vocabulary_table.name, (user_id, word.lower(), lang), item)
+    return old_status
+
+def save_word(user_id: str, word_result: WordResult, allow_overwrite: bool = False, dictionary_version: int = None):
+    """
+    Create the word, or (allow_overwrite) update status and test results of an existing one.
+
+    No existence query: a create is a conditional put, an overwrite a conditional update returning
+    the old item. Round trips: 1 write + 1-2 statistics updates (was 1 query + 1 write + 1-2 updates).
+    An overwrite of a word that turns out not to exist falls back to the create (one extra write).
+    """
     logging.info(f"Saving word {user_id} @ {word_result.language} - {word_result.word}")
 
     try:
-        # If word exists, update it
-        existing_response = vocabulary_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id) & Key("word").eq(word_result.word.lower()),
-            FilterExpression=Attr("lang").eq(word_result.language)
-        )
-        existing_items = existing_response.get("Items", [])
-        if existing_items:
-            if not allow_overwrite:
-                logging.warning(f"Word already exists and overwrite is not allowed")
-                raise HTTPException(status_code=409, detail="Word already exists for this user/language.")
-
-            vocabulary_table.update_item(
-                Key={
-                    "user_id": user_id,
-                    "word": word_result.word.lower()
-                },
-                UpdateExpression="SET #status = :status, #last_test = :last_test, "
-                                 "#test_results = :test_results",
-                ConditionExpression=Attr("lang").eq(word_result.language),  # Ensure lang matches
-                ExpressionAttributeNames={
-                    "#status": "status",
-                    "#last_test": "last_test",
-                    "#test_results": "test_results"
-                },
-                ExpressionAttributeValues={
-                    ":status": word_result.status,
-                    ":last_test": int(word_result.lastTest.timestamp()) if word_result.lastTest else None,
-                    ":test_results": word_result.testResults or []
-                }
-            )
-        else:
-            vocabulary_table.put_item(
-                Item={
-                    "user_id": user_id,
-                    "word": word_result.word.lower(),
-                    "lang": word_result.language,
-                    "meanings": [meaning.dict() for meaning in word_result.meanings],
-                    "created_at": int(datetime.now().timestamp()),
-                    "status": StatusEnum.NEW,
-                    "last_test": int(datetime.now().timestamp()),
-                    "test_results": [],
-                    "schema": "v2"  # Add schema version
-                },
-                ConditionExpression="attribute_not_exists(user_id) AND attribute_not_exists(word) AND attribute_not_exists(lang)"
-            )
+        known = unit_of_work.known(vocabulary_table.name, (user_id, word_result.word.lower(), word_result.language))
+        if not (allow_overwrite and known is not unit_of_work.MISSING and _update_word(user_id, word_result)):
+            _create_word(user_id, word_result, dictionary_version)
 
         return {"status": "ok", "message": f"Word '{word_result.word}' saved for user '{user_id}'"}
     except ClientError as e:
@@ -292,79 +580,359 @@ def save_word(user_id: str, word_result: WordResult, allow_overwrite: bool = Fal
             logging.error(f"Error saving word: {str(e)}")
             raise HTTPException(status_code=500, detail="Error saving word")
 
-def get_testable_words(user_id: str, lang: str, status_days: dict):
-    logging.info(f"Querying words for user {user_id} @ {lang} with status_days: {status_days}")
+def _update_word(user_id: str, word_result: WordResult) -> bool:
+    # False if there is no such word (in this language) to update
+    last_test = int(word_result.lastTest.timestamp()) if word_result.lastTest else None
+    due_at = StatusEnum(word_result.status).due_at(last_test)
+    values = {
+        ":status": word_result.status,
+        ":last_test": last_test,
+        ":test_results": word_result.testResults or []
+    }
+    # due_at is a GSI key, so it is removed (not nulled) for words that are never tested
+    if due_at is None:
+        due_expression = " REMOVE #due_at"
+    else:
+        due_expression = ", #due_at = :due_at"
+        values[":due_at"] = due_at
+    try:
+        response = vocabulary_table.update_item(
+            Key={
+                "user_id": user_id,
+                "word": word_result.word.lower()
+            },
+            UpdateExpression="SET #status = :status, #last_test = :last_test, "
+                             "#test_results = :test_results" + due_expression,
+            ConditionExpression=Attr("lang").eq(word_result.language),  # Ensure the word exists with this lang
+            ExpressionAttributeNames={
+                "#status": "status",
+                "#last_test": "last_test",
+                "#test_results": "test_results",
+                "#due_at": "due_at"
+            },
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_OLD"
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+        raise
+
+    item = response["Attributes"]
+    old_status = item["status"]
+    item.update({"status": word_result.status, "last_test": last_test, "test_results": values[":test_results"]})
+    if due_at is None:
+        item.pop("due_at", None)
+    else:
+        item["due_at"] = due_at
+    unit_of_work.remember(vocabulary_table.name, (user_id, item["word"], word_result.language), item)
+
+    if old_status != word_result.status:
+        adjust_statistics(user_id, word_result.language, {old_status: -1, word_result.status: 1}, due_at)
+    else:
+        adjust_statistics(user_id, word_result.language, {}, due_at)
+    return True
+
+def _create_word(user_id: str, word_result: WordResult, dictionary_version: int = None):
+    now = int(datetime.now().timestamp())
+    item = {
+        "user_id": user_id,
+        "word": word_result.word.lower(),
+        "lang": word_result.language,
+        "meanings": [meaning.dict() for meaning in word_result.meanings],
+        "created_at": now,
+        "status": StatusEnum.NEW,
+        "last_test": now,
+        "due_at": StatusEnum.NEW.due_at(now),
+        "test_results": [],
+        "schema": "v2"  # Add schema version
+    }
+    if dictionary_version is not None:
+        # Meanings were copied from this version of the shared dictionary entry
+        item["dictionary_version"] = dictionary_version
+    vocabulary_table.put_item(
+        Item=item,
+        ConditionExpression="attribute_not_exists(user_id) AND attribute_not_exists(word) AND attribute_not_exists(lang)"
+    )
+    unit_of_work.remember(vocabulary_table.name, (user_id, item["word"], word_result.language), item)
+    adjust_statistics(user_id, word_result.language, {StatusEnum.NEW: 1}, StatusEnum.NEW.due_at(now))
+
+def get_testable_words(user_id: str, lang: str):
+    logging.info(f"Querying due words for user {user_id} @ {lang}")
 
     try:
-        # Get the current timestamp
+        # Words carry a precomputed due_at, so "due now" is a key range on the sparse due index
         current_time = int(time.time())
+        pages = query_pages(
+            vocabulary_table,
+            IndexName=due_index_name,
+            KeyConditionExpression=Key("user_id").eq(user_id) & Key("due_at").lte(current_time),
+            FilterExpression=Attr("lang").eq(lang)
+        )
+        items = [item for response in pages for item in response.get("Items", [])]
 
-        # Build the filter expression dynamically
-        filter_expressions = []
-        for status, days in status_days.items():
-            last_test_threshold = current_time - (days * 86400)  # Convert days to seconds
-            filter_expressions.append(
-                (Attr("status").eq(status) & (Attr("last_test").eq(None) | Attr("last_test").lte(last_test_threshold)))
-            )
+        logging.info(f"Retrieved {len(items)} due words for user {user_id} @ {lang}")
 
-        # Combine filter expressions with OR
-        combined_filter_expression = filter_expressions[0]
-        for expr in filter_expressions[1:]:
-            combined_filter_expression |= expr
+        return [convert_to_result(item) for item in items]
+    except Exception as e:
+        logging.error(f"Error querying due words: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error querying due words")
 
-        # Query the table
-        response = vocabulary_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id),
-            FilterExpression=Attr("lang").eq(lang) & combined_filter_expression
-        )
 
-        items = response.get("Items", [])
+def _count_attribute(status) -> str:
+    return f"count_{StatusEnum(status).value}"
 
-        logging.info(f"Retrieved {len(items)} words for user {user_id} @ {lang} with status_days: {status_days}")
+def adjust_statistics(user_id: str, lang: str, deltas: dict, due_at: int = None):
+    """
+    Atomically apply per-status count deltas to the user's statistics item and lower
+    next_due_at if the given due time is earlier.
 
-        return [convert_to_result(item) for item in items]
-    except Exception as e:
-        logging.error(f"Error querying words by status and last_test: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error querying words by status and last_test")
+    Failures are logged and swallowed - the word write already happened and the
+    counters can always be rebuilt with reconcile_statistics. Nothing is written without a
+    complete statistics item (it has updated_at) - get_statistics rebuilds a missing one.
+    """
+    deltas = {status: delta for status, delta in deltas.items() if delta}
+    unit_of_work.forget(statistics_table.name, (user_id, lang))
+
+    try:
+        if deltas:
+            expression, names, values = _statistics_add_expression(deltas)
+            statistics_table.update_item(
+                Key={"user_id": user_id, "lang": lang},
+                UpdateExpression=expression,
+                ConditionExpression=STATISTICS_EXIST,
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values
+            )
+
+        if due_at is not None:
+            # next_due_at is kept as a lower bound, it is only ever moved earlier here
+            statistics_table.update_item(
+                Key={"user_id": user_id, "lang": lang},
+                UpdateExpression="SET next_due_at = :due_at",
+                ConditionExpression=f"{STATISTICS_EXIST} AND (attribute_not_exists(next_due_at) OR next_due_at > :due_at)",
+                ExpressionAttributeValues={":due_at": int(due_at)}
+            )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            logging.error(f"Error updating statistics for user {user_id} @ {lang}: {str(e)}")
+
+def _statistics_add_expression(deltas: dict) -> tuple[str, dict, dict]:
+    names = {}
+    values = {}
+    clauses = []
+    for i, (status, delta) in enumerate(deltas.items()):
+        names[f"#c{i}"] = _count_attribute(status)
+        values[f":d{i}"] = delta
+        clauses.append(f"#c{i} :d{i}")
+    return "ADD " + ", ".join(clauses), names, values
+
+def _statistics_update(user_id: str, lang: str, deltas: dict) -> dict:
+    # adjust_statistics counter deltas as a TransactWriteItems item
+    unit_of_work.forget(statistics_table.name, (user_id, lang))
+    expression, names, values = _statistics_add_expression(deltas)
+    return {"Update": {
+        "TableName": statistics_table.name,
+        "Key": {"user_id": user_id, "lang": lang},
+        "UpdateExpression": expression,
+        "ConditionExpression": STATISTICS_EXIST,
+        "ExpressionAttributeNames": names,
+        "ExpressionAttributeValues": values
+    }}
+
+def set_next_due_at(user_id: str, lang: str, next_due_at: int | None):
+    unit_of_work.forget(statistics_table.name, (user_id, lang))
+    try:
+        if next_due_at is None:
+            statistics_table.update_item(
+                Key={"user_id": user_id, "lang": lang},
+                UpdateExpression="REMOVE next_due_at",
+                ConditionExpression=STATISTICS_EXIST
+            )
+        else:
+            statistics_table.update_item(
+                Key={"user_id": user_id, "lang": lang},
+                UpdateExpression="SET next_due_at = :due_at",
+                ConditionExpression=STATISTICS_EXIST,
+                ExpressionAttributeValues={":due_at": int(next_due_at)}
+            )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            logging.error(f"Error updating next due time for user {user_id} @ {lang}: {str(e)}")
+
+def get_next_due_at(user_id: str, lang: str):
+    """
+    Earliest due_at of a word that is not due yet, None if there is none.
+    """
+    pages = query_pages(
+        vocabulary_table,
+        IndexName=due_index_name,
+        KeyConditionExpression=Key("user_id").eq(user_id) & Key("due_at").gt(int(time.time())),
+        FilterExpression=Attr("lang").eq(lang),
+        ProjectionExpression="due_at, lang"
+    )
+    for response in pages:
+        for item in response.get("Items", []):
+            return int(item["due_at"])
+    return None
+
+def get_statistics(user_id: str, lang: str):
+    """
+    Return the statistics item as {"counts": {status: count}, "next_due_at": int | None}.
+
+    A missing item (new user or one that predates the counters) is rebuilt on the fly, and so is
+    a partial one (no updated_at) left by counter updates before they required the item.
+    """
+    try:
+        item = unit_of_work.read_through(
+            statistics_table.name, (user_id, lang),
+            lambda: statistics_table.get_item(Key={"user_id": user_id, "lang": lang}).get("Item")
+        )
+        if item is None or "updated_at" not in item:
+            logging.info(f"No complete statistics item for user {user_id} @ {lang}, reconciling")
+            return reconcile_statistics(user_id, lang)
+
+        return {
+            "counts": {s: int(item.get(_count_attribute(s), 0)) for s in StatusEnum if s != StatusEnum.UNSAVED},
+            "next_due_at": int(item["next_due_at"]) if item.get("next_due_at") is not None else None
+        }
+    except ClientError as e:
+        logging.error(f"Error loading statistics for user {user_id} @ {lang}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error loading statistics")
+
+def reconcile_statistics(user_id: str, lang: str):
+    """
+    Rebuild the statistics item from the user's words (full partition read).
+    """
+    logging.info(f"Reconciling statistics for user {user_id} @ {lang}")
+
+    try:
+        counts = {s: 0 for s in StatusEnum if s != StatusEnum.UNSAVED}
+        next_due_at = None
+        pages = query_pages(
+            vocabulary_table,
+            KeyConditionExpression=Key("user_id").eq(user_id),
+            FilterExpression=Attr("lang").eq(lang),
+            ProjectionExpression="#status, due_at, lang",
+            ExpressionAttributeNames={"#status": "status"}
+        )
+        for response in pages:
+            for item in response.get("Items", []):
+                counts[StatusEnum(item["status"])] += 1
+                if item.get("due_at") is not None:
+                    due_at = int(item["due_at"])
+                    next_due_at = due_at if next_due_at is None else min(next_due_at, due_at)
+
+        item = {"user_id": user_id, "lang": lang, "updated_at": int(time.time())}
+        item.update({_count_attribute(s): count for s, count in counts.items()})
+        if next_due_at is not None:
+            item["next_due_at"] = next_due_at
+        statistics_table.put_item(Item=item)
+        unit_of_work.remember(statistics_table.name, (user_id, lang), item)
+
+        return {"counts": counts, "next_due_at": next_due_at}
+    except ClientError as e:
+        logging.error(f"Error reconciling statistics for user {user_id} @ {lang}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error reconciling statistics")
 
 
-def store_challenge(user_id: str, lang: str, description: str, word: str):
+def store_challenge(user_id: str, lang: str, description: str, word: str, pooled: bool = False, ttl_seconds: int = 3600):
     # generate UUID
     challenge_id = str(uuid.uuid4())
 
+    item = {
+        "user_id": user_id,
+        "challenge_id": challenge_id,
+        "description": description,
+        "word": word.lower(),
+        "lang": lang,
+        "created_at": int(datetime.now().timestamp()),
+        "tries": 0,
+        "ttl": int(time.time()) + ttl_seconds,  # 1 hour from now should be enough for a live challenge
+    }
+    if pooled:
+        # Pre-generated, not shown to the user yet - claimed by claim_pooled_challenge
+        item["pooled"] = True
+
     # save the challenge to dynamo
     try:
-        challenge_table.put_item(
-            Item={
-                "user_id": user_id,
-                "challenge_id": challenge_id,
-                "description": description,
-                "word": word.lower(),
-                "lang": lang,
-                "created_at": int(datetime.now().timestamp()),
-                "tries": 0,
-                "ttl": int(time.time()) + 3600,  # 1 hour from now should be enough
-            }
-        )
+        challenge_table.put_item(Item=item)
 
         return challenge_id
     except ClientError as e:
         logging.error(f"Error storing challenge: {str(e)}")
         raise HTTPException(status_code=500, detail="Error storing challenge")
 
+def get_pooled_challenges(user_id: str, lang: str):
+    try:
+        pages = query_pages(
+            challenge_table,
+            KeyConditionExpression=Key("user_id").eq(user_id),
+            FilterExpression=Attr("pooled").exists() & Attr("lang").eq(lang) & Attr("ttl").gt(int(time.time())),
+            ProjectionExpression="challenge_id, #word, #description, #lang",
+            ExpressionAttributeNames={"#word": "word", "#description": "description", "#lang": "lang"}
+        )
+        return [item for response in pages for item in response.get("Items", [])]
+    except ClientError as e:
+        logging.error(f"Error loading pooled challenges: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error loading pooled challenges")
+
+def claim_pooled_challenge(user_id: str, challenge_id: str) -> bool:
+    # Turn a pooled challenge into a live one, the condition makes sure only one request gets it
+    unit_of_work.forget(challenge_table.name, (user_id, challenge_id))
+    try:
+        challenge_table.update_item(
+            Key={
+                "user_id": user_id,
+                "challenge_id": challenge_id
+            },
+            UpdateExpression="REMOVE pooled SET created_at = :now, #ttl = :ttl",
+            ConditionExpression="attribute_exists(pooled)",
+            ExpressionAttributeNames={"#ttl": "ttl"},
+            ExpressionAttributeValues={
+                ":now": int(datetime.now().timestamp()),
+                ":ttl": int(time.time()) + 3600
+            }
+        )
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            logging.info(f"Pooled challenge {challenge_id} already claimed")
+            return False
+        logging.error(f"Error claiming pooled challenge: {str(e)}")
+        raise HTTPException(status_code=500, detail="Error claiming pooled challenge")
+
+def get_users_with_due_words(due_before: int):
+    """
+    Yield (user_id, lang) of every statistics item whose next due time is before the given timestamp.
+    """
+    try:
+        scan_kwargs = {
+            "FilterExpression": Attr("next_due_at").lte(due_before),
+            "ProjectionExpression": "user_id, lang"
+        }
+        while True:
+            response = statistics_table.scan(**scan_kwargs)
+            for item in response.get("Items", []):
+                yield item["user_id"], item["lang"]
+            if not response.get("LastEvaluatedKey"):
+                return
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    except ClientError as e:
+        logging.error(f"Error scanning statistics: {str(e)}")
+        raise
+
 def load_challenge_result(user_id: str, challenge_id: str):
     # load challenge from dynamo
     try:
-        response = challenge_table.query(
-            KeyConditionExpression=Key("user_id").eq(user_id) & Key("challenge_id").eq(challenge_id)
+        item = unit_of_work.read_through(
+            challenge_table.name, (user_id, challenge_id),
+            lambda: challenge_table.get_item(Key={"user_id": user_id, "challenge_id": challenge_id}).get("Item")
         )
-        items = response.get("Items", [])
-        if not items:
+        if item is None:
             logging.error(f"Challenge {challenge_id} not found for user {user_id}")
             raise HTTPException(status_code=404, detail="Error loading challenge")
 
-        item = items[0]
-
         return item
     except ClientError as e:
         logging.error(f"Error loading challenge: {str(e)}")
@@ -373,6 +941,7 @@ def load_challenge_result(user_id: str, challenge_id: str):
 
 def increment_challenge_tries(user_id: str, challenge_id: str):
     # increment tries in dynamo
+    unit_of_work.forget(challenge_table.name, (user_id, challenge_id))
     try:
         challenge_table.update_item(
             Key={
@@ -400,8 +969,85 @@ def delete_challenge(user_id: str, challenge_id: str):
                 "challenge_id": challenge_id
             }
         )
+        unit_of_work.remember(challenge_table.name, (user_id, challenge_id), None)
 
         return {"status": "ok", "message": f"Challenge '{challenge_id}' deleted for user '{user_id}'"}
     except ClientError as e:
         logging.error(f"Error deleting challenge: {str(e)}")
         raise HTTPException(status_code=500, detail="Error deleting challenge")
+
+
+def get_conjugation(lang: str, verb: str):
+    # Shared across users, keyed by (lang, infinitive)
+    try:
+        item = unit_of_work.read_through(
+            conjugation_table.name, (lang, verb.lower()),
+            lambda: conjugation_table.get_item(Key={"lang": lang, "verb": verb.lower()}).get("Item")
+        )
+        return item["explanations"] if item else None
+    except ClientError as e:
+        logging.error(f"Error loading conjugation of {verb} @ {lang}: {str(e)}")
+        return None
+
+def store_conjugation(lang: str, verb: str, explanations: dict, source: str):
+    unit_of_work.forget(conjugation_table.name, (lang, verb.lower()))
+    try:
+        conjugation_table.put_item(
+            Item={
+                "lang": lang,
+                "verb": verb.lower(),
+                "explanations": explanations,
+                "source": source,
+                "created_at": int(time.time())
+            }
+        )
+    except ClientError as e:
+        # Not fatal, the next request just generates it again
+        logging.error(f"Error storing conjugation of {verb} @ {lang}: {str(e)}")
+
+
+def get_dictionary_entry(lang: str, word: str):
+    # Shared across users, keyed by (lang, lemma)
+    try:
+        return unit_of_work.read_through(
+            dictionary_table.name, (lang, word.lower()),
+            lambda: dictionary_table.get_item(Key={"lang": lang, "word": word.lower()}).get("Item")
+        )
+    except ClientError as e:
+        logging.error(f"Error loading dictionary entry {word} @ {lang}: {str(e)}")
+        return None
+
+def put_dictionary_entry(lang: str, word: str, meanings: list, source: str, tokens: int = 0, expected_version: int = None):
+    """
+    Create (expected_version None) or replace (expected_version = current) a dictionary entry.
+
+    Returns:
+        The new version, or None if someone else wrote the entry first
+    """
+    version = (expected_version or 0) + 1
+    unit_of_work.forget(dictionary_table.name, (lang, word.lower()))
+    if expected_version is None:
+        condition = Attr("word").not_exists()
+    else:
+        condition = Attr("version").eq(expected_version)
+
+    try:
+        dictionary_table.put_item(
+            Item={
+                "lang": lang,
+                "word": word.lower(),
+                "meanings": meanings,
+                "version": version,
+                "source": source,
+                "tokens": tokens,
+                "updated_at": int(time.time())
+            },
+            ConditionExpression=condition
+        )
+        return version
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            logging.info(f"Dictionary entry {word} @ {lang} was written concurrently")
+            return None
+        logging.error(f"Error storing dictionary entry {word} @ {lang}: {str(e)}")
+        return None
@@ -0,0 +1,95 @@
+import copy
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from utils import logging
+
+# Marks a key this request already knows does not exist
+MISSING = object()
+
+
+class UnitOfWork:
+    """
+    Request-scoped identity map of DynamoDB items: each item is read at most once per request,
+    and writes keep it current, so later existence checks need no round trip.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self.reads = Counter()
+        self.hits = Counter()
+
+    def lookup(self, table: str, key: tuple):
+        """
+        Known item (a copy), MISSING if known not to exist, None if not known.
+        """
+        item = self._items.get((table, key))
+        if item is None:
+            return None
+        self.hits[table] += 1
+        return item if item is MISSING else copy.deepcopy(item)
+
+    def remember(self, table: str, key: tuple, item: dict | None):
+        self._items[(table, key)] = MISSING if item is None else copy.deepcopy(item)
+
+    def forget(self, table: str, key: tuple):
+        self._items.pop((table, key), None)
+
+
+_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar("unit_of_work", default=None)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Scope of the identity map (one API request). Logs the reads made and saved when it ends.
+    """
+    unit = UnitOfWork()
+    token = _unit_of_work.set(unit)
+    try:
+        yield unit
+    finally:
+        _unit_of_work.reset(token)
+        if unit.reads or unit.hits:
+            logging.info(f"DynamoDB reads: {sum(unit.reads.values())}, served from unit of work: {sum(unit.hits.values())}",
+                         extra={"db_reads": dict(unit.reads), "db_reads_saved": dict(unit.hits)})
+
+
+def read_through(table: str, key: tuple, loader):
+    """
+    Item for the key from the current unit of work, or from loader() (None = not found),
+    which is then remembered. Without a unit of work just calls loader().
+    """
+    unit = _unit_of_work.get()
+    if unit is None:
+        return loader()
+    item = unit.lookup(table, key)
+    if item is not None:
+        return None if item is MISSING else item
+    unit.reads[table] += 1
+    item = loader()
+    unit.remember(table, key, item)
+    return item
+
+
+def known(table: str, key: tuple):
+    """
+    Item (a copy) or MISSING if the current unit of work knows the key, otherwise None. Never reads.
+    """
+    unit = _unit_of_work.get()
+    return unit.lookup(table, key) if unit is not None else None
+
+
+def remember(table: str, key: tuple, item: dict | None):
+    # The request wrote the item (None = deleted it) - later reads see the new state
+    unit = _unit_of_work.get()
+    if unit is not None:
+        unit.remember(table, key, item)
+
+
+def forget(table: str, key: tuple):
+    # The item changed in a way not tracked here - read it again when needed
+    unit = _unit_of_work.get()
+    if unit is not None:
+        unit.forget(table, key)
@@ -0,0 +1,83 @@
+"""
+End-to-end latency of describe-word with a stubbed model of fixed per-call delay, run from lambda/:
+
+    python describe_latency.py                       # 5 descriptions, 500 ms per model call
+    python describe_latency.py -n 10 --delay-ms 1000 --json
+
+Uses the fake Bedrock client (BEDROCK_FAKE), so no AWS access is needed. "single" is the current pipeline
+(one call returns the word with all its meanings), "sequential" adds the add_other_meanings enrichment call
+after it, the way describe_word worked before.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+
+def configure(delay_ms: float):
+    # Must happen before bedrock_service is imported - the client is chosen at import time
+    os.environ["BEDROCK_FAKE"] = "true"
+    os.environ["BEDROCK_FAKE_FIRST_TOKEN_DELAY"] = str(delay_ms / 1000)
+    os.environ["BEDROCK_FAKE_CHUNK_DELAY"] = "0"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def run(samples: int) -> dict:
+    import bedrock_service
+    from bedrock_service.bedrock import enrich_meanings
+
+    pipelines = {
+        "single": lambda definition: bedrock_service.describe_word(definition, []),
+        "sequential": lambda definition: _sequential(bedrock_service.describe_word(definition, []), enrich_meanings),
+    }
+    results = {}
+    for name, describe in pipelines.items():
+        latencies, calls, meanings = [], [], []
+        for i in range(samples):
+            # A new description every time, repeated ones are answered from the candidate cache
+            definition = f"{name} {i}: una persona che ha paura di parlare con gli sconosciuti"
+            with bedrock_service.measure_usage() as usage:
+                start = time.perf_counter()
+                result = describe(definition)
+                latencies.append((time.perf_counter() - start) * 1000)
+            calls.append(usage["calls"])
+            meanings.append(len(result.meanings) if result else 0)
+        results[name] = {
+            "samples": samples,
+            "model_calls": statistics.mean(calls),
+            "meanings": statistics.mean(meanings),
+            "p50_ms": round(statistics.median(latencies), 1),
+            "max_ms": round(max(latencies), 1),
+        }
+    return results
+
+
+def _sequential(result, enrich_meanings):
+    if result is None:
+        return None
+    enriched = enrich_meanings(result.word, [m.model_dump() for m in result.meanings])
+    if enriched:
+        result.meanings = enriched
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Describe-word latency with a fixed-delay fake model")
+    parser.add_argument("-n", "--samples", type=int, default=5, help="Descriptions per pipeline")
+    parser.add_argument("--delay-ms", type=float, default=500, help="Fake model latency per call")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    configure(args.delay_ms)
+    results = run(args.samples)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'pipeline':<12} {'samples':>7} {'calls':>6} {'meanings':>8} {'p50 ms':>8} {'max ms':>8}")
+    for name, r in results.items():
+        print(f"{name:<12} {r['samples']:>7} {r['model_calls']:>6} {r['meanings']:>8} {r['p50_ms']:>8} {r['max_ms']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import os
+import re
+import time
+from collections import Counter
+
+import bedrock_service
+import db_service
+from models import *
+from utils import logging
+
+# Entries older than this are regenerated on the next miss
+DICTIONARY_MAX_AGE_DAYS = int(os.getenv("DICTIONARY_MAX_AGE_DAYS", "180"))
+
+# Per-container counters: lookups, hits and Bedrock tokens that hits avoided
+dictionary_metrics = Counter()
+
+
+def _log_metrics(message: str):
+    lookups = dictionary_metrics["lookups"]
+    hit_ratio = dictionary_metrics["hits"] / lookups if lookups else 0.0
+    logging.info(message, extra={"dictionary": dict(dictionary_metrics), "dictionary_hit_ratio": round(hit_ratio, 3)})
+
+
+def _is_fresh(entry: dict) -> bool:
+    return int(entry.get("updated_at", 0)) >= time.time() - DICTIONARY_MAX_AGE_DAYS * 86400
+
+
+def _is_trusted(entry: dict) -> bool:
+    # Entries saved from a client request are whatever one user posted - never shown to others
+    return entry.get("source") != "client"
+
+
+def lookup(lang: str, word: str) -> dict | None:
+    """
+    Fresh, model-generated dictionary entry for a lemma, None on a miss (missing, stale or client entry).
+    """
+    dictionary_metrics["lookups"] += 1
+    entry = db_service.get_dictionary_entry(lang, word)
+    if entry is None or not _is_fresh(entry) or not _is_trusted(entry):
+        dictionary_metrics["misses"] += 1
+        return None
+    dictionary_metrics["hits"] += 1
+    return entry
+
+
+def _to_result(lang: str, entry: dict) -> WordResult:
+    return WordResult(word=entry["word"], language=lang, meanings=entry["meanings"])
+
+
+def describe_word(description: str, exclusions: list[str], lang: str = "IT", user_id: str = None) -> WordResult | None:
+    """
+    Describe a word, reading the shared dictionary before (and after) asking Bedrock.
+
+    A description that is just a known word ("I learned this word") is answered from the
+    dictionary alone. Otherwise the model picks the word and the dictionary entry, if any,
+    provides the meanings so every user sees the same ones; new words are added to it.
+    With a user_id, that user's follow-up requests (with exclusions) may be answered from the
+    candidates of the first one.
+    """
+    result = _dictionary_hit(description, exclusions, lang)
+    if result is not None:
+        return result
+
+    with bedrock_service.measure_usage() as usage:
+        result = bedrock_service.describe_word(description, exclusions, user_id)
+    return _consolidate(result, usage)
+
+
+def describe_word_stream(description: str, exclusions: list[str], lang: str = "IT", user_id: str = None):
+    """
+    Streaming variant of describe_word.
+
+    Yields:
+        ("delta", text) while the model generates, then ("result", WordResult | None) once
+    """
+    result = _dictionary_hit(description, exclusions, lang)
+    if result is not None:
+        yield "result", result
+        return
+
+    # Summed locally - a measure_usage() block must not be held across a yield
+    usage = bedrock_service.new_usage()
+    for kind, payload in bedrock_service.describe_word_stream(description, exclusions, usage, user_id):
+        if kind == "delta":
+            yield kind, payload
+        else:
+            result = payload
+    yield "result", _consolidate(result, usage)
+
+
+def _dictionary_hit(description: str, exclusions: list[str], lang: str) -> WordResult | None:
+    candidate = description.strip().lower()
+    excluded = {e.strip().lower() for e in exclusions or []}
+    if not re.fullmatch(r"[^\W\d_]+(?:'[^\W\d_]+)?", candidate) or candidate in excluded:
+        return None
+
+    entry = lookup(lang, candidate)
+    if entry is None:
+        return None
+    dictionary_metrics["tokens_saved"] += int(entry.get("tokens", 0))
+    _log_metrics(f"Dictionary hit for {candidate} @ {lang}")
+    return _to_result(lang, entry)
+
+
+def _consolidate(result: WordResult | None, usage: dict) -> WordResult | None:
+    if result is None:
+        return None
+
+    entry = db_service.get_dictionary_entry(result.language, result.word)
+    if entry is not None and _is_fresh(entry) and _is_trusted(entry):
+        result.meanings = [WordDefinition(**m) for m in entry["meanings"]]
+    else:
+        # Missing, stale or only known from a client save - the model output becomes the entry
+        db_service.put_dictionary_entry(
+            result.language, result.word, [m.model_dump() for m in result.meanings], "bedrock",
+            tokens=usage["totalTokens"], expected_version=int(entry["version"]) if entry else None
+        )
+    _log_metrics(f"Described {result.word} @ {result.language} with {usage['totalTokens']} tokens")
+    return result
+
+
+def resolve_meanings(word_result: WordResult) -> int | None:
+    """
+    Replace the meanings of a word about to be saved with the shared dictionary entry.
+
+    The client's meanings are kept for this user only, they are not added to the dictionary
+    (the entry is created when the word is next described by the model).
+
+    Returns:
+        Dictionary version the meanings correspond to, None if they are the client's own
+    """
+    entry = lookup(word_result.language, word_result.word)
+    if entry is None:
+        return None
+
+    word_result.meanings = [WordDefinition(**m) for m in entry["meanings"]]
+    _log_metrics(f"Copied dictionary meanings of {word_result.word} @ {word_result.language}")
+    return int(entry["version"])
+
+
+def refresh_entry(lang: str, word: str) -> int | None:
+    """
+    Regenerate the meanings of a dictionary entry with Bedrock and bump its version.
+
+    Returns:
+        The new version, None if the entry does not exist or could not be regenerated
+    """
+    logging.info(f"Refreshing dictionary entry {word} @ {lang}")
+    entry = db_service.get_dictionary_entry(lang, word)
+    if entry is None or not _is_trusted(entry):
+        # Client meanings are not a base for shared ones, the next description replaces them
+        return None
+
+    with bedrock_service.measure_usage() as usage:
+        meanings = bedrock_service.enrich_meanings(entry["word"], entry["meanings"])
+    if meanings is None:
+        return None
+
+    return db_service.put_dictionary_entry(
+        lang, word, [m.model_dump() for m in meanings], "bedrock",
+        tokens=usage["totalTokens"], expected_version=int(entry["version"])
+    )
@@ -0,0 +1,148 @@
+"""
+Concurrent requests against the FastAPI app in one process (as under uvicorn), run from lambda/:
+
+    python load_test.py                           # 20 concurrent GET /words, DynamoDB simulated with 200 ms calls
+    python load_test.py -c 50 --io-ms 500 --compare-blocking
+    python load_test.py --min-speedup 5           # exit 1 if the requests overlap less than that (CI)
+    python load_test.py --path /words --user <sub> # real DynamoDB (needs AWS), no simulated latency
+
+Without --user the db_service call of the route is replaced by a blocking sleep of --io-ms, the way a boto3
+call blocks its thread. Speedup is the time the requests would take one after another (concurrency x the
+latency of a single request) divided by the wall time: 1 means they queued, N means N were served at once
+(at most IO_CONCURRENCY). --compare-blocking runs the same load with the blocking call made directly on the
+event loop, as the routes did before utils.concurrency.run_io.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+# Keep the per-request application logs out of the report
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import db_service
+import main
+from models import WordList
+
+SIMULATED_USER = "load-test-user"
+
+
+# Simulated calls running right now and the most seen at once
+io_calls = {"running": 0, "max": 0}
+
+
+def simulate_io(io_ms: float):
+    def get_words(*args, **kwargs):
+        io_calls["running"] += 1
+        io_calls["max"] = max(io_calls["max"], io_calls["running"])
+        try:
+            time.sleep(io_ms / 1000)
+        finally:
+            io_calls["running"] -= 1
+        return WordList(words=[])
+    db_service.get_words = get_words
+
+
+def run_on_event_loop():
+    # The behavior before run_io: the blocking call runs on the event loop itself
+    async def run_io(func, *args, **kwargs):
+        return func(*args, **kwargs)
+    main.run_io = run_io
+
+
+async def request(method: str, path: str, user_id: str) -> tuple[int, float]:
+    # Minimal ASGI HTTP request with the API Gateway authorizer claims Mangum would put in the scope
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+        "aws.event": {"requestContext": {"authorizer": {"claims": {"sub": user_id}}}},
+    }
+    status = {}
+    disconnected = asyncio.Event()
+
+    async def receive():
+        if "sent" not in status:
+            status["sent"] = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body"):
+            disconnected.set()
+
+    start = time.perf_counter()
+    await main.app(scope, receive, send)
+    return status.get("code"), (time.perf_counter() - start) * 1000
+
+
+async def load(concurrency: int, method: str, path: str, user_id: str) -> dict:
+    # A single request first (also warms up imports and the worker pool), then all of them at once
+    _, single_ms = await request(method, path, user_id)
+    io_calls["max"] = 0
+    start = time.perf_counter()
+    results = await asyncio.gather(*(request(method, path, user_id) for _ in range(concurrency)))
+    wall_ms = (time.perf_counter() - start) * 1000
+    latencies = sorted(latency for _, latency in results)
+    return {
+        "requests": concurrency,
+        "errors": sum(1 for code, _ in results if code is None or code >= 400),
+        "single_ms": round(single_ms, 1),
+        "wall_ms": round(wall_ms, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "max_ms": round(latencies[-1], 1),
+        "max_in_flight": io_calls["max"] or None,
+        "speedup": round(concurrency * single_ms / wall_ms, 2),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Concurrent requests against the app, do they overlap or queue?")
+    parser.add_argument("-c", "--concurrency", type=int, default=20, help="Requests started at once")
+    parser.add_argument("--path", default="/words", help="GET path (the simulated call is db_service.get_words)")
+    parser.add_argument("--user", help="Cognito sub for real AWS calls, the DynamoDB call is simulated without it")
+    parser.add_argument("--io-ms", type=float, default=200, help="Simulated blocking call duration")
+    parser.add_argument("--compare-blocking", action="store_true", help="Also run with the call on the event loop")
+    parser.add_argument("--min-speedup", type=float, help="Exit 1 if the speedup is below this")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    if args.user is None:
+        simulate_io(args.io_ms)
+    user_id = args.user or SIMULATED_USER
+
+    results = {"run_io": asyncio.run(load(args.concurrency, "GET", args.path, user_id))}
+    if args.compare_blocking:
+        run_on_event_loop()
+        results["event_loop"] = asyncio.run(load(args.concurrency, "GET", args.path, user_id))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mode':<12} {'requests':>8} {'errors':>6} {'single ms':>9} {'wall ms':>9} {'p50 ms':>8} "
+              f"{'max ms':>8} {'in flight':>9} {'speedup':>7}")
+        for mode, r in results.items():
+            print(f"{mode:<12} {r['requests']:>8} {r['errors']:>6} {r['single_ms']:>9} {r['wall_ms']:>9} {r['p50_ms']:>8} "
+                  f"{r['max_ms']:>8} {str(r['max_in_flight'] or '-'):>9} {r['speedup']:>7}")
+
+    if args.min_speedup is not None and results["run_io"]["speedup"] < args.min_speedup:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
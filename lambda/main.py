@@ -1,16 +1,60 @@
-from fastapi import FastAPI, Request, HTTPException, Depends
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request, HTTPException, Depends, Query, BackgroundTasks
+from fastapi.responses import JSONResponse, StreamingResponse
 from mangum import Mangum
 from models import *
 import bedrock_service
 import db_service
+import json
 import time
-from utils import logging
+from utils import logging, tasks
+from utils.concurrency import run_io, in_flight
 import challenge_service
+import conjugation_service
+import dictionary_service
+import warmup_service
+import bulk_service
 
 # FASTAPI app and AWS Lambda handler
 app = FastAPI()
-handler = Mangum(app)
+api_handler = Mangum(app)
+
+# Tasks that can be triggered by scheduled (EventBridge) events with {"oghmai_task": "<name>"}
+SCHEDULED_TASKS = {
+    "refill_challenge_pools": lambda event, context: challenge_service.refill_all_challenge_pools(
+        deadline=time.time() + context.get_remaining_time_in_millis() / 1000 - 5 if context else None),
+    "refill_challenge_pool": lambda event, context: challenge_service.refill_challenge_pool(
+        event["user_id"], event["lang"], event["trigger"]),
+    "refresh_dictionary_entry": lambda event, context: dictionary_service.refresh_entry(event["lang"], event["word"]),
+    "warmup": lambda event, context: warmup_service.warm_up(),
+    "bulk_words": bulk_service.run_bulk_task,
+    "purge_words": bulk_service.run_purge_task,
+}
+
+def run_task_later(background_tasks: BackgroundTasks, task: str, **params):
+    # On Lambda a separate invocation, locally a background task after the response
+    if not tasks.dispatch(task, **params):
+        background_tasks.add_task(SCHEDULED_TASKS[task], {"oghmai_task": task, **params}, None)
+
+async def refill_pool_later(background_tasks: BackgroundTasks, user_id: str, lang: str, trigger: str):
+    # The pool depth check (one query) is cheaper than an invocation that finds the pool full
+    if await run_io(challenge_service.pool_needs_refill, user_id, lang, trigger):
+        await run_io(run_task_later, background_tasks, "refill_challenge_pool", user_id=user_id, lang=lang, trigger=trigger)
+
+def handler(event, context):
+    task = event.get("oghmai_task") if isinstance(event, dict) else None
+    if task is None:
+        return api_handler(event, context)
+
+    if task not in SCHEDULED_TASKS:
+        logging.error(f"Unknown scheduled task {task}")
+        return {"status": "error", "message": f"Unknown task {task}"}
+
+    logging.set_request_id()
+    try:
+        logging.info(f"Running scheduled task {task}")
+        return {"status": "ok", "result": SCHEDULED_TASKS[task](event, context)}
+    finally:
+        logging.clear_request_id()
 
 # Dependency to extract user info from the request
 def get_current_user(request: Request):
@@ -30,21 +74,42 @@ async def log_requests(request: Request, call_next):
 
     # Log the incoming request
     start_time = time.time()
-    logging.info(f"Incoming request: {request.method} {request.url}")
+    logging.info(f"Incoming request: {request.method} {request.url}", extra={"io_in_flight": in_flight()})
 
     try:
-        # Process the request
-        response = await call_next(request)
+        # Process the request, summing up the Bedrock calls it makes and sharing the DynamoDB items it reads
+        # (db_service.unit_of_work). Streamed responses are still generating here, their calls are only in the per-call metrics
+        with bedrock_service.measure_usage() as usage, db_service.unit_of_work():
+            response = await call_next(request)
 
         # Log the completed request
         process_time = time.time() - start_time
         logging.info(f"Completed request: {request.method} {request.url} with {response.status_code} in {process_time:.2f} seconds")
+        _emit_request_metrics(request, response.status_code, process_time, usage)
 
         return response
     finally:
         # Clear the request ID after the request is complete
         logging.clear_request_id()
 
+def _emit_request_metrics(request: Request, status_code: int, process_time: float, usage: dict):
+    route = request.scope.get("route")
+    logging.metrics(
+        "request",
+        dimensions={"Endpoint": f"{request.method} {route.path if route else request.url.path}"},
+        values={
+            "Latency": round(process_time * 1000, 1),
+            "BedrockInvocations": usage["calls"],
+            "BedrockCacheHits": usage["cacheHits"],
+            "BedrockLatency": round(usage["latencyMs"], 1),
+            "BedrockRetries": usage["retries"],
+            "InputTokens": usage["inputTokens"],
+            "OutputTokens": usage["outputTokens"],
+        },
+        units={"Latency": "Milliseconds", "BedrockLatency": "Milliseconds"},
+        properties={"status_code": status_code, "prompts": usage["prompts"]}
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     # Log the exception with full details
@@ -55,6 +120,17 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"detail": "Internal Server Error", "error": str(exc)},
     )
 
+@app.exception_handler(bedrock_service.ModelUnavailableError)
+async def model_unavailable_handler(request: Request, exc: bedrock_service.ModelUnavailableError):
+    logging.warning(f"Model unavailable at {request.method} {request.url.path} - {str(exc)}",
+                    extra={"bedrock_governor": bedrock_service.governor.snapshot()})
+    headers = {"Retry-After": str(int(exc.retry_after + 0.999))} if exc.retry_after else None
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Model temporarily unavailable"},
+        headers=headers,
+    )
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
@@ -66,62 +142,115 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def get_available_tests(current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
     lang = 'IT'
-    return challenge_service.get_statistics(user_id, lang)
+    return await run_io(challenge_service.get_statistics, user_id, lang)
 
 
 @app.get("/test/next", response_model=TestChallenge)
 async def get_next_test(current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
     lang = 'IT'
-    next_test = challenge_service.get_next_test(user_id, lang)
+    next_test = await run_io(challenge_service.get_next_test, user_id, lang)
     if next_test is None:
         return JSONResponse(status_code=204, content=None)
     return next_test
 
 
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def sse_stream(events, to_result):
+    """
+    Server-Sent Events body: a "delta" event per generated chunk, then a "result" event with
+    the validated object (null if there is none), or an "error" event if generation failed.
+
+    The events generator and to_result block on DynamoDB and Bedrock, so every step runs through
+    run_io and counts against IO_CONCURRENCY (a sync body would use Starlette's own thread pool).
+    A slot is held while a chunk is produced, not while the client reads it.
+    """
+    try:
+        while True:
+            event = await run_io(next, events, None)
+            if event is None:
+                break
+            kind, payload = event
+            if kind == "delta":
+                yield sse_event("delta", {"text": payload})
+            else:
+                result = await run_io(to_result, payload)
+                yield sse_event("result", result.model_dump(mode="json") if result is not None else None)
+    except Exception as e:
+        logging.exception(f"Error while streaming response - {str(e)}")
+        detail = e.detail if isinstance(e, HTTPException) else "Internal Server Error"
+        yield sse_event("error", {"detail": detail})
+    finally:
+        # Also when the client disconnects mid-stream - ends the Bedrock stream
+        await run_io(events.close)
+
+# Streaming variants need a transport that passes the body through as it is produced
+# (uvicorn, Lambda response streaming) - behind API Gateway REST + Mangum it arrives in one piece.
+@app.get("/test/next/stream")
+async def get_next_test_stream(current_user: dict = Depends(get_current_user)):
+    user_id = current_user["user_id"]
+    lang = 'IT'
+    events = challenge_service.get_next_test_stream(user_id, lang)
+    return StreamingResponse(sse_stream(events, lambda challenge: challenge), media_type="text/event-stream")
+
+
 @app.get("/test/match", response_model=MatchChallenge)
 async def get_match_test(count: int = 10, current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
     lang = 'IT'
-    pairs = challenge_service.get_random_word_translation_pairs(user_id, lang, count)
+    pairs = await run_io(challenge_service.get_random_word_translation_pairs, user_id, lang, count)
     return MatchChallenge(pairs=pairs)
 
 
 @app.put("/test/{ch_id}", response_model=TestResult)
-async def validate_test(ch_id: str, guess: str, current_user: dict = Depends(get_current_user)):
+async def validate_test(ch_id: str, guess: str, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
-    return challenge_service.validate_test(user_id, ch_id, guess)
+    lang = 'IT'
+    result = await run_io(challenge_service.validate_test, user_id, ch_id, guess)
+    if result.result != ResultEnum.PARTIAL:
+        await refill_pool_later(background_tasks, user_id, lang, "validate")
+    return result
 
 @app.get("/words", response_model=WordList)
 async def get_words(
     status: str = None,
     failed_last_test: bool = False,
     contains: str = None,
+    limit: int = Query(db_service.WORDS_PAGE_SIZE, ge=1, le=1000),
+    cursor: str = None,
     current_user: dict = Depends(get_current_user),
 ):
     user_id = current_user["user_id"]
     lang = 'IT'
 
-    words = db_service.get_words(user_id, lang, status, failed_last_test, contains)
-
-    return WordList(words=words)
+    return await run_io(db_service.get_words, user_id, lang, status, failed_last_test, contains, limit, cursor)
 
-@app.patch("/words")
-async def patch_words(action: WordActionEnum, current_user: dict = Depends(get_current_user)):
+@app.patch("/words", response_model=BulkWordResult)
+async def patch_words(
+    request: Request,
+    action: WordActionEnum,
+    req: BulkWordRequest = None,
+    background: bool = False,
+    current_user: dict = Depends(get_current_user),
+):
+    # Without a body, the action applies to all words; stops before the Lambda timeout and
+    # either returns a cursor or (background=true) continues in a separate invocation
     user_id = current_user["user_id"]
     lang = 'IT'
-    if action == WordActionEnum.RESET:
-        for word in db_service.get_words(user_id, lang):
-            db_service.reset_word(user_id, lang, word.word)
-        return {"message": "Words reset"}
-    else:
-        raise HTTPException(status_code=400, detail="Invalid action")
+    req = req or BulkWordRequest()
+    deadline = bulk_service.deadline_from_context(request.scope.get("aws.context"))
+    result = await run_io(bulk_service.run_bulk_action, user_id, lang, action, req, deadline)
+    if not result.complete and background:
+        result.continued = await run_io(bulk_service.continue_later, user_id, lang, action, req, result.cursor)
+    return result
 
 @app.get("/word/{word}", response_model=WordResult)
 async def get_word(word: str, current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
     lang = 'IT'
-    word_result = db_service.get_word(user_id, lang, word)
+    word_result = await run_io(db_service.get_word, user_id, lang, word)
     if word_result is None:
         raise HTTPException(status_code=404, detail=f"Word {word} not found")
     return word_result
@@ -130,49 +259,64 @@ async def get_word(word: str, current_user: dict = Depends(get_current_user)):
 async def delete_word(word: str, current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
     lang = 'IT'
-    return db_service.delete_word(user_id, lang, word)
+    return await run_io(db_service.delete_word, user_id, lang, word)
 
 @app.patch("/word/{word}")
 async def patch_word(word: str, action: WordActionEnum, current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
     lang = 'IT'
     if action == WordActionEnum.UNDELETE:
-        return db_service.undelete_word(user_id, lang, word)
+        return await run_io(db_service.undelete_word, user_id, lang, word)
     elif action == WordActionEnum.RESET:
-        return db_service.reset_word(user_id, lang, word)
+        return await run_io(db_service.reset_word, user_id, lang, word)
     else:
         raise HTTPException(status_code=400, detail="Invalid action")
 
 @app.post("/describe-word", response_model=WordResult)
 async def describe_word(req: DescriptionRequest, current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
-    result = bedrock_service.describe_word(req.description, req.exclusions)
+    result = await run_io(dictionary_service.describe_word, req.description, req.exclusions, user_id=user_id)
     if result is None:
         return JSONResponse(status_code=204, content=None)
-    existing_word = db_service.get_word(user_id, result.language, result.word)
+    existing_word = await run_io(db_service.get_word, user_id, result.language, result.word)
     result.status = existing_word.status if existing_word else StatusEnum.UNSAVED
     return result
 
+@app.post("/describe-word/stream")
+async def describe_word_stream(req: DescriptionRequest, current_user: dict = Depends(get_current_user)):
+    user_id = current_user["user_id"]
+
+    def with_status(result: WordResult | None):
+        if result is not None:
+            existing_word = db_service.get_word(user_id, result.language, result.word)
+            result.status = existing_word.status if existing_word else StatusEnum.UNSAVED
+        return result
+
+    events = dictionary_service.describe_word_stream(req.description, req.exclusions, user_id=user_id)
+    return StreamingResponse(sse_stream(events, with_status), media_type="text/event-stream")
+
 @app.post("/word")
-async def save_word(word_result: WordResult, current_user: dict = Depends(get_current_user)):
+async def save_word(word_result: WordResult, background_tasks: BackgroundTasks, current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
-    result = db_service.save_word(user_id, word_result)
+    dictionary_version = await run_io(dictionary_service.resolve_meanings, word_result)
+    result = await run_io(db_service.save_word, user_id, word_result, dictionary_version=dictionary_version)
+    await refill_pool_later(background_tasks, user_id, word_result.language, "save")
     return result
 
 @app.delete("/words")
-async def delete_words(current_user: dict = Depends(get_current_user)):
+async def delete_words(request: Request, cursor: str = None, current_user: dict = Depends(get_current_user)):
+    # Large vocabularies are finished asynchronously ("continued"), the cursor is only needed if that fails
     user_id = current_user["user_id"]
-    words = db_service.purge_words(user_id, 'IT')
-    return words
+    return await run_io(bulk_service.purge_words, user_id, 'IT', cursor, request.scope.get("aws.context"))
 
 @app.get("/word/{word}/tenses", response_model=ExplanationResponse)
 async def explain_word(word: str, current_user: dict = Depends(get_current_user)):
     user_id = current_user["user_id"]
     lang = 'IT'
-    word_item = db_service.get_word(user_id, lang, word)
+    word_item = await run_io(db_service.get_word, user_id, lang, word)
     if word_item is None:
         raise HTTPException(status_code=404, detail=f"Word {word} not found")
-    result = bedrock_service.get_verb_explanation(word_item)
+    result = await run_io(conjugation_service.get_verb_explanation, word_item)
     if result is None:
         return JSONResponse(status_code=204, content=None)
     return result
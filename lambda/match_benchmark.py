@@ -0,0 +1,169 @@
+"""
+Latency of the match test pair sampling as the vocabulary grows, run from lambda/:
+
+    python match_benchmark.py                                   # 100, 1000 and 10000 words, 20 ms per round trip
+    python match_benchmark.py --sizes 100,10000 --round-trip-ms 10 --repeat 5 --json
+    python match_benchmark.py --before-max-words 10000          # also run the old path on 10k words (minutes)
+
+The vocabulary table is simulated in memory: every query or point read is one round trip of --round-trip-ms,
+a query returns at most 1 MB of items (by their JSON size, before projection - as DynamoDB counts it).
+Both code paths run against the same table: "current" is get_random_word_translation_pairs, "before" the
+implementation it replaced (list all words, then one get_word per word). The old path makes a round trip
+per word, so it only runs up to --before-max-words words.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Keep the per-call application logs out of the report
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import challenge_service
+import db_service
+from models import WordTranslationPair
+
+dynamo = sys.modules["db_service.dynamo"]
+
+PAGE_BYTES = 1024 * 1024
+USER_ID = "benchmark-user"
+LANG = "IT"
+
+
+class SimulatedTable:
+    """
+    In-memory stand-in for the vocabulary table: query() pages by size and Limit, get_item() by word.
+    """
+
+    name = "simulated_vocabulary"
+
+    def __init__(self, size: int, round_trip_ms: float):
+        self.round_trip = round_trip_ms / 1000
+        self.round_trips = 0
+        self.items = [_word_item(i) for i in range(size)]
+        self.item_bytes = [len(json.dumps(item, ensure_ascii=False).encode("utf-8")) for item in self.items]
+        self.by_word = {item["word"]: item for item in self.items}
+
+    def _round_trip(self):
+        self.round_trips += 1
+        time.sleep(self.round_trip)
+
+    def query(self, ExclusiveStartKey: dict = None, Limit: int = None, **kwargs) -> dict:
+        self._round_trip()
+        start = 0
+        if ExclusiveStartKey:
+            start = next(i for i, item in enumerate(self.items) if item["word"] == ExclusiveStartKey["word"]) + 1
+
+        end, read = start, 0
+        while end < len(self.items) and read + self.item_bytes[end] <= PAGE_BYTES and (Limit is None or end - start < Limit):
+            read += self.item_bytes[end]
+            end += 1
+
+        response = {"Items": [dict(item) for item in self.items[start:end]], "Count": end - start}
+        if end < len(self.items):
+            response["LastEvaluatedKey"] = {"user_id": USER_ID, "word": self.items[end - 1]["word"]}
+        return response
+
+    def get_item(self, Key: dict, **kwargs) -> dict:
+        self._round_trip()
+        item = self.by_word.get(Key["word"])
+        return {"Item": json.loads(json.dumps(item))} if item is not None else {}
+
+
+def _word_item(index: int) -> dict:
+    # Roughly the size of a saved word with one meaning
+    word = f"parola{index:06d}"
+    return {
+        "user_id": USER_ID,
+        "word": word,
+        "lang": LANG,
+        "status": "NEW",
+        "created_at": 1700000000,
+        "due_at": 1700000000 + index,
+        "test_results": [],
+        "meanings": [{
+            "translation": f"word {index}",
+            "definition": f"Definizione della {word}, con abbastanza testo per somigliare a una vera voce.",
+            "examples": [f"Una frase d'esempio con la {word}.", f"Un'altra frase con la {word} dentro."],
+            "type": "NOUN",
+        }],
+    }
+
+
+def pairs_before(user_id: str, lang: str, count: int) -> list[WordTranslationPair]:
+    # The replaced implementation - all words (every page of the list), then each word's details
+    word_results = []
+    cursor = None
+    while True:
+        page = db_service.get_words(user_id, lang, cursor=cursor)
+        word_results += page.words
+        cursor = page.cursor
+        if cursor is None:
+            break
+
+    all_pairs = []
+    for word_item in word_results:
+        word_result = db_service.get_word(user_id, lang, word_item.word)
+        if word_result and word_result.meanings:
+            for meaning in word_result.meanings:
+                all_pairs.append(WordTranslationPair(word=word_result.word, translation=meaning.translation))
+
+    if len(all_pairs) <= count:
+        return all_pairs
+    return random.sample(all_pairs, count)
+
+
+def measure(table: SimulatedTable, sample, repeat: int, count: int) -> tuple[int, float]:
+    # (round trips of one run, median latency in ms)
+    latencies = []
+    for _ in range(repeat):
+        table.round_trips = 0
+        start = time.perf_counter()
+        pairs = sample(USER_ID, LANG, count)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert len(pairs) == min(count, len(table.items))
+    return table.round_trips, round(statistics.median(latencies), 1)
+
+
+def run(sizes: list[int], round_trip_ms: float, repeat: int, count: int, before_max_words: int) -> list[dict]:
+    results = []
+    for size in sizes:
+        table = SimulatedTable(size, round_trip_ms)
+        dynamo.vocabulary_table = table
+        round_trips, p50 = measure(table, challenge_service.get_random_word_translation_pairs, repeat, count)
+        result = {"words": size, "round_trips": round_trips, "p50_ms": p50,
+                  "before_round_trips": None, "before_p50_ms": None}
+        if size <= before_max_words:
+            # One run - the old path is slow by design, and its latency is dominated by round trips
+            result["before_round_trips"], result["before_p50_ms"] = measure(table, pairs_before, 1, count)
+        results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match test pair sampling latency by vocabulary size")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma separated vocabulary sizes")
+    parser.add_argument("--round-trip-ms", type=float, default=20, help="Simulated DynamoDB round trip")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size of the current path (median is reported)")
+    parser.add_argument("--count", type=int, default=10, help="Pairs per match test")
+    parser.add_argument("--before-max-words", type=int, default=1000, help="Largest size the old path is run on")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run([int(s) for s in args.sizes.split(",")], args.round_trip_ms, args.repeat, args.count,
+                  args.before_max_words)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'words':>7} {'round trips':>11} {'p50 ms':>8} {'before: trips':>14} {'before: ms':>11}")
+    for r in results:
+        before_trips = "-" if r["before_round_trips"] is None else r["before_round_trips"]
+        before_ms = "-" if r["before_p50_ms"] is None else r["before_p50_ms"]
+        print(f"{r['words']:>7} {r['round_trips']:>11} {r['p50_ms']:>8} {before_trips:>14} {before_ms:>11}")
+
+
+if __name__ == "__main__":
+    main()
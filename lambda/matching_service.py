@@ -0,0 +1,195 @@
+import os
+import re
+import unicodedata
+from collections import Counter
+from enum import Enum
+
+from models import WordTypeEnum
+from utils import logging
+
+# Max edit distance treated as a possible typo of the right word (left to the model - one letter
+# apart is often another word: contare / cantare, spostare / sposare)
+FUZZY_MAX_TYPOS = int(os.getenv("FUZZY_MAX_TYPOS", "1"))
+# Shorter words are never considered typos - "caro" vs "carro"
+FUZZY_TYPO_MIN_LENGTH = int(os.getenv("FUZZY_TYPO_MIN_LENGTH", "6"))
+# Guesses shorter than this are rejected without asking the model
+FUZZY_MIN_GUESS_LENGTH = int(os.getenv("FUZZY_MIN_GUESS_LENGTH", "2"))
+# Guesses further than this share of their length (edit distance) from every accepted form are
+# another word - rejected without asking the model ("gatto" for "cane")
+FUZZY_NO_MATCH_RATIO = float(os.getenv("FUZZY_NO_MATCH_RATIO", "0.5"))
+
+ARTICLE_PATTERN = re.compile(r"^(?:(?:il|lo|la|i|gli|le|un|uno|una)\s+|(?:l|un|dell|all|dall|nell|sull)')")
+APOSTROPHES = str.maketrans({"’": "'", "‘": "'", "`": "'", "´": "'"})
+
+# Singular -> plural / feminine endings of adjectives, longest first
+# (nouns would collide: casa / caso, porta / porto, pasta / pasto are different words)
+INFLECTIONS = [
+    ("cia", ["ce", "cie"]),
+    ("gia", ["ge", "gie"]),
+    ("co", ["chi", "ci", "ca", "che"]),
+    ("go", ["ghi", "gi", "ga", "ghe"]),
+    ("ca", ["che"]),
+    ("ga", ["ghe"]),
+    ("io", ["i", "ia", "ie"]),
+    ("o", ["i", "a", "e"]),
+    ("a", ["e", "i"]),
+    ("e", ["i"]),
+]
+
+# Endings of the common tenses per conjugation, appended to the stem of the infinitive
+# (present, imperfect, future, conditional, past participle, gerund - -ire with and without -isc-)
+VERB_ENDINGS = {
+    "are": {
+        "o", "i", "a", "iamo", "ate", "ano", "ino",
+        "avo", "avi", "ava", "avamo", "avate", "avano",
+        "erò", "erai", "erà", "eremo", "erete", "eranno",
+        "erei", "eresti", "erebbe", "eremmo", "ereste", "erebbero",
+        "ato", "ata", "ati", "ate", "ando",
+    },
+    "ere": {
+        "o", "i", "e", "iamo", "ete", "ono", "a", "ano",
+        "evo", "evi", "eva", "evamo", "evate", "evano",
+        "erò", "erai", "erà", "eremo", "erete", "eranno",
+        "erei", "eresti", "erebbe", "eremmo", "ereste", "erebbero",
+        "uto", "uta", "uti", "ute", "endo",
+    },
+    "ire": {
+        "o", "i", "e", "iamo", "ite", "ono", "a", "ano", "isco", "isci", "isce", "iscono", "isca", "iscano",
+        "ivo", "ivi", "iva", "ivamo", "ivate", "ivano",
+        "irò", "irai", "irà", "iremo", "irete", "iranno",
+        "irei", "iresti", "irebbe", "iremmo", "ireste", "irebbero",
+        "ito", "ita", "iti", "ite", "endo",
+    },
+}
+
+
+class MatchDecision(str, Enum):
+    MATCH = "MATCH"          # Right word (maybe accented differently or inflected)
+    NO_MATCH = "NO_MATCH"    # Obviously not a word, no need to ask the model
+    AMBIGUOUS = "AMBIGUOUS"  # Needs the model (e.g. a synonym or a typo - "did you mean")
+
+
+# Per-container decision counters, "exact" counts the matches that never needed the model anyway
+decisions = Counter()
+
+
+def fold_accents(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def normalize(text: str) -> str:
+    text = text.translate(APOSTROPHES).strip().lower()
+    text = re.sub(r"\s+", " ", text)
+    text = ARTICLE_PATTERN.sub("", text)
+    return fold_accents(text.strip(" .,;:!?\"'"))
+
+
+def word_forms(word: str, word_types: set[str] = None) -> set[str]:
+    """
+    Forms of a (normalized) dictionary word accepted as the word itself.
+
+    Args:
+        word: The normalized word
+        word_types: WordTypeEnum values of its meanings, None if unknown. Plural / feminine forms
+            are only added for adjectives, conjugated forms for verbs (or unknown types)
+    """
+    forms = {word}
+
+    if word_types is not None and WordTypeEnum.ADJECTIVE in word_types:
+        for ending, replacements in INFLECTIONS:
+            if word.endswith(ending) and len(word) > len(ending) + 1:
+                forms.update(word[:-len(ending)] + r for r in replacements)
+                break
+
+    infinitive = word[:-2] + "e" if word.endswith(("arsi", "ersi", "irsi")) else word
+    is_verb = word_types is None or WordTypeEnum.VERB in word_types
+    if is_verb and infinitive[-3:] in VERB_ENDINGS and len(infinitive) > 4:
+        conjugation = infinitive[-3:]
+        stem = infinitive[:-3]
+        forms.update(_join(stem, fold_accents(ending), conjugation) for ending in VERB_ENDINGS[conjugation])
+        forms.add(infinitive)
+
+    return forms
+
+
+def _join(stem: str, ending: str, conjugation: str) -> str:
+    # -are spelling: hard c / g stay hard (cerchi, pagherò), no double i (mangi, mangerò, studi)
+    if conjugation != "are" or ending[0] not in "ie":
+        return stem + ending
+    if stem.endswith(("c", "g")):
+        return stem + "h" + ending
+    if stem.endswith(("ci", "gi")) and ending[0] == "e":
+        return stem[:-1] + ending
+    if stem.endswith("i") and ending[0] == "i":
+        return stem + ending[1:]
+    return stem + ending
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance, gives up (returns limit + 1) as soon as it exceeds the limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def match_answer(guess: str, word: str, word_types: set[str] = None) -> MatchDecision:
+    """
+    Decide locally whether a guess is the challenge word.
+
+    Args:
+        guess: What the user typed
+        word: The stored word of the challenge
+        word_types: WordTypeEnum values of the word's meanings (which inflections apply), None if unknown
+
+    Returns:
+        MATCH or NO_MATCH when it is clear without the model, AMBIGUOUS for guesses close to the word
+    """
+    if guess.strip().lower() == word.lower():
+        decisions["exact"] += 1
+        return MatchDecision.MATCH
+
+    normalized_guess = normalize(guess)
+    normalized_word = normalize(word)
+
+    forms = word_forms(normalized_word, word_types)
+    if len(normalized_guess) < FUZZY_MIN_GUESS_LENGTH or not re.fullmatch(r"[a-z' ]+", normalized_guess):
+        decision = MatchDecision.NO_MATCH
+    elif normalized_guess in forms:
+        decision = MatchDecision.MATCH
+    elif not any(_is_near(normalized_guess, form) for form in forms):
+        decision = MatchDecision.NO_MATCH
+    else:
+        decision = MatchDecision.AMBIGUOUS
+        if len(normalized_word) >= FUZZY_TYPO_MIN_LENGTH and \
+                edit_distance(normalized_guess, normalized_word, FUZZY_MAX_TYPOS) <= FUZZY_MAX_TYPOS:
+            # Possibly a typo, possibly another word - the model decides (and hints "did you mean")
+            decisions["typo"] += 1
+
+    decisions[decision.value] += 1
+    logging.info(f"Local match of '{guess}' against '{word}': {decision.value}",
+                 extra={"match_decisions": dict(decisions), "llm_calls_saved": llm_calls_saved()})
+    return decision
+
+
+def _is_near(guess: str, form: str) -> bool:
+    # Within FUZZY_NO_MATCH_RATIO edits of the longer of the two
+    limit = int(max(len(guess), len(form)) * FUZZY_NO_MATCH_RATIO)
+    return edit_distance(guess, form, limit) <= limit
+
+
+def llm_calls_saved() -> int:
+    """
+    Number of guesses settled locally that would have gone to the model before.
+    """
+    return decisions[MatchDecision.MATCH.value] + decisions[MatchDecision.NO_MATCH.value]
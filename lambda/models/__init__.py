@@ -1,4 +1,4 @@
-from .models import DescriptionRequest, WordResult, WordDefinition, WordList, StatusEnum, TestChallenge, TestStatistics, TestResult, ResultEnum, WordItem, WordActionEnum, WordTypeEnum, ExplanationResponse, WordTranslationPair, MatchChallenge
+from .models import DescriptionRequest, WordResult, WordDefinition, WordList, StatusEnum, TestChallenge, TestStatistics, TestResult, ResultEnum, WordItem, WordActionEnum, WordTypeEnum, ExplanationResponse, WordTranslationPair, MatchChallenge, BulkWordRequest, BulkWordFailure, BulkWordResult
 
 __all__ = ['DescriptionRequest', 'WordResult', 'WordDefinition', 'WordList', 'StatusEnum', 'TestChallenge', 'TestStatistics', 'TestResult', 'ResultEnum', 'WordItem', 'WordActionEnum', 'WordTypeEnum', 'ExplanationResponse', 'WordTranslationPair',
-           'MatchChallenge']
+           'MatchChallenge', 'BulkWordRequest', 'BulkWordFailure', 'BulkWordResult']
@@ -39,9 +39,28 @@ class StatusEnum(str, Enum):  # Define the Enum for status
             return levels[current_index - 1]
         return self
 
+    def review_interval(self) -> Optional[int]:
+        # Days after the last test before the word is due again, None if the status is never tested
+        return REVIEW_INTERVAL_DAYS.get(self)
+
+    def due_at(self, last_test: Optional[int]) -> Optional[int]:
+        # Unix timestamp from which the word is testable again (never tested words are due right away)
+        interval = self.review_interval()
+        if interval is None:
+            return None
+        return int(last_test or 0) + interval * 86400
+
+REVIEW_INTERVAL_DAYS = {
+    StatusEnum.NEW: 1,
+    StatusEnum.LEARNED: 3,
+    StatusEnum.KNOWN: 7,
+    StatusEnum.MASTERED: 14,
+}
+
 class WordActionEnum(str, Enum):
     UNDELETE = "UNDELETE"
     RESET = "RESET"
+    DELETE = "DELETE"
 
 class ResultEnum(str, Enum):  # Define an Enum for the result
     INCORRECT = "INCORRECT"
@@ -64,6 +83,8 @@ class TestResult(BaseModel):
 
 class TestStatistics(BaseModel):
     available: dict[StatusEnum, int] = {s: 0 for s in StatusEnum}   # Map StatusEnum to integer counts
+    total: dict[StatusEnum, int] = {s: 0 for s in StatusEnum}   # All saved words, tested or not
+    nextDueAt: Optional[datetime] = None
 
 class WordDefinition(BaseModel):
     translation: str
@@ -87,6 +108,26 @@ class WordItem(BaseModel):
 
 class WordList(BaseModel):
     words: list[WordItem]
+    cursor: Optional[str] = None  # Opaque token for the next page, None when there is nothing left
+
+class BulkWordRequest(BaseModel):
+    words: Optional[list[str]] = None  # Explicit words, otherwise all words (of the given status)
+    status: Optional[StatusEnum] = None
+    cursor: Optional[str] = None  # From an incomplete BulkWordResult, to continue where it stopped
+
+class BulkWordFailure(BaseModel):
+    word: str
+    error: str
+
+class BulkWordResult(BaseModel):
+    action: WordActionEnum
+    processed: int = 0
+    succeeded: int = 0
+    failed: list[BulkWordFailure] = []
+    complete: bool = True
+    cursor: Optional[str] = None  # Set when the run stopped before the deadline, send it back to continue
+    continued: bool = False  # The rest runs asynchronously, do not send the cursor back
+    message: Optional[str] = None
 
 class ExplanationResponse(BaseModel):
     word: str
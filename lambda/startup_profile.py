@@ -0,0 +1,148 @@
+"""
+Cold start profile of the Lambda handler, run from lambda/:
+
+    python startup_profile.py importtime            # slowest imports of main (python -X importtime)
+    python startup_profile.py first-request -n 5    # process start -> first handled request through main.handler
+    python startup_profile.py first-request --budget-ms 1500   # exit 1 if the median is over budget (CI)
+    python startup_profile.py warmup --path /words --user <sub>  # cold vs warm-unprimed vs primed (needs AWS)
+
+Every run is a fresh interpreter, so nothing is shared between samples.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+# How the container is prepared before the measured request
+SCENARIOS = {
+    "cold": "measured request is the first thing the process does",
+    "unprimed": "an unrelated request (no AWS calls) is handled first",
+    "primed": "a warm-up event is handled first",
+}
+
+
+def api_event(method: str, path: str, user_id: str = None) -> dict:
+    # Minimal API Gateway (REST, proxy integration) event as Mangum expects it
+    authorizer = {"claims": {"sub": user_id, "cognito:username": user_id}} if user_id else {}
+    return {
+        "resource": "/{proxy+}",
+        "path": path,
+        "httpMethod": method,
+        "headers": {"Host": "localhost", "Accept": "application/json"},
+        "multiValueHeaders": {"Host": ["localhost"], "Accept": ["application/json"]},
+        "queryStringParameters": None,
+        "multiValueQueryStringParameters": None,
+        "pathParameters": {"proxy": path.lstrip("/")},
+        "requestContext": {
+            "resourcePath": "/{proxy+}",
+            "httpMethod": method,
+            "path": path,
+            "stage": "prod",
+            "identity": {"sourceIp": "127.0.0.1"},
+            "authorizer": authorizer,
+        },
+        "body": None,
+        "isBase64Encoded": False,
+    }
+
+
+def run_child(path: str, scenario: str = "cold", user_id: str = None):
+    import_start = time.perf_counter()
+    import main
+    imported = time.perf_counter()
+    if scenario == "unprimed":
+        main.handler(api_event("GET", "/openapi.json"), None)
+    elif scenario == "primed":
+        main.handler({"oghmai_task": "warmup"}, None)
+    prepared = time.perf_counter()
+    response = main.handler(api_event("GET", path, user_id), None)
+    handled = time.perf_counter()
+    print(json.dumps({
+        "handled_at": time.time(),
+        "import_ms": (imported - import_start) * 1000,
+        "request_ms": (handled - prepared) * 1000,
+        "status": response.get("statusCode"),
+    }))
+
+
+def first_request(samples: int, path: str, scenario: str = "cold", user_id: str = None) -> list[dict]:
+    results = []
+    for _ in range(samples):
+        started_at = time.time()
+        command = [sys.executable, __file__, "child", "--path", path, "--scenario", scenario]
+        if user_id:
+            command += ["--user", user_id]
+        output = subprocess.run(command, capture_output=True, text=True, check=True, env=os.environ.copy()).stdout
+        # Application logs go to stdout as well, the measurement is the last line
+        result = json.loads(output.strip().splitlines()[-1])
+        result["process_to_first_request_ms"] = (result.pop("handled_at") - started_at) * 1000
+        results.append(result)
+    return results
+
+
+def import_time(top: int) -> list[tuple[int, int, str]]:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start profile of main.handler")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    imports = sub.add_parser("importtime", help="Slowest imports (cumulative) of main")
+    imports.add_argument("--top", type=int, default=30)
+    request = sub.add_parser("first-request", help="Process start to first handled request")
+    request.add_argument("-n", "--samples", type=int, default=5)
+    request.add_argument("--path", default="/openapi.json", help="Request path (should not need AWS)")
+    request.add_argument("--budget-ms", type=float, help="Fail if the median process-to-first-request is over this")
+    warmup = sub.add_parser("warmup", help="Latency of the measured request in a cold, unprimed and primed container")
+    warmup.add_argument("-n", "--samples", type=int, default=5)
+    warmup.add_argument("--path", default="/words", help="Request path, should call DynamoDB")
+    warmup.add_argument("--user", help="Cognito sub to send as the authorized user")
+    child = sub.add_parser("child")
+    child.add_argument("--path", default="/openapi.json")
+    child.add_argument("--scenario", choices=SCENARIOS, default="cold")
+    child.add_argument("--user")
+    args = parser.parse_args()
+
+    if args.mode == "child":
+        run_child(args.path, args.scenario, args.user)
+        return
+
+    if args.mode == "warmup":
+        for scenario, description in SCENARIOS.items():
+            values = [r["request_ms"] for r in first_request(args.samples, args.path, scenario, args.user)]
+            print(f"{scenario:<9} median {statistics.median(values):8.1f} ms  min {min(values):8.1f}  max {max(values):8.1f}"
+                  f"  ({description})")
+        return
+
+    if args.mode == "importtime":
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for cumulative_us, self_us, name in import_time(args.top):
+            print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+        return
+
+    results = first_request(args.samples, args.path)
+    for key in ("process_to_first_request_ms", "import_ms", "request_ms"):
+        values = [r[key] for r in results]
+        print(f"{key:<30} median {statistics.median(values):8.1f}  min {min(values):8.1f}  max {max(values):8.1f}")
+    median = statistics.median(r["process_to_first_request_ms"] for r in results)
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"Startup regression: median {median:.1f} ms is over the budget of {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
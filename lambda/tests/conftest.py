@@ -0,0 +1,63 @@
+import os
+import sys
+
+import pytest
+
+# Modules are imported the way Lambda does, from the lambda/ directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tables as in infra/main.tf: (name, hash key, range key, due index)
+TABLES = [
+    ("oghmai_vocabulary_words", "user_id", "word", True),
+    ("oghmai_vocabulary_recycle_bin", "user_id", "word", False),
+    ("oghmai_challenges", "user_id", "challenge_id", False),
+    ("oghmai_user_statistics", "user_id", "lang", False),
+    ("oghmai_verb_conjugations", "lang", "verb", False),
+    ("oghmai_dictionary", "lang", "word", False),
+]
+
+
+def _create_table(resource, name: str, hash_key: str, range_key: str, due_index: bool):
+    attributes = [{"AttributeName": hash_key, "AttributeType": "S"}, {"AttributeName": range_key, "AttributeType": "S"}]
+    kwargs = {}
+    if due_index:
+        attributes.append({"AttributeName": "due_at", "AttributeType": "N"})
+        kwargs["GlobalSecondaryIndexes"] = [{
+            "IndexName": "due_at_index",
+            "KeySchema": [{"AttributeName": "user_id", "KeyType": "HASH"}, {"AttributeName": "due_at", "KeyType": "RANGE"}],
+            "Projection": {"ProjectionType": "INCLUDE",
+                           "NonKeyAttributes": ["lang", "status", "last_test", "test_results", "created_at"]},
+        }]
+    resource.create_table(
+        TableName=name,
+        KeySchema=[{"AttributeName": hash_key, "KeyType": "HASH"}, {"AttributeName": range_key, "KeyType": "RANGE"}],
+        AttributeDefinitions=attributes,
+        BillingMode="PAY_PER_REQUEST",
+        **kwargs
+    )
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    """
+    All tables of the app in moto, with the lazy clients and tables of utils.aws pointed at them.
+    """
+    moto = pytest.importorskip("moto")
+    from utils import aws
+    from db_service import dynamo
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    with moto.mock_aws():
+        # Clients and tables created before the mock would talk to AWS
+        monkeypatch.setattr(aws, "_session", None)
+        monkeypatch.setattr(aws, "_clients", {})
+        monkeypatch.setattr(aws, "_resources", {})
+        for table in (dynamo.vocabulary_table, dynamo.recycle_bin_table, dynamo.challenge_table,
+                      dynamo.statistics_table, dynamo.conjugation_table, dynamo.dictionary_table):
+            monkeypatch.setattr(table, "_table", None)
+        resource = aws.resource("dynamodb")
+        for table in TABLES:
+            _create_table(resource, *table)
+        yield resource
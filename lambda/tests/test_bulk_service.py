@@ -0,0 +1,118 @@
+import time
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+import bulk_service
+from db_service import dynamo
+from models import BulkWordRequest, BulkWordResult, StatusEnum, WordActionEnum, WordResult
+
+WORDS = ["cane", "gatto", "topo", "sedia", "tavolo"]
+
+
+@pytest.fixture
+def vocabulary(dynamodb, monkeypatch):
+    monkeypatch.setattr(bulk_service, "BULK_PAGE_SIZE", 2)
+    # moto copies all tables in every transaction without a lock, parallel ones break each other
+    monkeypatch.setattr(bulk_service, "BULK_CONCURRENCY", 1)
+    dynamo.reconcile_statistics("u1", "IT")
+    for word in WORDS:
+        dynamo.save_word("u1", WordResult(word=word, language="IT"))
+    dynamo.save_word("u1", WordResult(word="cane", language="IT", status=StatusEnum.KNOWN, testResults=[],
+                                      lastTest=datetime.now()), allow_overwrite=True)
+
+
+@pytest.fixture
+def statistics_updates(monkeypatch) -> list:
+    updates = []
+    adjust = bulk_service.db_service.adjust_statistics
+
+    def record(user_id: str, lang: str, deltas: dict, due_at: int = None):
+        updates.append((deltas, due_at))
+        adjust(user_id, lang, deltas, due_at)
+
+    monkeypatch.setattr(bulk_service.db_service, "adjust_statistics", record)
+    return updates
+
+
+def counts() -> dict:
+    return dynamo.get_statistics("u1", "IT")["counts"]
+
+
+def run(action: WordActionEnum, deadline: float = None, **request) -> BulkWordResult:
+    return bulk_service.run_bulk_action("u1", "IT", action, BulkWordRequest(**request), deadline)
+
+
+def test_reset_of_all_words_runs_in_steps_with_one_counter_update(vocabulary, statistics_updates):
+    result = run(WordActionEnum.RESET)
+
+    assert (result.processed, result.succeeded, result.complete, result.cursor) == (5, 5, True, None)
+    assert statistics_updates == [({StatusEnum.KNOWN: -1, StatusEnum.NEW: 1}, StatusEnum.NEW.due_at(None))]
+    assert counts()[StatusEnum.NEW] == 5 and counts()[StatusEnum.KNOWN] == 0
+
+
+def test_reset_by_status(vocabulary):
+    result = run(WordActionEnum.RESET, status=StatusEnum.KNOWN)
+    assert result.processed == 1
+    assert dynamo.get_word("u1", "IT", "cane").status == StatusEnum.NEW
+
+
+def test_delete_then_undelete_all_words(vocabulary, statistics_updates):
+    result = run(WordActionEnum.DELETE)
+    assert (result.succeeded, result.failed) == (5, [])
+    assert dynamo.get_words("u1", "IT").words == []
+    assert sum(counts().values()) == 0
+
+    result = run(WordActionEnum.UNDELETE)
+    assert (result.succeeded, result.failed) == (5, [])
+    assert sorted(w.word for w in dynamo.get_words("u1", "IT").words) == sorted(WORDS)
+    assert counts()[StatusEnum.NEW] == 4 and counts()[StatusEnum.KNOWN] == 1
+    assert len(statistics_updates) == 2
+
+
+def test_failures_are_collected_per_word(vocabulary, statistics_updates):
+    result = run(WordActionEnum.DELETE, words=["cane", "nuvola", "Gatto"])
+
+    assert (result.processed, result.succeeded) == (3, 2)
+    assert [f.word for f in result.failed] == ["nuvola"]
+    assert statistics_updates == [({StatusEnum.KNOWN: -1, StatusEnum.NEW: -1}, None)]
+
+
+def test_deadline_stops_between_steps_with_a_cursor(vocabulary, statistics_updates):
+    first = run(WordActionEnum.RESET, deadline=time.time() - 1)
+    assert (first.processed, first.complete) == (2, False)
+    assert first.cursor is not None
+    assert len(statistics_updates) == 1
+
+    rest = run(WordActionEnum.RESET, cursor=first.cursor)
+    assert (rest.processed, rest.complete, rest.cursor) == (3, True, None)
+    assert counts()[StatusEnum.NEW] == 5
+
+
+def test_explicit_list_cursor_is_an_offset(vocabulary):
+    first = run(WordActionEnum.DELETE, deadline=time.time() - 1, words=["cane", "gatto", "topo"])
+    assert (first.processed, first.cursor) == (2, "2")
+
+    rest = run(WordActionEnum.DELETE, words=["cane", "gatto", "topo"], cursor=first.cursor)
+    assert (rest.processed, rest.succeeded, rest.complete) == (1, 1, True)
+
+
+@pytest.mark.parametrize("cursor", ["x", "-1", "1.5"])
+def test_invalid_explicit_list_cursor_is_a_bad_request(vocabulary, cursor):
+    with pytest.raises(HTTPException) as e:
+        run(WordActionEnum.DELETE, words=["cane"], cursor=cursor)
+    assert e.value.status_code == 400
+
+
+def test_incomplete_task_continues_in_another_invocation(vocabulary, monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(bulk_service.tasks, "dispatch", lambda task, **params: dispatched.append((task, params)) or True)
+    monkeypatch.setattr(bulk_service, "deadline_from_context", lambda context: time.time() - 1)
+
+    event = {"user_id": "u1", "lang": "IT", "action": "RESET", "request": {"status": None}}
+    result = bulk_service.run_bulk_task(event, None)
+
+    assert not result["complete"]
+    assert dispatched == [("bulk_words", {"user_id": "u1", "lang": "IT", "action": "RESET",
+                                          "request": {"words": None, "status": None, "cursor": result["cursor"]}})]
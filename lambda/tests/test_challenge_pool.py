@@ -0,0 +1,145 @@
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+from fastapi import BackgroundTasks
+
+import challenge_service
+import main
+from db_service import dynamo
+from models import StatusEnum, WordResult
+
+DAY = 86400
+
+
+@pytest.fixture
+def pool(dynamodb, monkeypatch):
+    monkeypatch.setattr(challenge_service, "CHALLENGE_POOL_DEPTH", 2)
+    monkeypatch.setattr(challenge_service, "CHALLENGE_POOL_REFILL_ON", {"validate", "save", "schedule"})
+    monkeypatch.setattr(challenge_service.bedrock_service, "create_challenge", lambda word: f"Descrizione di {word}")
+    dynamo.reconcile_statistics("u1", "IT")
+
+
+def save_due(word: str, due: bool = True):
+    dynamo.save_word("u1", WordResult(word=word, language="IT"))
+    last_test = datetime.fromtimestamp(time.time() - (2 if due else 0) * DAY)
+    dynamo.save_word("u1", WordResult(word=word, language="IT", status=StatusEnum.NEW, testResults=[], lastTest=last_test),
+                     allow_overwrite=True)
+
+
+def pooled_words() -> list[str]:
+    return sorted(c["word"] for c in dynamo.get_pooled_challenges("u1", "IT"))
+
+
+def test_refill_fills_up_to_the_depth_with_due_words(pool):
+    save_due("cane")
+    save_due("gatto")
+    save_due("topo")
+    save_due("sedia", due=False)
+
+    assert challenge_service.refill_challenge_pool("u1", "IT", "validate") == 2
+    assert len(pooled_words()) == 2 and "sedia" not in pooled_words()
+    assert challenge_service.refill_challenge_pool("u1", "IT", "validate") == 0
+
+
+def test_refill_on_a_disabled_trigger_does_nothing(pool, monkeypatch):
+    save_due("cane")
+    monkeypatch.setattr(challenge_service, "CHALLENGE_POOL_REFILL_ON", {"schedule"})
+    assert challenge_service.refill_challenge_pool("u1", "IT", "save") == 0
+    assert not challenge_service.pool_needs_refill("u1", "IT", "save")
+
+
+def test_next_test_claims_a_pooled_challenge(pool):
+    save_due("cane")
+    challenge_service.refill_challenge_pool("u1", "IT", "schedule")
+    pooled = dynamo.get_pooled_challenges("u1", "IT")[0]
+
+    challenge = challenge_service.get_next_test("u1", "IT")
+    assert challenge.id == pooled["challenge_id"]
+    assert pooled_words() == []
+    live = dynamo.load_challenge_result("u1", challenge.id)
+    assert "pooled" not in live and live["ttl"] <= time.time() + 3600
+
+
+def test_challenges_of_words_no_longer_due_are_not_handed_out(pool):
+    save_due("cane")
+    challenge_service.refill_challenge_pool("u1", "IT", "schedule")
+    save_due("gatto")
+    # cane was tested since, its pooled challenge is stale
+    dynamo.save_word("u1", WordResult(word="cane", language="IT", status=StatusEnum.NEW, testResults=[True],
+                                      lastTest=datetime.now()), allow_overwrite=True)
+
+    challenge = challenge_service.get_next_test("u1", "IT")
+    assert dynamo.load_challenge_result("u1", challenge.id)["word"] == "gatto"
+    assert pooled_words() == ["cane"]
+
+
+def test_a_claimed_challenge_is_only_handed_out_once(pool):
+    save_due("cane")
+    challenge_service.refill_challenge_pool("u1", "IT", "schedule")
+    challenge_id = dynamo.get_pooled_challenges("u1", "IT")[0]["challenge_id"]
+
+    assert dynamo.claim_pooled_challenge("u1", challenge_id)
+    assert not dynamo.claim_pooled_challenge("u1", challenge_id)
+
+
+def test_lost_claim_race_falls_back_to_the_next_candidate(pool, monkeypatch):
+    save_due("cane")
+    save_due("gatto")
+    challenge_service.refill_challenge_pool("u1", "IT", "schedule")
+    claim = dynamo.claim_pooled_challenge
+    attempts = []
+
+    def claim_losing_first(user_id: str, challenge_id: str) -> bool:
+        attempts.append(challenge_id)
+        if len(attempts) == 1:
+            # Another request claims it first
+            claim(user_id, challenge_id)
+            return False
+        return claim(user_id, challenge_id)
+
+    monkeypatch.setattr(challenge_service.db_service, "claim_pooled_challenge", claim_losing_first)
+    challenge = challenge_service.get_next_test("u1", "IT")
+    assert len(attempts) == 2 and challenge.id == attempts[1]
+
+
+def test_expired_challenges_are_ignored_and_regenerated(pool):
+    save_due("cane")
+    challenge_service.refill_challenge_pool("u1", "IT", "schedule")
+    challenge_id = dynamo.get_pooled_challenges("u1", "IT")[0]["challenge_id"]
+    # DynamoDB TTL deletes lazily, an expired item may still be read
+    dynamo.challenge_table.update_item(Key={"user_id": "u1", "challenge_id": challenge_id},
+                                       UpdateExpression="SET #ttl = :ttl", ExpressionAttributeNames={"#ttl": "ttl"},
+                                       ExpressionAttributeValues={":ttl": int(time.time()) - 1})
+
+    assert pooled_words() == []
+    assert challenge_service.pool_needs_refill("u1", "IT", "validate")
+    assert challenge_service.refill_challenge_pool("u1", "IT", "validate") == 1
+    assert dynamo.get_pooled_challenges("u1", "IT")[0]["challenge_id"] != challenge_id
+
+
+def test_refill_is_only_needed_below_the_depth(pool):
+    save_due("cane")
+    save_due("gatto")
+    assert challenge_service.pool_needs_refill("u1", "IT", "validate")
+
+    challenge_service.refill_challenge_pool("u1", "IT", "validate")
+    assert not challenge_service.pool_needs_refill("u1", "IT", "validate")
+
+    challenge_service.get_next_test("u1", "IT")
+    assert challenge_service.pool_needs_refill("u1", "IT", "validate")
+
+
+def test_no_invocation_is_dispatched_for_a_full_pool(pool, monkeypatch):
+    dispatched = []
+    monkeypatch.setattr(main.tasks, "dispatch", lambda task, **params: dispatched.append(params) or True)
+    save_due("cane")
+    save_due("gatto")
+
+    asyncio.run(main.refill_pool_later(BackgroundTasks(), "u1", "IT", "validate"))
+    assert dispatched == [{"user_id": "u1", "lang": "IT", "trigger": "validate"}]
+
+    challenge_service.refill_challenge_pool("u1", "IT", "validate")
+    asyncio.run(main.refill_pool_later(BackgroundTasks(), "u1", "IT", "validate"))
+    assert len(dispatched) == 1
@@ -0,0 +1,28 @@
+import importlib
+
+import pytest
+
+bedrock = importlib.import_module("bedrock_service.bedrock")
+
+
+@pytest.fixture
+def reply(monkeypatch):
+    replies = []
+    monkeypatch.setattr(bedrock, "call_bedrock_json", lambda prompt, prompt_name, cache=False, schema=None: replies[0])
+    return replies
+
+
+@pytest.mark.parametrize("parsed, expected", [
+    ({"close": True, "hint": " Pensa a un animale. "}, (True, "Pensa a un animale.")),
+    ({"close": "si", "hint": ""}, (True, None)),
+    ({"close": "no", "hint": "x"}, (False, None)),
+    ({"close": False}, (False, None)),
+    ({"close": True, "hint": ["not", "a", "string"]}, (True, None)),
+    (None, (False, None)),
+    ([{"close": True}], (False, None)),
+    ("close", (False, None)),
+    (42, (False, None)),
+])
+def test_reply_shapes(reply, parsed, expected):
+    reply.append(parsed)
+    assert bedrock.check_challenge("Un animale che abbaia", "gatto", "cane") == expected
@@ -0,0 +1,25 @@
+import pytest
+
+from conjugation_service import conjugate_regular
+
+
+@pytest.mark.parametrize("verb", [
+    "godere", "vivere", "cadere", "vedere", "andare", "dare", "ridare", "stare", "sottostare", "fare",
+    "rifare", "rinviare", "deviare", "venire", "morire",
+])
+def test_irregular_verbs_are_left_to_the_model(verb):
+    assert conjugate_regular(verb) is None
+
+
+@pytest.mark.parametrize("verb, tense, forms", [
+    ("parlare", "Futuro Semplice", ["io parlerò", "tu parlerai", "lui/lei parlerà", "noi parleremo", "voi parlerete", "loro parleranno"]),
+    ("cercare", "Presente", ["io cerco", "tu cerchi", "lui/lei cerca", "noi cerchiamo", "voi cercate", "loro cercano"]),
+    ("mangiare", "Futuro Semplice", ["io mangerò", "tu mangerai", "lui/lei mangerà", "noi mangeremo", "voi mangerete", "loro mangeranno"]),
+    ("studiare", "Presente", ["io studio", "tu studi", "lui/lei studia", "noi studiamo", "voi studiate", "loro studiano"]),
+    ("credere", "Condizionale Presente", ["io crederei", "tu crederesti", "lui/lei crederebbe", "noi crederemmo", "voi credereste", "loro crederebbero"]),
+    ("dormire", "Presente", ["io dormo", "tu dormi", "lui/lei dorme", "noi dormiamo", "voi dormite", "loro dormono"]),
+    ("finire", "Presente", ["io finisco", "tu finisci", "lui/lei finisce", "noi finiamo", "voi finite", "loro finiscono"]),
+])
+def test_regular_forms(verb, tense, forms):
+    assert conjugate_regular(verb)[tense] == forms
+
@@ -0,0 +1,77 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from db_service import dynamo
+from db_service.dynamo import decode_cursor, encode_cursor
+from models import WordResult
+
+
+def raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("ascii")
+
+
+def test_round_trip():
+    key = {"user_id": "u1", "word": "perché"}
+    assert decode_cursor(encode_cursor(key), "u1") == key
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    "bm90IGpzb24",                        # valid base64, not JSON
+    "w6k",                                # valid base64, not UTF-8
+    "perché",                             # not ASCII
+    raw_cursor(["u1", "casa"]),
+    raw_cursor(42),
+    raw_cursor({"user_id": "u1"}),
+    raw_cursor({"user_id": "u1", "word": 7}),
+    raw_cursor({"user_id": "u1", "word": "casa", "lang": "IT"}),
+    raw_cursor({"user_id": "u2", "word": "casa"}),
+])
+def test_invalid_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, "u1")
+    assert e.value.status_code == 400
+
+
+def save_words(user_id: str, words: list[str]):
+    for word in words:
+        dynamo.save_word(user_id, WordResult(word=word, language="IT"))
+
+
+def list_all(user_id: str, limit: int, **filters) -> list[list[str]]:
+    pages = []
+    cursor = None
+    while True:
+        result = dynamo.get_words(user_id, "IT", limit=limit, cursor=cursor, **filters)
+        pages.append([w.word for w in result.words])
+        cursor = result.cursor
+        if cursor is None:
+            return pages
+
+
+def test_pages_follow_the_cursor(dynamodb):
+    save_words("u1", ["a1", "a2", "a3", "a4", "a5"])
+    assert list_all("u1", 2) == [["a1", "a2"], ["a3", "a4"], ["a5"]]
+
+
+def test_no_cursor_when_the_last_page_is_full(dynamodb):
+    save_words("u1", ["a1", "a2", "a3", "a4"])
+    assert list_all("u1", 2) == [["a1", "a2"], ["a3", "a4"]]
+    assert list_all("u1", 4) == [["a1", "a2", "a3", "a4"]]
+
+
+def test_default_limit_is_one_page(dynamodb):
+    with dynamo.vocabulary_table.batch_writer() as batch:
+        for i in range(dynamo.WORDS_PAGE_SIZE + 1):
+            batch.put_item(Item={"user_id": "u1", "word": f"w{i:04}", "lang": "IT", "status": "NEW", "test_results": []})
+    result = dynamo.get_words("u1", "IT")
+    assert len(result.words) == dynamo.WORDS_PAGE_SIZE
+    assert dynamo.get_words("u1", "IT", cursor=result.cursor).words[0].word == f"w{dynamo.WORDS_PAGE_SIZE:04}"
+
+
+def test_filtered_pages(dynamodb):
+    save_words("u1", ["ab", "b1", "ab2", "b2", "ab3"])
+    assert list_all("u1", 2, contains="a") == [["ab", "ab2"], ["ab3"]]
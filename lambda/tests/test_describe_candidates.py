@@ -0,0 +1,51 @@
+import importlib
+
+import pytest
+
+from bedrock_service import fake
+
+bedrock = importlib.import_module("bedrock_service.bedrock")
+
+
+class CountingBedrock(fake.FakeBedrockClient):
+    def __init__(self):
+        self.calls = 0
+
+    def invoke_model(self, modelId: str, body: bytes, **kwargs) -> dict:
+        self.calls += 1
+        return super().invoke_model(modelId, body, **kwargs)
+
+
+@pytest.fixture
+def model(monkeypatch):
+    monkeypatch.setattr(fake, "FAKE_FIRST_TOKEN_DELAY", 0)
+    monkeypatch.setattr(fake, "FAKE_CHUNK_DELAY", 0)
+    monkeypatch.setattr(bedrock, "describe_candidates", bedrock.LRUCache(maxsize=16, ttl=3600))
+    client = CountingBedrock()
+    monkeypatch.setattr(bedrock, "bedrock", client)
+    return client
+
+
+def test_follow_up_is_served_from_the_candidates_of_the_same_user(model):
+    assert bedrock.describe_word("Una persona che arrossisce", [], "u1").word == "timido"
+    assert bedrock.describe_word("una persona  che arrossisce", ["timido"], "u1").word == "riservato"
+    assert model.calls == 1
+
+
+def test_first_requests_always_ask_the_model(model):
+    bedrock.describe_word("Una persona che arrossisce", [], "u1")
+    bedrock.describe_word("Una persona che arrossisce", [], "u1")
+    assert model.calls == 2
+
+
+def test_candidates_are_not_shared_between_users(model):
+    bedrock.describe_word("Una persona che arrossisce", [], "u1")
+    bedrock.describe_word("Una persona che arrossisce", ["timido"], "u2")
+    assert model.calls == 2
+
+
+def test_nothing_is_cached_without_a_user(model):
+    bedrock.describe_word("Una persona che arrossisce", [], None)
+    bedrock.describe_word("Una persona che arrossisce", ["timido"], None)
+    assert model.calls == 2
+    assert len(bedrock.describe_candidates) == 0
@@ -0,0 +1,83 @@
+import time
+from datetime import datetime
+
+import challenge_service
+from db_service import dynamo
+from models import StatusEnum, WordResult
+
+DAY = 86400
+
+
+def save(word: str, status: StatusEnum, tested_days_ago: float, lang: str = "IT"):
+    # Created NEW first (a test result can only be saved on an existing word)
+    if dynamo.get_word("u1", lang, word) is None:
+        dynamo.save_word("u1", WordResult(word=word, language=lang))
+    last_test = datetime.fromtimestamp(time.time() - tested_days_ago * DAY)
+    dynamo.save_word("u1", WordResult(word=word, language=lang, status=status, testResults=[True], lastTest=last_test),
+                     allow_overwrite=True)
+
+
+def test_only_words_due_now_in_the_language_are_returned(dynamodb):
+    save("cane", StatusEnum.LEARNED, 4)      # due a day ago
+    save("gatto", StatusEnum.KNOWN, 1)       # due in 6 days
+    save("topo", StatusEnum.NEW, 2)          # due a day ago
+    save("perro", StatusEnum.NEW, 2, "ES")
+
+    words = dynamo.get_testable_words("u1", "IT")
+    assert sorted(w.word for w in words) == ["cane", "topo"]
+    assert all(w.language == "IT" for w in words)
+
+
+def test_next_due_at_is_the_earliest_future_due_time(dynamodb):
+    save("cane", StatusEnum.LEARNED, 4)
+    save("gatto", StatusEnum.KNOWN, 1)
+    save("topo", StatusEnum.MASTERED, 1)
+
+    gatto = dynamo.vocabulary_table.get_item(Key={"user_id": "u1", "word": "gatto"})["Item"]
+    assert dynamo.get_next_due_at("u1", "IT") == int(gatto["due_at"])
+
+
+def test_statistics_count_due_words_per_status(dynamodb):
+    save("cane", StatusEnum.LEARNED, 4)
+    save("topo", StatusEnum.NEW, 2)
+    save("gatto", StatusEnum.KNOWN, 1)
+
+    statistics = challenge_service.get_statistics("u1", "IT")
+    assert statistics.available[StatusEnum.LEARNED] == 1
+    assert statistics.available[StatusEnum.NEW] == 1
+    assert statistics.available[StatusEnum.KNOWN] == 0
+    assert statistics.total[StatusEnum.KNOWN] == 1
+
+
+def test_future_lower_bound_skips_the_due_query(dynamodb, monkeypatch):
+    save("gatto", StatusEnum.KNOWN, 1)
+    dynamo.reconcile_statistics("u1", "IT")
+
+    def get_testable_words(user_id: str, lang: str):
+        raise AssertionError("queried the due index")
+
+    monkeypatch.setattr(challenge_service.db_service, "get_testable_words", get_testable_words)
+
+    assert challenge_service.get_next_test("u1", "IT") is None
+    assert sum(challenge_service.get_statistics("u1", "IT").available.values()) == 0
+
+
+def test_stale_lower_bound_moves_to_the_real_next_due_time(dynamodb):
+    save("cane", StatusEnum.LEARNED, 4)
+    dynamo.reconcile_statistics("u1", "IT")
+    # The due word was tested since, the stored bound is now in the past
+    save("cane", StatusEnum.LEARNED, 0)
+    cane = dynamo.vocabulary_table.get_item(Key={"user_id": "u1", "word": "cane"})["Item"]
+    stale = dynamo.get_statistics("u1", "IT")["next_due_at"]
+    assert stale < time.time()
+
+    assert challenge_service.get_next_test("u1", "IT") is None
+    assert dynamo.get_statistics("u1", "IT")["next_due_at"] == int(cane["due_at"])
+
+
+def test_stale_lower_bound_is_removed_without_future_words(dynamodb):
+    dynamo.reconcile_statistics("u1", "IT")
+    dynamo.adjust_statistics("u1", "IT", {}, int(time.time()) - DAY)
+
+    assert challenge_service.get_next_test("u1", "IT") is None
+    assert dynamo.get_statistics("u1", "IT")["next_due_at"] is None
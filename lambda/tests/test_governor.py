@@ -0,0 +1,101 @@
+import sys
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from bedrock_service.governor import BedrockGovernor, ModelUnavailableError
+
+# The package re-exports the governor instance under the module's name
+governor_module = sys.modules[BedrockGovernor.__module__]
+
+
+@pytest.fixture
+def governor(monkeypatch):
+    monkeypatch.setattr(governor_module, "BEDROCK_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(governor_module, "BEDROCK_BACKOFF_BASE", 0)
+    monkeypatch.setattr(governor_module, "BEDROCK_MAX_WAIT", 0.01)
+    monkeypatch.setattr(governor_module, "BEDROCK_BREAKER_COOLDOWN", 30)
+    return BedrockGovernor()
+
+
+def open_circuit(governor: BedrockGovernor, cooled_down: bool = True):
+    governor._state = "open"
+    governor._opened_at = time.monotonic() - (31 if cooled_down else 0)
+
+
+def client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "InvokeModel")
+
+
+def fail(code: str):
+    def call():
+        raise client_error(code)
+    return call
+
+
+def test_open_circuit_rejects_calls(governor):
+    open_circuit(governor, cooled_down=False)
+    with pytest.raises(ModelUnavailableError):
+        governor.invoke(lambda: "ok")
+
+
+def test_successful_trial_closes_circuit(governor):
+    open_circuit(governor)
+    assert governor.invoke(lambda: "ok") == "ok"
+    assert governor.snapshot()["state"] == "closed"
+
+
+def test_failed_trial_reopens_circuit(governor):
+    open_circuit(governor)
+    with pytest.raises(ClientError):
+        governor.invoke(fail("ThrottlingException"))
+    assert governor.snapshot()["state"] == "open"
+    with pytest.raises(ModelUnavailableError):
+        governor.invoke(lambda: "ok")
+
+
+def test_trial_without_token_is_released(governor, monkeypatch):
+    monkeypatch.setattr(governor_module, "BEDROCK_RATE_PER_SECOND", 0.001)
+    open_circuit(governor)
+    governor._tokens = 0
+    governor._refilled_at = time.monotonic()
+    with pytest.raises(ModelUnavailableError):
+        governor.invoke(lambda: "ok")
+
+    # The trial slot is free again - the next call probes the model instead of being rejected
+    governor._tokens = 1
+    assert governor.invoke(lambda: "ok") == "ok"
+    assert governor.snapshot()["state"] == "closed"
+
+
+def test_trial_without_slot_is_released(governor):
+    open_circuit(governor)
+    governor._semaphore = type(governor._semaphore)(1)
+    governor._semaphore.acquire()
+    with pytest.raises(ModelUnavailableError):
+        governor.invoke(lambda: "ok")
+
+    governor._semaphore.release()
+    assert governor.invoke(lambda: "ok") == "ok"
+
+
+def test_trial_with_caller_error_is_released(governor):
+    open_circuit(governor)
+    with pytest.raises(ClientError):
+        governor.invoke(fail("ValidationException"))
+    assert governor.snapshot()["state"] == "half_open"
+    assert governor.invoke(lambda: "ok") == "ok"
+
+
+def test_retryable_errors_are_retried(governor):
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise client_error("ThrottlingException")
+        return "ok"
+
+    assert governor.invoke(flaky) == "ok"
+    assert governor.last_attempts() == 2
@@ -0,0 +1,43 @@
+import pytest
+
+from bedrock_service.json_repair import repair_json
+
+# Malformed replies as the models produce them -> the value they should parse to
+CORPUS = [
+    ('{"word": "timido"}', {"word": "timido"}),
+    ('```json\n{"word": "timido"}\n```', {"word": "timido"}),
+    ('```\n{"word": "timido"}', {"word": "timido"}),
+    ('Ecco la risposta: {"word": "timido"} Spero sia utile!', {"word": "timido"}),
+    ('{"words": ["timido", "schivo",],}', {"words": ["timido", "schivo"]}),
+    ("{'word': 'timido'}", {"word": "timido"}),
+    ("{'definition': 'l'amico di tutti'}", {"definition": "l'amico di tutti"}),
+    ('{“word”: “timido”}', {"word": "timido"}),
+    ('{"word": «timido»}', {"word": "timido"}),
+    ('{"example": "Ha detto "ciao" a tutti"}', {"example": 'Ha detto "ciao" a tutti'}),
+    ('{"definition": "prima riga\nseconda riga"}', {"definition": "prima riga\nseconda riga"}),
+    ('{"ok": True, "other": False, "missing": None}', {"ok": True, "other": False, "missing": None}),
+    ('{"word": "timido", "definition": "che ha paur', {"word": "timido", "definition": "che ha paur"}),
+    ('{"words": ["timido", "schivo"', {"words": ["timido", "schivo"]}),
+    ('{"meanings": [{"type": "ADJECTIVE"}, {"type": "NOUN"', {"meanings": [{"type": "ADJECTIVE"}, {"type": "NOUN"}]}),
+    ('{"word": "timido", "definition":', {"word": "timido", "definition": None}),
+    ('{"word": "perché", "translation": "why"}', {"word": "perché", "translation": "why"}),
+    ('[{"word": "timido"}, {"word": "schivo"}]', [{"word": "timido"}, {"word": "schivo"}]),
+    ('{"result": "sì"} {"result": "no"}', {"result": "sì"}),
+]
+
+
+@pytest.mark.parametrize("text, expected", CORPUS)
+def test_corpus_is_repaired(text, expected):
+    assert repair_json(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Non so la risposta.",
+    '{"a": è}',
+    '{"a": città}',
+    '{"a": si}',
+    '{"a": 1 2}',
+])
+def test_unrepairable_text_raises_value_error(text):
+    with pytest.raises(ValueError):
+        repair_json(text)
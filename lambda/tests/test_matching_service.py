@@ -0,0 +1,76 @@
+import pytest
+
+from matching_service import MatchDecision, match_answer
+from models import WordTypeEnum
+
+NOUN = {WordTypeEnum.NOUN}
+VERB = {WordTypeEnum.VERB}
+ADJECTIVE = {WordTypeEnum.ADJECTIVE}
+
+
+@pytest.mark.parametrize("guess, word", [
+    ("caso", "casa"), ("porto", "porta"), ("pasto", "pasta"), ("testo", "testa"), ("foglio", "foglia"),
+    ("casa", "caso"), ("porta", "porto"), ("pasta", "pasto"), ("testa", "testo"), ("foglia", "foglio"),
+])
+def test_noun_minimal_pairs_are_not_matched(guess, word):
+    assert match_answer(guess, word, NOUN) != MatchDecision.MATCH
+
+
+@pytest.mark.parametrize("guess, word", [
+    ("sposare", "spostare"), ("spostare", "sposare"), ("cantare", "contare"), ("contare", "cantare"),
+    ("pesare", "pensare"), ("pensare", "pesare"),
+])
+def test_one_letter_apart_verbs_go_to_the_model(guess, word):
+    assert match_answer(guess, word, VERB) == MatchDecision.AMBIGUOUS
+
+
+def test_typo_goes_to_the_model():
+    assert match_answer("affascinate", "affascinante", ADJECTIVE) == MatchDecision.AMBIGUOUS
+
+
+@pytest.mark.parametrize("guess, word, types", [
+    ("Casa", "casa", NOUN),
+    ("la casa", "casa", NOUN),
+    ("perche", "perché", {WordTypeEnum.OTHER}),
+    ("affascinanti", "affascinante", ADJECTIVE),
+    ("timida", "timido", ADJECTIVE),
+    ("bianche", "bianco", ADJECTIVE),
+    ("parlo", "parlare", VERB),
+    ("parlavamo", "parlare", VERB),
+    ("parlerò", "parlare", VERB),
+    ("cercherò", "cercare", VERB),
+    ("mangiamo", "mangiare", VERB),
+    ("creduto", "credere", VERB),
+    ("finisco", "finire", VERB),
+    ("dormito", "dormire", VERB),
+])
+def test_forms_of_the_word_match(guess, word, types):
+    assert match_answer(guess, word, types) == MatchDecision.MATCH
+
+
+@pytest.mark.parametrize("guess, word", [
+    ("credito", "credere"), ("parlito", "parlare"), ("parlirò", "parlare"), ("parlevo", "parlare"),
+    ("finato", "finire"), ("finerò", "finire"), ("cercerò", "cercare"), ("mangierò", "mangiare"),
+])
+def test_endings_of_another_conjugation_are_not_matched(guess, word):
+    assert match_answer(guess, word, VERB) != MatchDecision.MATCH
+
+
+@pytest.mark.parametrize("guess, word, types", [
+    ("gatto", "cane", NOUN),
+    ("contento", "felice", ADJECTIVE),
+    ("dormire", "parlare", VERB),
+    ("tavolo", "sedia", NOUN),
+])
+def test_other_words_are_rejected_without_the_model(guess, word, types):
+    assert match_answer(guess, word, types) == MatchDecision.NO_MATCH
+
+
+def test_adjective_inflection_needs_the_type():
+    assert match_answer("timida", "timido", NOUN) == MatchDecision.AMBIGUOUS
+    assert match_answer("timida", "timido") == MatchDecision.AMBIGUOUS
+
+
+@pytest.mark.parametrize("guess", ["x", "123", "?!"])
+def test_non_words_are_rejected(guess):
+    assert match_answer(guess, "casa", NOUN) == MatchDecision.NO_MATCH
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from db_service import dynamo
+from utils import aws
+
+
+@pytest.fixture
+def words(dynamodb, monkeypatch):
+    monkeypatch.setattr(dynamo, "PURGE_PAGE_SIZE", 30)
+    monkeypatch.setattr(dynamo.time, "sleep", lambda seconds: None)
+    with dynamo.vocabulary_table.batch_writer() as batch:
+        for i in range(70):
+            batch.put_item(Item={"user_id": "u1", "word": f"w{i:03}", "lang": "IT", "status": "NEW"})
+        batch.put_item(Item={"user_id": "u1", "word": "zorro", "lang": "ES", "status": "NEW"})
+        batch.put_item(Item={"user_id": "u2", "word": "w000", "lang": "IT", "status": "NEW"})
+    dynamo.reconcile_statistics("u1", "IT")
+
+
+def remaining(user_id: str = "u1") -> list[str]:
+    items = dynamo.vocabulary_table.query(KeyConditionExpression=dynamo.Key("user_id").eq(user_id))["Items"]
+    return sorted(item["word"] for item in items)
+
+
+def statistics_item() -> dict | None:
+    return dynamo.statistics_table.get_item(Key={"user_id": "u1", "lang": "IT"}).get("Item")
+
+
+def unprocessed_first(monkeypatch, times: int) -> list:
+    # Every batch comes back with its first item unprocessed, the given number of times
+    resource = aws.resource("dynamodb")
+    batch_write_item = resource.batch_write_item
+    calls = []
+
+    def flaky(RequestItems: dict):
+        calls.append(RequestItems)
+        if len(calls) > times:
+            return batch_write_item(RequestItems=RequestItems)
+        requests = RequestItems[dynamo.vocabulary_table.name]
+        if len(requests) > 1:
+            batch_write_item(RequestItems={dynamo.vocabulary_table.name: requests[1:]})
+        return {"UnprocessedItems": {dynamo.vocabulary_table.name: requests[:1]}}
+
+    monkeypatch.setattr(resource, "batch_write_item", flaky)
+    return calls
+
+
+def test_purge_deletes_all_words_of_the_language_and_the_statistics(words):
+    result = dynamo.purge_words("u1", "IT")
+
+    assert result == {"deleted": 70, "complete": True, "cursor": None}
+    assert remaining() == ["zorro"]
+    assert remaining("u2") == ["w000"]
+    assert statistics_item() is None
+    assert dynamo.get_statistics("u1", "IT")["counts"]["NEW"] == 0
+
+
+def test_unprocessed_items_are_retried(words, monkeypatch):
+    calls = unprocessed_first(monkeypatch, 2)
+
+    assert dynamo.purge_words("u1", "IT")["deleted"] == 70
+    assert remaining() == ["zorro"]
+    assert len(calls) == 5 + 2  # 25 + 5, 25 + 5, 10 words per page, two batches retried once
+
+
+def test_gives_up_after_max_attempts(words, monkeypatch):
+    monkeypatch.setattr(dynamo, "PURGE_MAX_ATTEMPTS", 2)
+    unprocessed_first(monkeypatch, 1000)
+
+    with pytest.raises(HTTPException) as e:
+        dynamo.purge_words("u1", "IT")
+    assert e.value.status_code == 503
+    # Not complete, the counters stay
+    assert statistics_item() is not None
+
+
+def test_deadline_stops_between_pages_with_a_cursor(words):
+    first = dynamo.purge_words("u1", "IT", deadline=time.time() - 1)
+    assert first["deleted"] == 30 and not first["complete"]
+    assert first["cursor"] is not None
+    assert len(remaining()) == 41
+    assert statistics_item() is not None
+
+    rest = dynamo.purge_words("u1", "IT", cursor=first["cursor"])
+    assert rest["deleted"] == 40 and rest["complete"]
+    assert remaining() == ["zorro"]
+    assert statistics_item() is None
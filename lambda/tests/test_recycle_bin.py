@@ -0,0 +1,54 @@
+import pytest
+from fastapi import HTTPException
+
+from db_service import dynamo
+from models import StatusEnum, WordResult
+
+
+def counts(user_id: str = "u1", lang: str = "IT") -> dict:
+    return dynamo.get_statistics(user_id, lang)["counts"]
+
+
+def test_delete_then_undelete_moves_the_word_and_the_counters(dynamodb):
+    dynamo.reconcile_statistics("u1", "IT")
+    dynamo.save_word("u1", WordResult(word="Cane", language="IT"))
+    assert counts()[StatusEnum.NEW] == 1
+
+    dynamo.delete_word("u1", "IT", "cane")
+    assert dynamo.vocabulary_table.get_item(Key={"user_id": "u1", "word": "cane"}).get("Item") is None
+    binned = dynamo.recycle_bin_table.get_item(Key={"user_id": "u1", "word": "cane"})["Item"]
+    assert binned["status"] == StatusEnum.NEW and binned["ttl"] > 0
+    assert counts()[StatusEnum.NEW] == 0
+
+    dynamo.undelete_word("u1", "IT", "cane")
+    restored = dynamo.vocabulary_table.get_item(Key={"user_id": "u1", "word": "cane"})["Item"]
+    assert restored["lang"] == "IT" and "ttl" not in restored
+    assert dynamo.recycle_bin_table.get_item(Key={"user_id": "u1", "word": "cane"}).get("Item") is None
+    assert counts()[StatusEnum.NEW] == 1
+    assert dynamo.get_statistics("u1", "IT")["next_due_at"] == int(restored["due_at"])
+
+
+def test_delete_without_statistics_item_still_moves_the_word(dynamodb):
+    dynamo.save_word("u1", WordResult(word="cane", language="IT"))
+
+    dynamo.delete_word("u1", "IT", "cane")
+    assert dynamo.recycle_bin_table.get_item(Key={"user_id": "u1", "word": "cane"}).get("Item") is not None
+    # No partial item was created, the counters are rebuilt from the words
+    assert dynamo.statistics_table.get_item(Key={"user_id": "u1", "lang": "IT"}).get("Item") is None
+    assert counts()[StatusEnum.NEW] == 0
+
+
+def test_undelete_over_an_existing_word_is_a_conflict(dynamodb):
+    dynamo.save_word("u1", WordResult(word="cane", language="IT"))
+    dynamo.delete_word("u1", "IT", "cane")
+    dynamo.save_word("u1", WordResult(word="cane", language="IT"))
+
+    with pytest.raises(HTTPException) as e:
+        dynamo.undelete_word("u1", "IT", "cane")
+    assert e.value.status_code == 409
+
+
+def test_delete_of_a_missing_word_is_not_found(dynamodb):
+    with pytest.raises(HTTPException) as e:
+        dynamo.delete_word("u1", "IT", "cane")
+    assert e.value.status_code == 404
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+from fastapi import HTTPException
+
+import main
+from utils import concurrency
+
+
+def collect(events, to_result=lambda result: result) -> list[tuple[str, object]]:
+    async def read():
+        return [chunk async for chunk in main.sse_stream(events, to_result)]
+
+    parsed = []
+    for chunk in asyncio.run(read()):
+        event, data = chunk.strip().split("\n")
+        parsed.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return parsed
+
+
+def test_every_step_runs_within_the_io_limiter():
+    in_flight = []
+
+    def events():
+        in_flight.append(concurrency.in_flight())
+        yield "delta", "Una persona "
+        in_flight.append(concurrency.in_flight())
+        yield "result", None
+
+    def to_result(result):
+        in_flight.append(concurrency.in_flight())
+        return result
+
+    assert collect(events(), to_result) == [("delta", {"text": "Una persona "}), ("result", None)]
+    assert in_flight == [1, 1, 1]
+
+
+def test_errors_end_the_stream_with_an_error_event():
+    closed = []
+
+    def events():
+        try:
+            yield "delta", "Una"
+            raise HTTPException(status_code=503, detail="Model unavailable")
+        finally:
+            closed.append(True)
+
+    assert collect(events()) == [("delta", {"text": "Una"}), ("error", {"detail": "Model unavailable"})]
+    assert closed == [True]
+
+
+def test_generator_is_closed_when_the_client_goes_away():
+    closed = []
+
+    def events():
+        try:
+            yield "delta", "Una"
+            yield "delta", " persona"
+        finally:
+            closed.append(True)
+
+    async def read_first():
+        stream = main.sse_stream(events(), lambda result: result)
+        await stream.__anext__()
+        await stream.aclose()
+
+    asyncio.run(read_first())
+    assert closed == [True]
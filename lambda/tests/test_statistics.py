@@ -0,0 +1,104 @@
+import time
+from datetime import datetime
+
+from db_service import dynamo
+from models import StatusEnum, WordResult
+
+
+def statistics_item(user_id: str = "u1", lang: str = "IT") -> dict | None:
+    return dynamo.statistics_table.get_item(Key={"user_id": user_id, "lang": lang}).get("Item")
+
+
+def save(word: str, status: StatusEnum = None, last_test: int = None):
+    if status is None:
+        dynamo.save_word("u1", WordResult(word=word, language="IT"))
+    else:
+        dynamo.save_word("u1", WordResult(word=word, language="IT", status=status, testResults=[True],
+                                          lastTest=datetime.fromtimestamp(last_test)), allow_overwrite=True)
+
+
+def counts() -> dict:
+    return dynamo.get_statistics("u1", "IT")["counts"]
+
+
+def test_missing_item_is_rebuilt_from_the_words(dynamodb):
+    save("cane")
+    save("gatto")
+    assert statistics_item() is None
+
+    statistics = dynamo.get_statistics("u1", "IT")
+    assert statistics["counts"][StatusEnum.NEW] == 2
+    item = statistics_item()
+    assert item["count_NEW"] == 2 and "updated_at" in item
+
+
+def test_partial_item_is_rebuilt(dynamodb):
+    # Left by counter updates from before they required a complete item
+    dynamo.statistics_table.put_item(Item={"user_id": "u1", "lang": "IT", "count_NEW": 7})
+    save("cane")
+    assert statistics_item()["count_NEW"] == 7
+
+    assert counts()[StatusEnum.NEW] == 1
+    assert "updated_at" in statistics_item()
+
+
+def test_counter_updates_never_create_an_item(dynamodb):
+    dynamo.adjust_statistics("u1", "IT", {StatusEnum.NEW: 1}, 100)
+    dynamo.set_next_due_at("u1", "IT", 100)
+    assert statistics_item() is None
+
+
+def test_deltas_of_save_status_change_delete_undelete_and_reset(dynamodb):
+    dynamo.reconcile_statistics("u1", "IT")
+    save("cane")
+    save("gatto")
+    assert counts() == {StatusEnum.NEW: 2, StatusEnum.LEARNED: 0, StatusEnum.KNOWN: 0, StatusEnum.MASTERED: 0}
+
+    save("cane", StatusEnum.LEARNED, int(time.time()))
+    assert counts()[StatusEnum.NEW] == 1 and counts()[StatusEnum.LEARNED] == 1
+
+    dynamo.delete_word("u1", "IT", "cane")
+    assert counts()[StatusEnum.LEARNED] == 0
+
+    dynamo.undelete_word("u1", "IT", "cane")
+    assert counts()[StatusEnum.LEARNED] == 1
+
+    dynamo.reset_word("u1", "IT", "cane")
+    assert counts()[StatusEnum.NEW] == 2 and counts()[StatusEnum.LEARNED] == 0
+
+    # A NEW word stays NEW
+    dynamo.reset_word("u1", "IT", "gatto")
+    assert counts()[StatusEnum.NEW] == 2
+
+    assert statistics_item()["count_NEW"] == dynamo.reconcile_statistics("u1", "IT")["counts"][StatusEnum.NEW]
+
+
+def test_next_due_at_is_only_moved_earlier(dynamodb):
+    dynamo.reconcile_statistics("u1", "IT")
+    dynamo.adjust_statistics("u1", "IT", {}, 2000)
+    assert dynamo.get_statistics("u1", "IT")["next_due_at"] == 2000
+
+    dynamo.adjust_statistics("u1", "IT", {}, 3000)
+    assert dynamo.get_statistics("u1", "IT")["next_due_at"] == 2000
+
+    dynamo.adjust_statistics("u1", "IT", {}, 1000)
+    assert dynamo.get_statistics("u1", "IT")["next_due_at"] == 1000
+
+
+def test_reconcile_takes_the_earliest_due_at(dynamodb):
+    for word in ("cane", "gatto", "topo"):
+        save(word)
+    save("gatto", StatusEnum.KNOWN, 1_000_000)
+    save("topo", StatusEnum.LEARNED, 1_000_000)
+
+    statistics = dynamo.reconcile_statistics("u1", "IT")
+    assert statistics["next_due_at"] == StatusEnum.LEARNED.due_at(1_000_000)
+    assert statistics["counts"][StatusEnum.KNOWN] == 1
+
+
+def test_languages_have_separate_counters(dynamodb):
+    dynamo.reconcile_statistics("u1", "IT")
+    dynamo.reconcile_statistics("u1", "ES")
+    save("cane")
+    assert dynamo.get_statistics("u1", "ES")["counts"][StatusEnum.NEW] == 0
+    assert counts()[StatusEnum.NEW] == 1
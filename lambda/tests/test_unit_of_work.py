@@ -0,0 +1,103 @@
+import asyncio
+import contextvars
+import importlib
+
+from db_service import dynamo
+from models import WordResult
+
+# The package re-exports the unit_of_work context manager under the module's name
+unit_of_work = importlib.import_module("db_service.unit_of_work")
+
+
+def test_reads_are_served_once_per_request(dynamodb):
+    dynamo.save_word("u1", WordResult(word="cane", language="IT"))
+
+    with unit_of_work.unit_of_work() as unit:
+        dynamo.get_word("u1", "IT", "cane")
+        dynamo.get_word("u1", "IT", "Cane")
+    assert unit.reads[dynamo.vocabulary_table.name] == 1
+    assert unit.hits[dynamo.vocabulary_table.name] == 1
+
+
+def test_items_are_deep_copies():
+    with unit_of_work.unit_of_work():
+        item = {"word": "cane", "test_results": [True]}
+        unit_of_work.remember("table", ("u1", "cane"), item)
+        item["test_results"].append(False)
+
+        first = unit_of_work.known("table", ("u1", "cane"))
+        assert first["test_results"] == [True]
+        first["test_results"].append(False)
+        assert unit_of_work.known("table", ("u1", "cane"))["test_results"] == [True]
+
+
+def test_read_through_copies_are_isolated():
+    with unit_of_work.unit_of_work():
+        loaded = unit_of_work.read_through("table", ("u1", "cane"), lambda: {"meanings": [{"translation": "dog"}]})
+        loaded["meanings"][0]["translation"] = "cat"
+        again = unit_of_work.read_through("table", ("u1", "cane"), lambda: None)
+        assert again["meanings"][0]["translation"] == "dog"
+
+
+def test_deleted_item_is_known_missing(dynamodb):
+    dynamo.save_word("u1", WordResult(word="cane", language="IT"))
+
+    with unit_of_work.unit_of_work() as unit:
+        assert dynamo.get_word("u1", "IT", "cane") is not None
+        dynamo.delete_word("u1", "IT", "cane")
+        assert unit_of_work.known(dynamo.vocabulary_table.name, ("u1", "cane", "IT")) is unit_of_work.MISSING
+        assert dynamo.get_word("u1", "IT", "cane") is None
+
+        # The recycle bin copy is known too, and the restored word after that
+        dynamo.undelete_word("u1", "IT", "cane")
+        assert dynamo.get_word("u1", "IT", "cane").word == "cane"
+    assert unit.reads[dynamo.vocabulary_table.name] == 1
+    assert unit.reads[dynamo.recycle_bin_table.name] == 0
+
+
+def test_remember_none_then_write_is_seen():
+    with unit_of_work.unit_of_work():
+        unit_of_work.remember("table", ("u1", "cane"), None)
+        assert unit_of_work.read_through("table", ("u1", "cane"), lambda: {"word": "stale"}) is None
+        unit_of_work.remember("table", ("u1", "cane"), {"word": "cane"})
+        assert unit_of_work.known("table", ("u1", "cane")) == {"word": "cane"}
+        unit_of_work.forget("table", ("u1", "cane"))
+        assert unit_of_work.known("table", ("u1", "cane")) is None
+
+
+def test_nothing_is_kept_outside_a_unit_of_work():
+    unit_of_work.remember("table", ("u1", "cane"), {"word": "cane"})
+    assert unit_of_work.known("table", ("u1", "cane")) is None
+    loads = []
+    unit_of_work.read_through("table", ("u1", "cane"), lambda: loads.append(1))
+    unit_of_work.read_through("table", ("u1", "cane"), lambda: loads.append(1))
+    assert len(loads) == 2
+
+
+def test_requests_do_not_share_items():
+    with unit_of_work.unit_of_work():
+        unit_of_work.remember("table", ("u1", "cane"), {"word": "cane"})
+    with unit_of_work.unit_of_work():
+        assert unit_of_work.known("table", ("u1", "cane")) is None
+
+
+def test_concurrent_requests_have_their_own_unit():
+    async def request(word: str) -> str:
+        with unit_of_work.unit_of_work():
+            unit_of_work.remember("table", ("u1",), {"word": word})
+            await asyncio.sleep(0.01)
+            return unit_of_work.known("table", ("u1",))["word"]
+
+    async def both():
+        return await asyncio.gather(request("cane"), request("gatto"))
+
+    assert asyncio.run(both()) == ["cane", "gatto"]
+
+
+def test_worker_threads_see_the_request_unit():
+    # run_io copies the context into the worker thread
+    with unit_of_work.unit_of_work():
+        unit_of_work.remember("table", ("u1",), {"word": "cane"})
+        context = contextvars.copy_context()
+    assert context.run(unit_of_work.known, "table", ("u1",)) == {"word": "cane"}
+    assert unit_of_work.known("table", ("u1",)) is None
@@ -0,0 +1,100 @@
+import os
+import threading
+
+# All resources live in one region (same as the Terraform provider)
+REGION = "us-east-1"
+# Connections kept open per client - at least IO_CONCURRENCY, so worker threads never wait for one
+AWS_MAX_POOL_CONNECTIONS = int(os.getenv("AWS_MAX_POOL_CONNECTIONS", "20"))
+AWS_CONNECT_TIMEOUT = float(os.getenv("AWS_CONNECT_TIMEOUT", "2"))
+
+# boto3 is imported on first use - it and the service models are a large part of a cold start
+_lock = threading.RLock()
+_session = None
+_clients = {}
+_resources = {}
+
+
+def session():
+    """
+    The container's boto3 session (the default one is not safe to create from several threads).
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            import boto3
+            _session = boto3.session.Session(region_name=REGION)
+        return _session
+
+
+def base_config(config: dict = None):
+    """
+    Connection settings of all clients (keep-alive, pool size), merged with service specific ones
+    (botocore Config arguments - passed as a dict so callers need not import botocore).
+    """
+    from botocore.config import Config
+    base = Config(tcp_keepalive=True, max_pool_connections=AWS_MAX_POOL_CONNECTIONS, connect_timeout=AWS_CONNECT_TIMEOUT)
+    return base.merge(Config(**config)) if config else base
+
+
+def client(service_name: str, config: dict = None):
+    """
+    Shared low-level client for the service, created on first call.
+
+    Args:
+        service_name: boto3 service name
+        config: Extra botocore Config arguments (only used when the client is created)
+    """
+    with _lock:
+        if service_name not in _clients:
+            _clients[service_name] = session().client(service_name, config=base_config(config))
+        return _clients[service_name]
+
+
+def resource(service_name: str):
+    """
+    Shared resource for the service, created on first call.
+    """
+    with _lock:
+        if service_name not in _resources:
+            _resources[service_name] = session().resource(service_name, config=base_config())
+        return _resources[service_name]
+
+
+# DynamoDB condition builders, same names as in boto3.dynamodb - importing
+# boto3.dynamodb at module level would load boto3 and botocore sessions at import time
+def Key(name: str):
+    from boto3.dynamodb.conditions import Key
+    return Key(name)
+
+
+def Attr(name: str):
+    from boto3.dynamodb.conditions import Attr
+    return Attr(name)
+
+
+class LazyClient:
+    """
+    Stands in for a boto3 client at module level, the client is created on first attribute access.
+    """
+
+    def __init__(self, service_name: str, config: dict = None):
+        self.service_name = service_name
+        self.config = config
+
+    def __getattr__(self, attr):
+        return getattr(client(self.service_name, self.config), attr)
+
+
+class LazyTable:
+    """
+    Stands in for a DynamoDB Table at module level, the resource is created on first attribute access.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._table = None
+
+    def __getattr__(self, attr):
+        if self._table is None:
+            self._table = resource("dynamodb").Table(self.name)
+        return getattr(self._table, attr)
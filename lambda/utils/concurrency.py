@@ -0,0 +1,42 @@
+import os
+from functools import partial
+from typing import Any, Callable
+
+import anyio
+
+# Max number of blocking boto3 calls (DynamoDB / Bedrock) running at the same time in this process.
+# Keep it at or below the botocore connection pool size (AWS_MAX_POOL_CONNECTIONS in utils.aws).
+IO_CONCURRENCY = int(os.getenv("IO_CONCURRENCY", "10"))
+
+_limiter = None
+
+def _get_limiter() -> anyio.CapacityLimiter:
+    # Created lazily - a CapacityLimiter has to be created inside a running event loop
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(IO_CONCURRENCY)
+    return _limiter
+
+async def run_io(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run blocking I/O code (boto3 calls to DynamoDB or Bedrock) in a worker thread,
+    so it does not stall the event loop for other requests.
+
+    At most IO_CONCURRENCY calls run at once, the rest wait for a free slot.
+    Context variables (request ID) are propagated to the worker thread.
+
+    Args:
+        func: Blocking function to call
+        args: Positional arguments for the function
+        kwargs: Keyword arguments for the function
+
+    Returns:
+        Whatever the function returns
+    """
+    return await anyio.to_thread.run_sync(partial(func, *args, **kwargs), limiter=_get_limiter())
+
+def in_flight() -> int:
+    """
+    Number of blocking calls currently running in worker threads.
+    """
+    return _limiter.borrowed_tokens if _limiter is not None else 0
@@ -4,11 +4,17 @@ import os
 import sys
 import time
 import uuid
+from contextvars import ContextVar
 from typing import Any, Dict, Optional
 
 # Configure log levels based on environment
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+# CloudWatch namespace of metrics() records, whether to print them (on by default in Lambda)
+# and an optional local file receiving the same records (JSONL)
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "OghmAI")
+METRICS_EMF = os.getenv("METRICS_EMF", "true" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "false").lower() == "true"
+METRICS_EXPORT_FILE = os.getenv("METRICS_EXPORT_FILE")
 
 # Create a logger
 logger = logging.getLogger("oghmai")
@@ -62,8 +68,16 @@ logger.addHandler(handler)
 # Prevent logs from propagating to the root logger
 logger.propagate = False
 
-# Request ID context
-_request_id_context = {}
+# Metric records must be printed as bare JSON lines for CloudWatch to extract them
+metrics_logger = logging.getLogger("oghmai.metrics")
+metrics_logger.setLevel(logging.INFO)
+metrics_handler = logging.StreamHandler(sys.stdout)
+metrics_handler.setFormatter(logging.Formatter("%(message)s"))
+metrics_logger.addHandler(metrics_handler)
+metrics_logger.propagate = False
+
+# Request ID context - a ContextVar so concurrent requests (and their worker threads) do not mix IDs
+_request_id_context: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
 def set_request_id(request_id: Optional[str] = None) -> str:
     """
@@ -78,7 +92,7 @@ def set_request_id(request_id: Optional[str] = None) -> str:
     """
     if request_id is None:
         request_id = str(uuid.uuid4())
-    _request_id_context["request_id"] = request_id
+    _request_id_context.set(request_id)
     return request_id
 
 def get_request_id() -> Optional[str]:
@@ -88,13 +102,13 @@ def get_request_id() -> Optional[str]:
     Returns:
         The request ID or None if not set
     """
-    return _request_id_context.get("request_id")
+    return _request_id_context.get()
 
 def clear_request_id() -> None:
     """
     Clear the request ID for the current context.
     """
-    _request_id_context.pop("request_id", None)
+    _request_id_context.set(None)
 
 def _log(level: int, message: str, extra: Optional[Dict[str, Any]] = None) -> None:
     """
@@ -183,4 +197,48 @@ def exception(message: str, extra: Optional[Dict[str, Any]] = None) -> None:
         extra["request_id"] = request_id
     
     # Log the exception with extra fields
-    logger.exception(message, extra={"extra": extra})
\ No newline at end of file
+    logger.exception(message, extra={"extra": extra})
+
+def metrics(event: str, values: Dict[str, float], dimensions: Optional[Dict[str, str]] = None,
+            units: Optional[Dict[str, str]] = None, properties: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Emit a CloudWatch Embedded Metric Format record.
+    With METRICS_EMF it goes to stdout (CloudWatch turns it into metrics); with METRICS_EXPORT_FILE
+    set the same record is also appended to that file.
+
+    Args:
+        event: Record name, stored as the "event" property
+        values: Metric name -> value
+        dimensions: Dimension name -> value (all metrics of the record share them)
+        units: Metric name -> CloudWatch unit, "Count" if missing
+        properties: Extra (non-metric) fields searchable in Logs Insights
+    """
+    dimensions = {k: str(v) for k, v in (dimensions or {}).items()}
+    units = units or {}
+    record = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [list(dimensions)],
+                "Metrics": [{"Name": name, "Unit": units.get(name, "Count")} for name in values],
+            }],
+        },
+        "event": event,
+        **(properties or {}),
+        **dimensions,
+        **values,
+    }
+    request_id = get_request_id()
+    if request_id:
+        record["request_id"] = request_id
+
+    line = json.dumps(record, default=str)
+    if METRICS_EMF:
+        metrics_logger.info(line)
+    if METRICS_EXPORT_FILE:
+        try:
+            with open(METRICS_EXPORT_FILE, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            warning(f"Failed to export metrics to {METRICS_EXPORT_FILE}: {str(e)}")
@@ -0,0 +1,33 @@
+import json
+import os
+
+from utils import logging, aws
+
+# Set by the Lambda runtime, missing when running locally (uvicorn)
+FUNCTION_NAME = os.getenv("AWS_LAMBDA_FUNCTION_NAME")
+
+def dispatch(task: str, **params) -> bool:
+    """
+    Run a task in a separate, asynchronous invocation of this Lambda function.
+
+    The event has the same {"oghmai_task": ...} shape as scheduled events, so it is
+    picked up by main.handler. Work done after the response in the same invocation
+    would still delay the API Gateway response, this does not.
+
+    Args:
+        task: Name of the task
+        params: Extra (JSON serializable) fields of the event
+
+    Returns:
+        True if the invocation was queued, False if not running on Lambda
+    """
+    if not FUNCTION_NAME:
+        return False
+
+    aws.client("lambda").invoke(
+        FunctionName=FUNCTION_NAME,
+        InvocationType="Event",
+        Payload=json.dumps({"oghmai_task": task, **params}).encode("utf-8")
+    )
+    logging.info(f"Dispatched task {task} asynchronously")
+    return True
@@ -0,0 +1,47 @@
+import time
+
+import bedrock_service
+import db_service
+from utils import logging
+
+# Time of the last warm-up of this container (None = never primed)
+primed_at = None
+
+
+def _timed(step: str, func, timings: dict, failures: list):
+    start = time.perf_counter()
+    try:
+        func()
+    except Exception as e:
+        # A failed step only means a slower first request, never a failed warm-up event
+        logging.warning(f"Warm-up step {step} failed: {str(e)}")
+        failures.append(step)
+    timings[step] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def warm_up() -> dict:
+    """
+    Prime this container for the next requests: create the AWS clients, open pooled connections
+    to all tables and to Bedrock, and load prompt templates and caches.
+    Cheap to repeat - a second run on a warm container only re-checks the connections.
+
+    Returns:
+        Duration of each step in ms, the failed steps and whether the container was primed before
+    """
+    global primed_at
+    timings, failures = {}, []
+    was_primed = primed_at is not None
+
+    def tables():
+        failed = db_service.warm_up_tables()
+        if failed:
+            raise RuntimeError(f"Tables not reachable: {', '.join(failed)}")
+
+    _timed("dynamodb", tables, timings, failures)
+    _timed("bedrock", bedrock_service.warm_up, timings, failures)
+
+    primed_at = time.time()
+    logging.metrics("warmup", values={"WarmupLatency": sum(timings.values()), "WarmupFailures": len(failures)},
+                    units={"WarmupLatency": "Milliseconds"},
+                    properties={"steps": timings, "failed": failures, "was_primed": was_primed})
+    return {"steps": timings, "failed": failures, "was_primed": was_primed}